@@ -3,9 +3,13 @@
 from .email_assistant import EmailAssistantAgent
 from .deal_predictor import DealPredictorAgent
 from .lead_qualifier import LeadQualifierAgent
+from .registry import AgentRegistry, agent_registry, get_agent_registry
 
 __all__ = [
     "EmailAssistantAgent",
     "DealPredictorAgent",
-    "LeadQualifierAgent"
+    "LeadQualifierAgent",
+    "AgentRegistry",
+    "agent_registry",
+    "get_agent_registry"
 ]
@@ -2,36 +2,443 @@
 AI Agents module - Conductor-based agents for CRM intelligence
 """
 
-from typing import Optional, Dict, Any, List
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import random
+import time
+from typing import Optional, Dict, Any, List, AsyncIterator, Type
 from abc import ABC, abstractmethod
 import anthropic
+from pydantic import BaseModel
 from app.core.config import settings
+from app.core.metrics import (
+    current_priority,
+    LLM_SCHEDULER_QUEUE_DEPTH,
+    LLM_SCHEDULER_WAIT,
+    LLM_THROTTLED,
+    LLM_STRUCTURED_OUTPUT
+)
+from app.agents.structured_output import StructuredOutputError, parse_output, repair_prompt
+from app.services.cache_service import cache_service
+from app.services.usage_service import record_llm_call, record_json_parse_failure
+
+logger = logging.getLogger(__name__)
+
+
+# Shared async client and concurrency limiter for all Claude calls.
+# Created lazily so importing agents never opens connections.
+_async_client: Optional[anthropic.AsyncAnthropic] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_async_client() -> anthropic.AsyncAnthropic:
+    """Get the process-wide async Anthropic client"""
+    global _async_client
+    if _async_client is None:
+        _async_client = anthropic.AsyncAnthropic(
+            api_key=settings.CLAUDE_API_KEY,
+            timeout=settings.CLAUDE_TIMEOUT_SECONDS,
+            max_retries=0  # ClaudeLLM retries itself so retries can be counted
+        )
+    return _async_client
+
+
+async def close_async_client():
+    """Close the shared Anthropic client and its connection pool"""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+
+def get_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore bounding concurrent Claude calls"""
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.CLAUDE_MAX_CONCURRENCY)
+    return _semaphore
+
+
+class TokenBucket:
+    """Continuously refilling token bucket"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until amount is available (0 if available now)"""
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def take(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+
+class LLMScheduler:
+    """
+    Provider rate limiter with strict priority
+
+    Tracks requests per minute and tokens per minute with token buckets.
+    Callers queue by priority ("interactive" before "bulk", FIFO within a
+    priority) and are released as soon as both buckets allow. A provider
+    429 pauses dispatch for everyone instead of failing the call.
+    """
+
+    PRIORITIES = {"interactive": 0, "bulk": 1}
+
+    def __init__(self, provider: str, requests_per_minute: int, tokens_per_minute: int):
+        self.provider = provider
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self.paused_until = 0.0
+        self._waiters: List[tuple] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def acquire(self, tokens: int, priority: Optional[str] = None):
+        """Wait for capacity to send a request estimated at tokens"""
+        priority = priority if priority in self.PRIORITIES else current_priority.get()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        started = time.perf_counter()
+
+        heapq.heappush(
+            self._waiters,
+            (self.PRIORITIES.get(priority, 0), next(self._sequence), tokens, future)
+        )
+        LLM_SCHEDULER_QUEUE_DEPTH.labels(self.provider, priority).inc()
+
+        try:
+            self._dispatch()
+            await future
+        finally:
+            LLM_SCHEDULER_QUEUE_DEPTH.labels(self.provider, priority).dec()
+            LLM_SCHEDULER_WAIT.labels(self.provider, priority).observe(time.perf_counter() - started)
+            if future.cancelled():
+                self._dispatch()
+
+    def settle(self, reserved: int, actual: int):
+        """Correct the token bucket once real usage is known"""
+        self.tokens.tokens = min(self.tokens.capacity, self.tokens.tokens + reserved - actual)
+
+    def backoff(self, seconds: float):
+        """Pause dispatch after a provider rate-limit response"""
+        LLM_THROTTLED.labels(self.provider).inc()
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self._schedule(seconds)
+
+    def queue_depth(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter[3].done())
+
+    def _schedule(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _dispatch(self):
+        self._timer = None
+        self.requests.refill()
+        self.tokens.refill()
+
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+
+            wait = max(
+                self.paused_until - time.monotonic(),
+                self.requests.time_until(1),
+                self.tokens.time_until(tokens)
+            )
+            if wait > 0:
+                # Strict priority: the head waits and everyone behind it waits too
+                self._schedule(wait)
+                return
+
+            heapq.heappop(self._waiters)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            future.set_result(None)
+
+
+_schedulers: Dict[str, LLMScheduler] = {}
+
+
+def get_scheduler(provider: str = "claude") -> LLMScheduler:
+    """Get the process-wide scheduler for a provider"""
+    if provider not in _schedulers:
+        prefix = provider.upper()
+        _schedulers[provider] = LLMScheduler(
+            provider,
+            requests_per_minute=getattr(settings, f"{prefix}_REQUESTS_PER_MINUTE"),
+            tokens_per_minute=getattr(settings, f"{prefix}_TOKENS_PER_MINUTE")
+        )
+    return _schedulers[provider]
 
 
 class BaseLLM:
     """Base LLM wrapper"""
 
+    # Provider label for metrics and usage rollups
+    provider: str = "unknown"
+
+    # Agent label, set by the owning agent
+    agent_name: str = "unknown"
+
     async def generate(self, prompt: str, **kwargs) -> str:
         """Generate text from prompt"""
         raise NotImplementedError
 
+    async def stream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Stream text chunks from prompt (single chunk by default)"""
+        yield await self.generate(prompt, **kwargs)
 
-class ClaudeLLM(BaseLLM):
-    """Claude LLM wrapper using Anthropic API"""
+
+class StreamingLLM(BaseLLM):
+    """
+    Provider-independent streaming call: scheduling, retries, usage and metrics
+
+    Subclasses set the provider's client, semaphore and retry settings and
+    implement _request_kwargs, _create_stream (one request attempt) and
+    _stream_text (text deltas of an open response).
+    """
+
+    # Transient errors worth retrying; rate-limit errors also pause the scheduler
+    RETRYABLE_ERRORS: tuple = ()
+    RATE_LIMIT_ERRORS: tuple = ()
+
+    # Rough characters per token for reservations and estimates
+    CHARS_PER_TOKEN = 4
+
+    # Whether the stream reports token counts; otherwise they are estimated
+    REPORTS_USAGE = True
 
     def __init__(
         self,
-        model: str = None,
-        temperature: float = 0.7,
-        max_tokens: int = 2000
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        timeout: float,
+        max_retries: int,
+        rate_limit_retries: int,
+        backoff_base: float,
+        client: Any,
+        semaphore: asyncio.Semaphore
     ):
-        self.model = model or settings.CLAUDE_MODEL
+        self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
-        self.client = anthropic.Anthropic(api_key=settings.CLAUDE_API_KEY)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limit_retries = rate_limit_retries
+        self.backoff_base = backoff_base
+        self.client = client
+        self.semaphore = semaphore
+        self.scheduler = get_scheduler(self.provider)
+
+    def _request_kwargs(self, prompt: str, system: Optional[str] = None) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def _create_stream(self, kwargs: Dict[str, Any]):
+        """Open one streaming request (no retries)"""
+        raise NotImplementedError
+
+    def _stream_text(self, response: Any, usage: Dict[str, Any]) -> AsyncIterator[str]:
+        """Yield text deltas of an open response and fill usage tokens"""
+        raise NotImplementedError
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[str]:
+        response = getattr(error, "response", None)
+        return response.headers.get("retry-after") if response is not None else None
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Exponential backoff with full jitter, at least the provider's retry-after"""
+        delay = random.uniform(0, min(2 ** attempt * self.backoff_base, 30))
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay
+
+    async def _open_stream(self, kwargs: Dict[str, Any], usage: Dict[str, Any]):
+        """
+        Open a streaming request, retrying transient errors with backoff
+
+        Returns holding a concurrency slot, which _read_text releases when
+        the response closes. Each attempt takes its own slot, so a call
+        waiting out a 429 or a backoff never occupies one.
+        """
+        while True:
+            await self.semaphore.acquire()
+            try:
+                return await self._create_stream(kwargs)
+            except self.RATE_LIMIT_ERRORS as e:
+                self.semaphore.release()
+                if usage["retries"] >= self.rate_limit_retries:
+                    raise
+                self.scheduler.backoff(self._backoff_delay(usage["retries"], self._retry_after(e)))
+                usage["retries"] += 1
+                # Re-queue behind the pause so throttling applies to every caller
+                await self.scheduler.acquire(0)
+            except self.RETRYABLE_ERRORS:
+                self.semaphore.release()
+                if usage["retries"] >= self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff_delay(usage["retries"]))
+                usage["retries"] += 1
+            except BaseException:
+                self.semaphore.release()
+                raise
+
+    async def _read_text(self, prompt: str, system: Optional[str], usage: Dict[str, Any]) -> AsyncIterator[str]:
+        """Yield text deltas and record time to first token (and estimated tokens)"""
+
+        if not self.REPORTS_USAGE:
+            usage["input_tokens"] = (len(prompt) + len(system or "")) // self.CHARS_PER_TOKEN
+        response = await self._open_stream(self._request_kwargs(prompt, system), usage)
+        characters = 0
+
+        try:
+            async for text in self._stream_text(response, usage):
+                if usage["time_to_first_token"] is None:
+                    usage["time_to_first_token"] = time.perf_counter() - usage["started"]
+                if not self.REPORTS_USAGE:
+                    characters += len(text)
+                    usage["output_tokens"] = characters // self.CHARS_PER_TOKEN
+                yield text
+        finally:
+            # Closing the connection stops generation (and billing) on cancellation
+            try:
+                await response.close()
+            finally:
+                self.semaphore.release()
+
+    def _estimate_tokens(self, prompt: str, system: Optional[str]) -> int:
+        """Tokens to reserve: rough prompt size plus the completion budget"""
+        return (len(prompt) + len(system or "")) // self.CHARS_PER_TOKEN + self.max_tokens
+
+    def _settle(self, reserved: int, usage: Dict[str, Any]):
+        if usage["input_tokens"] or usage["output_tokens"]:
+            self.scheduler.settle(reserved, usage["input_tokens"] + usage["output_tokens"])
+
+    def _new_usage(self) -> Dict[str, Any]:
+        return {
+            "started": time.perf_counter(),
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "time_to_first_token": None,
+            "retries": 0
+        }
+
+    async def _record(self, usage: Dict[str, Any], outcome: str):
+        await record_llm_call(
+            agent=self.agent_name,
+            provider=self.provider,
+            outcome=outcome,
+            input_tokens=usage["input_tokens"],
+            output_tokens=usage["output_tokens"],
+            duration=time.perf_counter() - usage["started"],
+            time_to_first_token=usage["time_to_first_token"],
+            retries=usage["retries"]
+        )
 
     async def generate(self, prompt: str, system: Optional[str] = None) -> str:
-        """Generate text using Claude"""
+        """Generate text"""
+
+        outcome = "error"
+        reserved = self._estimate_tokens(prompt, system)
+
+        # Rate-limit queueing is not bounded by the timeout: throttled calls wait
+        await self.scheduler.acquire(reserved)
+
+        # In-flight calls are bounded per attempt (see _open_stream); the
+        # timeout covers queueing for a slot plus the request
+        async with asyncio.timeout(self.timeout):
+            usage = self._new_usage()
+            try:
+                chunks = [chunk async for chunk in self._read_text(prompt, system, usage)]
+                outcome = "success"
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                raise
+            finally:
+                self._settle(reserved, usage)
+                await self._record(usage, outcome)
+
+        return "".join(chunks)
+
+    async def stream(self, prompt: str, system: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream text deltas as they are generated"""
+
+        outcome = "error"
+        reserved = self._estimate_tokens(prompt, system)
+
+        await self.scheduler.acquire(reserved)
+
+        # The client timeout bounds each read; the slot is held until the stream ends
+        usage = self._new_usage()
+        try:
+            async for chunk in self._read_text(prompt, system, usage):
+                yield chunk
+            outcome = "success"
+        except (asyncio.CancelledError, GeneratorExit):
+            outcome = "cancelled"
+            raise
+        finally:
+            self._settle(reserved, usage)
+            await self._record(usage, outcome)
+
+
+class ClaudeLLM(StreamingLLM):
+    """Claude LLM wrapper using Anthropic API"""
+
+    provider = "claude"
+
+    RETRYABLE_ERRORS = (
+        anthropic.APIConnectionError,
+        anthropic.InternalServerError
+    )
+    RATE_LIMIT_ERRORS = (anthropic.RateLimitError,)
+
+    def __init__(
+        self,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        timeout: Optional[float] = None
+    ):
+        super().__init__(
+            model=model or settings.CLAUDE_MODEL,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout or settings.CLAUDE_TIMEOUT_SECONDS,
+            max_retries=settings.CLAUDE_MAX_RETRIES,
+            rate_limit_retries=settings.CLAUDE_RATE_LIMIT_MAX_RETRIES,
+            backoff_base=settings.CLAUDE_BACKOFF_BASE_SECONDS,
+            client=get_async_client(),
+            semaphore=get_semaphore()
+        )
+
+    def _request_kwargs(self, prompt: str, system: Optional[str] = None) -> Dict[str, Any]:
+        """Build messages.create arguments"""
 
         messages = [{"role": "user", "content": prompt}]
 
@@ -45,14 +452,57 @@ class ClaudeLLM(BaseLLM):
         if system:
             kwargs["system"] = system
 
-        response = self.client.messages.create(**kwargs)
+        return kwargs
+
+    async def _create_stream(self, kwargs: Dict[str, Any]):
+        return await self.client.messages.create(stream=True, **kwargs)
+
+    async def _stream_text(self, response: Any, usage: Dict[str, Any]) -> AsyncIterator[str]:
+        """Text deltas of a Messages stream; token counts come from the stream events"""
+        async for event in response:
+            if event.type == "message_start":
+                usage["input_tokens"] = event.message.usage.input_tokens
+            elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+                yield event.delta.text
+            elif event.type == "message_delta":
+                usage["output_tokens"] = event.usage.output_tokens
+
 
-        return response.content[0].text
+def _provider_llm(provider: str, temperature: float, max_tokens: int) -> BaseLLM:
+    if provider == "fake":
+        from app.agents.fake_llm import FakeLLM
+        return FakeLLM(temperature=temperature, max_tokens=max_tokens)
+    if provider == "openai":
+        from app.agents.openai_llm import OpenAILLM
+        return OpenAILLM(temperature=temperature, max_tokens=max_tokens)
+    return ClaudeLLM(temperature=temperature, max_tokens=max_tokens)
+
+
+def create_llm(temperature: float = 0.7, max_tokens: int = 2000) -> BaseLLM:
+    """Build the LLM backend selected by LLM_PROVIDER (hedged by LLM_FALLBACK_PROVIDER)"""
+    primary = _provider_llm(settings.LLM_PROVIDER, temperature, max_tokens)
+
+    fallback = settings.LLM_FALLBACK_PROVIDER
+    if not fallback or fallback == settings.LLM_PROVIDER:
+        return primary
+
+    from app.agents.hedged_llm import HedgedLLM
+    return HedgedLLM(
+        primary=primary,
+        secondary=_provider_llm(fallback, temperature, max_tokens),
+        hedge_after=settings.LLM_HEDGE_AFTER_SECONDS
+    )
 
 
 class BaseAgent(ABC):
     """Base agent class for all AI agents"""
 
+    # Whether identical prompts may be answered from the result cache
+    cache_results: bool = True
+
+    # Pydantic model the completion must match (see generate_structured)
+    output_schema: Optional[Type[BaseModel]] = None
+
     def __init__(
         self,
         name: str,
@@ -62,7 +512,11 @@ class BaseAgent(ABC):
     ):
         self.name = name
         self.description = description
-        self.llm = llm or ClaudeLLM(temperature=temperature)
+        self.llm = llm or create_llm(temperature=temperature)
+        self.llm.agent_name = name
+        self.cache_ttl = settings.AI_CACHE_TTL_SECONDS
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self.output_stats = {"clean": 0, "extracted": 0, "repaired": 0, "failed": 0}
 
     @abstractmethod
     async def run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -72,3 +526,106 @@ class BaseAgent(ABC):
     def format_prompt(self, template: str, **kwargs) -> str:
         """Format prompt template with variables"""
         return template.format(**kwargs)
+
+    async def record_parse_failure(self):
+        """Count a completion that could not be parsed as JSON"""
+        logger.warning(f"{self.name}: LLM response was not valid JSON")
+        await record_json_parse_failure(self.name)
+
+    def fingerprint(self, prompt: str, system: Optional[str] = None) -> str:
+        """Content hash of everything that determines the LLM output"""
+        key_data = json.dumps(
+            {
+                "model": getattr(self.llm, "model", None),
+                "temperature": getattr(self.llm, "temperature", None),
+                "max_tokens": getattr(self.llm, "max_tokens", None),
+                "system": system,
+                "prompt": prompt
+            },
+            sort_keys=True
+        )
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    def cache_key(self, prompt: str, system: Optional[str] = None) -> str:
+        return f"llm:{self.name}:{self.fingerprint(prompt, system)}"
+
+    async def generate(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        force_refresh: bool = False
+    ) -> str:
+        """
+        Generate completion, served from the result cache when possible
+
+        Args:
+            prompt: Rendered user prompt
+            system: Optional system prompt
+            force_refresh: Skip the cache lookup and overwrite the entry
+
+        Returns:
+            Raw completion text
+        """
+
+        if not self.cache_results or self.cache_ttl <= 0:
+            return await self.llm.generate(prompt=prompt, system=system)
+
+        key = self.cache_key(prompt, system)
+
+        if not force_refresh:
+            cached_value = await cache_service.get(key)
+            if cached_value is not None:
+                self.cache_stats["hits"] += 1
+                logger.debug(f"LLM cache hit: {self.name}")
+                return cached_value
+
+        self.cache_stats["misses"] += 1
+        response = await self.llm.generate(prompt=prompt, system=system)
+        await cache_service.set(key, response, self.cache_ttl)
+
+        return response
+
+    def _count_output(self, outcome: str):
+        self.output_stats[outcome] += 1
+        LLM_STRUCTURED_OUTPUT.labels(self.name, outcome).inc()
+
+    async def generate_structured(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        force_refresh: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Generate a completion and parse it into output_schema
+
+        JSON wrapped in prose or markdown fences is extracted. If that still
+        fails, one repair call asks the model to rewrite its own output as
+        valid JSON; a repaired result replaces the cached completion.
+
+        Returns:
+            Validated result as a dict, or None if the output is unusable
+        """
+
+        response = await self.generate(prompt=prompt, system=system, force_refresh=force_refresh)
+
+        try:
+            result, clean = parse_output(response, self.output_schema)
+            self._count_output("clean" if clean else "extracted")
+            return result.model_dump()
+        except StructuredOutputError as e:
+            error = str(e)
+
+        try:
+            repaired = await self.llm.generate(prompt=repair_prompt(response, self.output_schema, error))
+            result, _ = parse_output(repaired, self.output_schema)
+        except Exception as e:
+            logger.warning(f"{self.name}: output repair failed: {e}")
+            self._count_output("failed")
+            await self.record_parse_failure()
+            return None
+
+        self._count_output("repaired")
+        if self.cache_results and self.cache_ttl > 0:
+            await cache_service.set(self.cache_key(prompt, system), result.model_dump_json(), self.cache_ttl)
+
+        return result.model_dump()
@@ -2,10 +2,28 @@
 DealPredictor Agent - Predicts deal outcomes using AI
 """
 
-import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime
-from app.agents.base import BaseAgent, ClaudeLLM
+from pydantic import BaseModel, Field, field_validator
+from app.agents.base import BaseAgent, create_llm
+
+
+class DealPrediction(BaseModel):
+    """Expected DealPredictor completion"""
+
+    win_probability: int
+    health_score: int
+    predicted_close_date: Optional[str] = None
+    risk_factors: List[str] = Field(default_factory=list)
+    recommended_actions: List[str] = Field(default_factory=list)
+    reasoning: str = ""
+
+    @field_validator("win_probability", "health_score", mode="before")
+    @classmethod
+    def round_percentage(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            value = value.strip().rstrip("%")
+        return round(float(value)) if isinstance(value, (float, str)) else value
 
 
 class DealPredictorAgent(BaseAgent):
@@ -24,6 +42,8 @@ Analyze deal data and provide accurate predictions about outcomes.
 Consider multiple factors: engagement, timeline, stakeholders, activity patterns.
 Output must be valid JSON."""
 
+    output_schema = DealPrediction
+
     PREDICTION_PROMPT = """Analyze this deal and provide predictions:
 
 Deal Information:
@@ -35,6 +55,7 @@ Deal Information:
 
 Activity Metrics:
 - Total Activities: {activity_count}
+- Activities by Type: {activity_breakdown}
 - Last Activity: {last_activity_date}
 - Engagement Score: {engagement_score}/100
 
@@ -42,6 +63,10 @@ Stakeholders:
 - Number of Contacts: {contact_count}
 - Decision Makers Involved: {decision_makers}
 
+Statistical Baseline:
+- Win probability from a model trained on our closed deals: {baseline_win_probability}
+  Use it as a prior and explain any large deviation.
+
 Provide analysis:
 1. Win Probability (0-100%)
 2. Health Score (0-100)
@@ -64,7 +89,7 @@ Output as JSON:
         super().__init__(
             name="DealPredictor",
             description="Predicts deal outcomes and provides insights",
-            llm=ClaudeLLM(temperature=0.5, max_tokens=2000)
+            llm=create_llm(temperature=0.5, max_tokens=2000)
         )
 
     async def run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -94,35 +119,35 @@ Output as JSON:
             days_in_pipeline=days_in_pipeline,
             expected_close_date=input_data.get("expected_close_date", "Not set"),
             activity_count=input_data.get("activity_count", 0),
+            activity_breakdown=", ".join(
+                f"{kind}: {count}" for kind, count in sorted((input_data.get("activity_counts") or {}).items())
+            ) or "None",
             last_activity_date=input_data.get("last_activity_date", "Never"),
             engagement_score=input_data.get("engagement_score", 50),
             contact_count=input_data.get("contact_count", 0),
-            decision_makers=input_data.get("decision_makers", 0)
+            decision_makers=input_data.get("decision_makers", 0),
+            baseline_win_probability=(
+                f"{baseline}%" if (baseline := input_data.get("baseline_win_probability")) is not None
+                else "Not available"
+            )
         )
 
-        response = await self.llm.generate(
+        result = await self.generate_structured(
             prompt=prompt,
-            system=self.SYSTEM_PROMPT
+            system=self.SYSTEM_PROMPT,
+            force_refresh=input_data.get("force_refresh", False)
         )
 
-        try:
-            result = json.loads(response)
-
-            # Ensure all required fields exist
-            result.setdefault("win_probability", 50)
-            result.setdefault("health_score", 50)
-            result.setdefault("risk_factors", [])
-            result.setdefault("recommended_actions", [])
-
+        if result is not None:
             return result
 
-        except json.JSONDecodeError:
-            # Fallback response
-            return {
-                "win_probability": 50,
-                "health_score": 50,
-                "predicted_close_date": input_data.get("expected_close_date"),
-                "risk_factors": ["Unable to analyze - insufficient data"],
-                "recommended_actions": ["Increase engagement", "Schedule follow-up"],
-                "reasoning": "Analysis unavailable"
-            }
+        # Fallback response
+        baseline = input_data.get("baseline_win_probability")
+        return {
+            "win_probability": baseline if baseline is not None else 50,
+            "health_score": 50,
+            "predicted_close_date": input_data.get("expected_close_date"),
+            "risk_factors": ["Unable to analyze - insufficient data"],
+            "recommended_actions": ["Increase engagement", "Schedule follow-up"],
+            "reasoning": "Analysis unavailable"
+        }
@@ -3,8 +3,75 @@ EmailAssistant Agent - Generates sales emails using AI
 """
 
 import json
-from typing import Dict, Any
-from app.agents.base import BaseAgent, ClaudeLLM
+from typing import Dict, Any, List, AsyncIterator, Tuple
+from pydantic import BaseModel, Field
+from app.agents.base import BaseAgent, create_llm
+from app.agents.structured_output import StructuredOutputError, extract_json, parse_output
+
+
+class EmailVariation(BaseModel):
+    type: str = ""
+    subject: str
+    body: str
+    tone: str = ""
+
+
+class EmailVariations(BaseModel):
+    """Expected EmailAssistant completion"""
+
+    variations: List[EmailVariation] = Field(..., min_length=1)
+
+
+class VariationStreamParser:
+    """
+    Incremental parser for the streamed email JSON
+
+    Tracks brace depth (ignoring braces inside strings) and returns each
+    object nested one level below the root, i.e. each entry of
+    "variations", as soon as its closing brace arrives.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.object_start = None
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume a text chunk and return newly completed variations"""
+        self.buffer += chunk
+        completed = []
+
+        while self.position < len(self.buffer):
+            char = self.buffer[self.position]
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+                if self.depth == 2:
+                    self.object_start = self.position
+            elif char == "}":
+                if self.depth == 2 and self.object_start is not None:
+                    try:
+                        completed.append(json.loads(self.buffer[self.object_start:self.position + 1]))
+                    except json.JSONDecodeError:
+                        pass
+                    self.object_start = None
+                self.depth = max(0, self.depth - 1)
+
+            self.position += 1
+
+        return completed
 
 
 class EmailAssistantAgent(BaseAgent):
@@ -17,11 +84,16 @@ class EmailAssistantAgent(BaseAgent):
     - Direct: Brief and to the point
     """
 
+    # Users expect fresh variations on every request
+    cache_results = False
+
     SYSTEM_PROMPT = """You are a professional sales email writer.
 Generate compelling, personalized sales emails that drive engagement.
 Focus on value proposition and clear calls-to-action.
 Output must be valid JSON."""
 
+    output_schema = EmailVariations
+
     EMAIL_GENERATION_PROMPT = """Generate 3 sales email variations for this lead:
 
 Lead Information:
@@ -68,7 +140,7 @@ Output as JSON:
         super().__init__(
             name="EmailAssistant",
             description="Generates personalized sales emails",
-            llm=ClaudeLLM(temperature=0.8, max_tokens=3000)
+            llm=create_llm(temperature=0.8, max_tokens=3000)
         )
 
     async def run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -90,27 +162,71 @@ Output as JSON:
             context=input_data.get("context", "initial outreach")
         )
 
-        response = await self.llm.generate(
+        result = await self.generate_structured(
             prompt=prompt,
-            system=self.SYSTEM_PROMPT
+            system=self.SYSTEM_PROMPT,
+            force_refresh=input_data.get("force_refresh", False)
         )
 
-        # Parse JSON response
-        try:
-            result = json.loads(response)
+        if result is not None:
             return result
-        except json.JSONDecodeError:
-            # Fallback if JSON parsing fails
-            return {
-                "variations": [
-                    {
-                        "type": "formal",
-                        "subject": f"Partnership Opportunity with {input_data.get('company', 'Your Company')}",
-                        "body": response[:500],
-                        "tone": "professional"
-                    }
-                ]
-            }
+
+        # Fallback if the output could not be parsed or repaired
+        return {"variations": [self._fallback_variation(input_data)]}
+
+    @staticmethod
+    def _fallback_variation(input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Placeholder variation when the completion holds no usable JSON"""
+        return {
+            "type": "formal",
+            "subject": f"Partnership Opportunity with {input_data.get('company', 'Your Company')}",
+            "body": "",
+            "tone": "professional"
+        }
+
+    async def stream(self, input_data: Dict[str, Any]) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Generate email variations, streaming progress
+
+        Args:
+            input_data: Dict with lead_name, company, job_title, context
+
+        Yields:
+            ("token", text) for each completion delta and ("variation", dict)
+            for each variation as soon as it is fully generated
+        """
+
+        prompt = self.format_prompt(
+            self.EMAIL_GENERATION_PROMPT,
+            lead_name=input_data.get("lead_name", "there"),
+            company=input_data.get("company", "your company"),
+            job_title=input_data.get("job_title", ""),
+            context=input_data.get("context", "initial outreach")
+        )
+
+        parser = VariationStreamParser()
+        emitted = 0
+
+        async for chunk in self.llm.stream(prompt=prompt, system=self.SYSTEM_PROMPT):
+            yield "token", chunk
+            for variation in parser.feed(chunk):
+                emitted += 1
+                yield "variation", variation
+
+        if not emitted:
+            # The incremental parser only sees well-nested JSON; retry on the full text
+            try:
+                result, _ = parse_output(parser.buffer, self.output_schema)
+                self._count_output("extracted")
+                for variation in result.variations:
+                    yield "variation", variation.model_dump()
+                return
+            except StructuredOutputError:
+                self._count_output("failed")
+                await self.record_parse_failure()
+
+            # Same fallback as run() when the completion is not valid JSON
+            yield "variation", self._fallback_variation(input_data)
 
     async def generate_subject_lines(self, context: str, count: int = 5) -> list[str]:
         """Generate subject line options"""
@@ -123,6 +239,11 @@ Output as JSON array of strings:
         response = await self.llm.generate(prompt=prompt)
 
         try:
-            return json.loads(response)
-        except:
+            subject_lines, _ = extract_json(response, expect="[")
+            # A clean JSON object is returned as-is, whatever was expected
+            if not isinstance(subject_lines, list):
+                raise StructuredOutputError("Subject lines are not a JSON array")
+            return [str(line) for line in subject_lines]
+        except StructuredOutputError:
+            await self.record_parse_failure()
             return [f"Re: {context}"]
@@ -0,0 +1,207 @@
+"""
+Fake LLM - Deterministic offline backend for load tests and benchmarks
+
+Returns schema-valid JSON for each agent prompt with configurable latency,
+token throughput and error rate, so agent orchestration, concurrency
+limits and caching can be measured without calling a real provider.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from typing import Optional, AsyncIterator, Dict, Any
+
+from app.agents.base import BaseLLM, get_semaphore
+from app.core.config import settings
+from app.services.usage_service import record_llm_call
+
+
+class FakeLLMError(RuntimeError):
+    """Injected provider failure"""
+
+
+class FakeLLM(BaseLLM):
+    """LLM stand-in driven by FAKE_LLM_* settings"""
+
+    provider = "fake"
+
+    # Rough characters per token, used to simulate output throughput
+    CHARS_PER_TOKEN = 4
+
+    def __init__(
+        self,
+        model: str = "fake",
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        latency_distribution: Optional[str] = None,
+        latency_ms: Optional[float] = None,
+        latency_jitter_ms: Optional[float] = None,
+        tokens_per_second: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        seed: Optional[int] = None
+    ):
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.latency_distribution = latency_distribution or settings.FAKE_LLM_LATENCY_DISTRIBUTION
+        self.latency_ms = settings.FAKE_LLM_LATENCY_MS if latency_ms is None else latency_ms
+        self.latency_jitter_ms = (
+            settings.FAKE_LLM_LATENCY_JITTER_MS if latency_jitter_ms is None else latency_jitter_ms
+        )
+        self.tokens_per_second = (
+            settings.FAKE_LLM_TOKENS_PER_SECOND if tokens_per_second is None else tokens_per_second
+        )
+        self.error_rate = settings.FAKE_LLM_ERROR_RATE if error_rate is None else error_rate
+        self.seed = settings.FAKE_LLM_SEED if seed is None else seed
+        self.calls = 0
+
+    def _rng(self, *parts: Any) -> random.Random:
+        """RNG seeded from the configured seed and the given parts"""
+        key = ":".join(str(part) for part in (self.seed, *parts))
+        return random.Random(int(hashlib.sha256(key.encode()).hexdigest()[:16], 16))
+
+    def _prepare(self, prompt: str, system: Optional[str]):
+        """Content depends only on the prompt; timing and failures on the call number"""
+        self.calls += 1
+        response = self._respond(prompt, self._rng(system, prompt))
+        return response, self._rng("call", self.calls)
+
+    def _first_token_delay(self, rng: random.Random) -> float:
+        """Time to first token in seconds"""
+        mean = self.latency_ms
+        jitter = self.latency_jitter_ms
+
+        if self.latency_distribution == "uniform":
+            delay = rng.uniform(mean - jitter, mean + jitter)
+        elif self.latency_distribution == "normal":
+            delay = rng.gauss(mean, jitter)
+        elif self.latency_distribution == "lognormal" and mean > 0:
+            # Parameterized so the distribution has the configured mean and stddev
+            variance = (jitter / mean) ** 2
+            sigma = (1 + variance) ** 0.5
+            delay = rng.lognormvariate(math.log(mean / sigma), math.sqrt(math.log(1 + variance)))
+        else:
+            delay = mean
+
+        return max(0.0, delay) / 1000
+
+    def _output_delay(self, text: str) -> float:
+        """Time to emit text at the configured throughput in seconds"""
+        if self.tokens_per_second <= 0:
+            return 0.0
+        return (len(text) / self.CHARS_PER_TOKEN) / self.tokens_per_second
+
+    def _respond(self, prompt: str, rng: random.Random) -> str:
+        """Build a schema-valid completion for the agent that sent the prompt"""
+
+        if "Qualify this lead" in prompt:
+            return json.dumps(self._lead_qualification(rng))
+        if "Analyze this deal" in prompt:
+            return json.dumps(self._deal_prediction(rng))
+        if "sales email variations" in prompt:
+            return json.dumps(self._email_variations(rng))
+        if "subject lines" in prompt:
+            return json.dumps([f"Subject line {i + 1}" for i in range(5)])
+
+        return json.dumps({"result": "ok"})
+
+    def _lead_qualification(self, rng: random.Random) -> Dict[str, Any]:
+        score = rng.randint(0, 100)
+        classification = "Hot" if score > 70 else "Warm" if score >= 40 else "Cold"
+        return {
+            "score": score,
+            "classification": classification,
+            "reasoning": f"Synthetic qualification with score {score}.",
+            "next_actions": ["Schedule call", "Send introduction email", "Research company"],
+            "bant": {
+                "budget": "Unknown",
+                "authority": "Unknown",
+                "need": "Unknown",
+                "timeline": "Unknown"
+            }
+        }
+
+    def _deal_prediction(self, rng: random.Random) -> Dict[str, Any]:
+        return {
+            "win_probability": rng.randint(0, 100),
+            "health_score": rng.randint(0, 100),
+            "predicted_close_date": "2026-12-31",
+            "risk_factors": rng.sample(
+                ["Low engagement", "No decision maker", "Budget unclear", "Long sales cycle"], 2
+            ),
+            "recommended_actions": ["Schedule follow-up", "Identify decision maker"],
+            "reasoning": "Synthetic prediction."
+        }
+
+    def _email_variations(self, rng: random.Random) -> Dict[str, Any]:
+        return {
+            "variations": [
+                {
+                    "type": tone,
+                    "subject": f"{tone.capitalize()} follow-up #{rng.randint(1, 999)}",
+                    "body": "Hello,\n\nThis is a synthetic email body.\n\nBest regards",
+                    "tone": tone
+                }
+                for tone in ("formal", "casual", "direct")
+            ]
+        }
+
+    def _maybe_fail(self, rng: random.Random):
+        if rng.random() < self.error_rate:
+            raise FakeLLMError("Injected fake LLM failure")
+
+    async def _record(self, prompt: str, response: str, started: float, first_token: Optional[float], outcome: str):
+        await record_llm_call(
+            agent=self.agent_name,
+            provider=self.provider,
+            outcome=outcome,
+            input_tokens=len(prompt) // self.CHARS_PER_TOKEN,
+            output_tokens=len(response) // self.CHARS_PER_TOKEN if outcome == "success" else 0,
+            duration=time.perf_counter() - started,
+            time_to_first_token=first_token
+        )
+
+    async def generate(self, prompt: str, system: Optional[str] = None) -> str:
+        """Generate a synthetic completion"""
+
+        response, rng = self._prepare(prompt, system)
+
+        async with get_semaphore():
+            started = time.perf_counter()
+            first_token = None
+            outcome = "error"
+            try:
+                await asyncio.sleep(self._first_token_delay(rng))
+                self._maybe_fail(rng)
+                first_token = time.perf_counter() - started
+                await asyncio.sleep(self._output_delay(response))
+                outcome = "success"
+            finally:
+                await self._record(prompt, response, started, first_token, outcome)
+
+        return response
+
+    async def stream(self, prompt: str, system: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream a synthetic completion token by token"""
+
+        response, rng = self._prepare(prompt, system)
+        chunk_size = self.CHARS_PER_TOKEN
+
+        async with get_semaphore():
+            started = time.perf_counter()
+            first_token = None
+            outcome = "error"
+            try:
+                await asyncio.sleep(self._first_token_delay(rng))
+                self._maybe_fail(rng)
+                first_token = time.perf_counter() - started
+                for start in range(0, len(response), chunk_size):
+                    chunk = response[start:start + chunk_size]
+                    await asyncio.sleep(self._output_delay(chunk))
+                    yield chunk
+                outcome = "success"
+            finally:
+                await self._record(prompt, response, started, first_token, outcome)
@@ -0,0 +1,156 @@
+"""
+Hedged LLM - Latency-bounded composite of a primary and a secondary provider
+
+If the primary has not answered within the hedge deadline, the same
+request is sent to the secondary and whichever answers first wins; the
+loser is cancelled. Errors from either side fail over to the other.
+Every call is counted by the provider that served it and how it got
+there (primary, hedge or failover).
+"""
+
+import asyncio
+import logging
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, Callable, List, Tuple
+
+from app.agents.base import BaseLLM
+from app.core.metrics import LLM_ROUTED
+
+logger = logging.getLogger(__name__)
+
+
+class HedgedLLM(BaseLLM):
+    """Primary LLM with a deadline-triggered hedge and error failover"""
+
+    def __init__(self, primary: BaseLLM, secondary: BaseLLM, hedge_after: float):
+        self.primary = primary
+        self.secondary = secondary
+        self.hedge_after = hedge_after
+        self.stats: Dict[str, int] = {}
+
+    # The owning agent labels both backends; cache fingerprints follow the primary
+
+    @property
+    def provider(self) -> str:
+        return self.primary.provider
+
+    @property
+    def agent_name(self) -> str:
+        return self.primary.agent_name
+
+    @agent_name.setter
+    def agent_name(self, name: str):
+        self.primary.agent_name = name
+        self.secondary.agent_name = name
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self.primary, "model", None)
+
+    @property
+    def temperature(self) -> Optional[float]:
+        return getattr(self.primary, "temperature", None)
+
+    @property
+    def max_tokens(self) -> Optional[int]:
+        return getattr(self.primary, "max_tokens", None)
+
+    def _served(self, llm: BaseLLM, route: str):
+        key = f"{llm.provider}:{route}"
+        self.stats[key] = self.stats.get(key, 0) + 1
+        LLM_ROUTED.labels(self.agent_name, llm.provider, route).inc()
+        if route != "primary":
+            logger.info(f"{self.agent_name}: served by {llm.provider} ({route})")
+
+    async def _race(self, start: Callable[[BaseLLM], Awaitable[Any]]) -> Tuple[Any, BaseLLM, List[asyncio.Task]]:
+        """
+        Run start(primary), hedging with start(secondary) after the deadline
+
+        Returns the first successful result, the backend that produced it
+        and any still-running tasks (the caller cancels them).
+        """
+
+        primary = asyncio.create_task(start(self.primary))
+        backends = {primary: self.primary}
+        pending = {primary}
+        route = "primary"
+
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_after)
+
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        self._served(backends[task], route)
+                        return task.result(), backends[task], list(pending)
+
+                for task in done:
+                    logger.warning(
+                        f"{self.agent_name}: {backends[task].provider} failed: {task.exception()}"
+                    )
+
+                if self.secondary not in backends.values():
+                    # Deadline passed (hedge) or the primary failed (failover)
+                    if route == "primary":
+                        route = "failover" if done else "hedge"
+                    secondary = asyncio.create_task(start(self.secondary))
+                    backends[secondary] = self.secondary
+                    pending.add(secondary)
+                elif not pending:
+                    raise next(iter(done)).exception()
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+
+    async def generate(self, prompt: str, system: Optional[str] = None) -> str:
+        """Generate text from whichever backend answers first"""
+
+        result, _, pending = await self._race(lambda llm: llm.generate(prompt=prompt, system=system))
+        for task in pending:
+            task.cancel()
+        return result
+
+    async def stream(self, prompt: str, system: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Stream from whichever backend produces a first chunk first
+
+        The hedge deadline applies to time to first token; once a backend
+        has started streaming the other one is cancelled.
+        """
+
+        streams: Dict[BaseLLM, AsyncIterator[str]] = {}
+
+        async def first_chunk(llm: BaseLLM) -> Optional[str]:
+            iterator = llm.stream(prompt=prompt, system=system)
+            try:
+                chunk = await iterator.__anext__()
+            except StopAsyncIteration:
+                chunk = None
+            except BaseException:
+                await iterator.aclose()
+                raise
+            streams[llm] = iterator
+            return chunk
+
+        chunk, winner, pending = await self._race(first_chunk)
+
+        # Let the losers finish cancelling before closing their streams
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for llm, iterator in streams.items():
+            if llm is not winner:
+                await iterator.aclose()
+
+        if chunk is None:
+            return
+
+        iterator = streams[winner]
+        try:
+            yield chunk
+            async for chunk in iterator:
+                yield chunk
+        finally:
+            await iterator.aclose()
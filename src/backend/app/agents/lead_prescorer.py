@@ -0,0 +1,301 @@
+"""
+Lead pre-scorer - Fast rule-based scoring that runs before the LLM
+
+Scores leads with configurable weighted rules over source, job title
+seniority, enrichment size/industry/revenue and email domain. Leads that
+land clearly in Hot or Cold territory are classified locally and the
+Claude call is skipped.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import LEAD_PRESCORE_DECISIONS
+
+
+DEFAULT_RULES: Dict[str, Any] = {
+    "base_score": 40,
+    "source": {
+        "referral": 20,
+        "inbound": 15,
+        "website": 10,
+        "event": 10,
+        "partner": 10,
+        "linkedin": 5,
+        "cold_call": -5,
+        "purchased_list": -15,
+    },
+    "seniority": {
+        "c_level": 35,
+        "vp": 25,
+        "director": 15,
+        "manager": 5,
+        "individual": -10,
+        "missing": -15,
+    },
+    "company_size": {
+        "enterprise": 25,
+        "large": 15,
+        "medium": 5,
+        "small": -5,
+    },
+    "revenue": {
+        "1b_plus": 20,
+        "100m_plus": 15,
+        "10m_plus": 8,
+        "under_1m": -5,
+    },
+    "industry": {
+        "target": 10,
+    },
+    "email_domain": {
+        "free": -20,
+        "corporate": 5,
+    },
+    "target_industries": [
+        "technology", "software", "saas", "internet",
+        "financial services", "banking", "insurance", "healthcare",
+    ],
+    "free_email_domains": [
+        "gmail.com", "googlemail.com", "yahoo.com", "yahoo.com.br", "hotmail.com",
+        "outlook.com", "live.com", "msn.com", "aol.com", "icloud.com", "me.com",
+        "protonmail.com", "proton.me", "gmx.com", "uol.com.br", "bol.com.br",
+    ],
+}
+
+SENIORITY_PATTERNS: List[Tuple[str, re.Pattern]] = [
+    ("c_level", re.compile(r"\b(ceo|cto|cfo|coo|cmo|cio|cro|chief|founder|co-founder|owner|president)\b")),
+    ("vp", re.compile(r"\b(vp|svp|evp|vice president)\b")),
+    ("director", re.compile(r"\b(director|head of|head)\b")),
+    ("manager", re.compile(r"\b(manager|lead|supervisor|coordinator)\b")),
+    ("individual", re.compile(r"\b(analyst|intern|student|assistant|associate|specialist)\b")),
+]
+
+REVENUE_PATTERN = re.compile(r"\$?\s*([\d.,]+)\s*([kmb])?", re.IGNORECASE)
+REVENUE_MULTIPLIERS = {"k": 1e3, "m": 1e6, "b": 1e9}
+
+# Feature families in the order used for the batch weight matrix
+FEATURES = ("source", "seniority", "company_size", "revenue", "industry", "email_domain")
+
+
+@dataclass
+class PreScore:
+    """Pre-scoring outcome for one lead"""
+
+    score: int
+    classification: str
+    confident: bool
+    matched_rules: List[str] = field(default_factory=list)
+
+    def to_result(self) -> Dict[str, Any]:
+        """Shape the pre-score like a LeadQualifierAgent result"""
+        next_actions = {
+            "Hot": ["Call within 24 hours", "Send tailored proposal", "Loop in account executive"],
+            "Warm": ["Send introduction email", "Schedule discovery call"],
+            "Cold": ["Add to nurture sequence", "Verify contact details"],
+        }[self.classification]
+
+        return {
+            "score": self.score,
+            "classification": self.classification,
+            "reasoning": "Rule-based pre-score: " + (", ".join(self.matched_rules) or "no signals"),
+            "next_actions": next_actions,
+            "bant": {
+                "budget": "Unknown",
+                "authority": "Unknown",
+                "need": "Unknown",
+                "timeline": "Unknown"
+            },
+            "prescored": True
+        }
+
+
+def _classify(score: int) -> str:
+    if score > 70:
+        return "Hot"
+    if score >= 40:
+        return "Warm"
+    return "Cold"
+
+
+class LeadPreScorer:
+    """Weighted rule engine with a vectorized batch mode"""
+
+    def __init__(
+        self,
+        rules: Optional[Dict[str, Any]] = None,
+        hot_threshold: Optional[int] = None,
+        cold_threshold: Optional[int] = None
+    ):
+        self.rules = {**DEFAULT_RULES, **(rules or {})}
+        self.hot_threshold = hot_threshold if hot_threshold is not None else settings.LEAD_PRESCORE_HOT_THRESHOLD
+        self.cold_threshold = cold_threshold if cold_threshold is not None else settings.LEAD_PRESCORE_COLD_THRESHOLD
+        self.target_industries = [i.lower() for i in self.rules["target_industries"]]
+        self.free_email_domains = {d.lower() for d in self.rules["free_email_domains"]}
+        self.stats = {"evaluated": 0, "hot": 0, "cold": 0, "llm": 0}
+
+        # One weight vector per feature family; index 0 is "no signal"
+        self.categories: Dict[str, List[str]] = {
+            name: [None] + list(self.rules[name]) for name in FEATURES
+        }
+        self.weights: Dict[str, np.ndarray] = {
+            name: np.array([0] + list(self.rules[name].values()), dtype=np.int32)
+            for name in FEATURES
+        }
+
+    # Feature extraction
+
+    def _enrichment_value(self, enrichment: Dict[str, Any], *keys: str) -> Optional[Any]:
+        company = enrichment.get("company") if isinstance(enrichment.get("company"), dict) else {}
+        for key in keys:
+            value = enrichment.get(key) or company.get(key)
+            if value:
+                return value
+        return None
+
+    def _seniority(self, job_title: Optional[str]) -> Optional[str]:
+        if not job_title:
+            return "missing"
+        title = job_title.lower()
+        for level, pattern in SENIORITY_PATTERNS:
+            if pattern.search(title):
+                return level
+        return None
+
+    def _revenue(self, revenue: Any) -> Optional[str]:
+        if revenue is None:
+            return None
+        if isinstance(revenue, (int, float)):
+            amount = float(revenue)
+        else:
+            # Clearbit ranges look like "$10M-$50M"; use the upper bound
+            matches = REVENUE_PATTERN.findall(str(revenue).replace(",", ""))
+            amounts = [
+                float(number) * REVENUE_MULTIPLIERS.get(unit.lower(), 1)
+                for number, unit in matches if number.strip(".")
+            ]
+            if not amounts:
+                return None
+            amount = max(amounts)
+
+        if amount >= 1e9:
+            return "1b_plus"
+        if amount >= 1e8:
+            return "100m_plus"
+        if amount >= 1e7:
+            return "10m_plus"
+        if amount < 1e6:
+            return "under_1m"
+        return None
+
+    def _industry(self, industry: Optional[str]) -> Optional[str]:
+        if not industry:
+            return None
+        industry = str(industry).lower()
+        return "target" if any(target in industry for target in self.target_industries) else None
+
+    def _email_domain(self, email: Optional[str]) -> Optional[str]:
+        if not email or "@" not in email:
+            return None
+        domain = email.rsplit("@", 1)[1].lower()
+        return "free" if domain in self.free_email_domains else "corporate"
+
+    def extract(self, lead: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """Map a lead to one category per feature family"""
+        enrichment = lead.get("enrichment_data") or {}
+        source = (lead.get("source") or "").lower()
+
+        return {
+            "source": source if source in self.rules["source"] else None,
+            "seniority": self._seniority(lead.get("job_title")),
+            "company_size": self._enrichment_value(enrichment, "size", "company_size"),
+            "revenue": self._revenue(self._enrichment_value(enrichment, "revenue")),
+            "industry": self._industry(self._enrichment_value(enrichment, "industry")),
+            "email_domain": self._email_domain(lead.get("email")),
+        }
+
+    # Scoring
+
+    def _decide(self, score: int) -> Tuple[str, bool]:
+        confident = score >= self.hot_threshold or score <= self.cold_threshold
+        return _classify(score), confident
+
+    def _count(self, classification: str, confident: bool):
+        self.stats["evaluated"] += 1
+        if not confident:
+            decision = "llm"
+        else:
+            decision = "hot" if classification == "Hot" else "cold"
+        self.stats[decision] += 1
+        LEAD_PRESCORE_DECISIONS.labels(decision).inc()
+
+    def score(self, lead: Dict[str, Any]) -> PreScore:
+        """Score a single lead"""
+        features = self.extract(lead)
+        total = self.rules["base_score"]
+        matched = []
+
+        for name in FEATURES:
+            category = features[name]
+            weight = self.rules[name].get(category, 0) if category else 0
+            if weight:
+                total += weight
+                matched.append(f"{name}={category} ({weight:+d})")
+
+        total = int(min(100, max(0, total)))
+        classification, confident = self._decide(total)
+        self._count(classification, confident)
+
+        return PreScore(total, classification, confident, matched)
+
+    def score_batch(self, leads: List[Dict[str, Any]]) -> List[PreScore]:
+        """
+        Score many leads in one vectorized pass
+
+        Features are encoded to integer category indices, then all rule
+        weights are gathered and summed with NumPy.
+        """
+        if not leads:
+            return []
+
+        index = {
+            name: {category: i for i, category in enumerate(self.categories[name])}
+            for name in FEATURES
+        }
+        extracted = [self.extract(lead) for lead in leads]
+        codes = np.array(
+            [[index[name].get(features[name], 0) for name in FEATURES] for features in extracted],
+            dtype=np.int32
+        )
+
+        contributions = np.column_stack([
+            self.weights[name][codes[:, column]] for column, name in enumerate(FEATURES)
+        ])
+        scores = np.clip(self.rules["base_score"] + contributions.sum(axis=1), 0, 100)
+        confident = (scores >= self.hot_threshold) | (scores <= self.cold_threshold)
+
+        results = []
+        for row, (score, is_confident) in enumerate(zip(scores.tolist(), confident.tolist())):
+            matched = [
+                f"{name}={self.categories[name][codes[row, column]]} ({int(contributions[row, column]):+d})"
+                for column, name in enumerate(FEATURES)
+                if contributions[row, column]
+            ]
+            classification = _classify(score)
+            self._count(classification, is_confident)
+            results.append(PreScore(int(score), classification, is_confident, matched))
+
+        return results
+
+    def report(self) -> Dict[str, Any]:
+        """How many LLM calls pre-scoring avoided"""
+        avoided = self.stats["hot"] + self.stats["cold"]
+        evaluated = self.stats["evaluated"]
+        return {
+            **self.stats,
+            "llm_calls_avoided": avoided,
+            "avoided_ratio": round(avoided / evaluated, 4) if evaluated else 0.0
+        }
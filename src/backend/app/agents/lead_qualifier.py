@@ -2,9 +2,33 @@
 LeadQualifier Agent - Qualifies leads using AI
 """
 
-import json
-from typing import Dict, Any
-from app.agents.base import BaseAgent, ClaudeLLM
+from typing import Dict, Any, List
+from pydantic import BaseModel, Field, field_validator
+from app.agents.base import BaseAgent, create_llm
+from app.agents.lead_prescorer import LeadPreScorer
+from app.core.config import settings
+
+
+class BANTAssessment(BaseModel):
+    budget: str = "Unknown"
+    authority: str = "Unknown"
+    need: str = "Unknown"
+    timeline: str = "Unknown"
+
+
+class LeadQualification(BaseModel):
+    """Expected LeadQualifier completion"""
+
+    score: int
+    classification: str = "Warm"
+    reasoning: str = ""
+    next_actions: List[str] = Field(default_factory=lambda: ["Schedule call", "Send introduction email"])
+    bant: BANTAssessment = Field(default_factory=BANTAssessment)
+
+    @field_validator("score", mode="before")
+    @classmethod
+    def round_score(cls, value: Any) -> Any:
+        return round(value) if isinstance(value, float) else value
 
 
 class LeadQualifierAgent(BaseAgent):
@@ -23,6 +47,8 @@ Analyze lead data and provide accurate qualification scores and recommendations.
 Use BANT framework (Budget, Authority, Need, Timeline) when applicable.
 Output must be valid JSON."""
 
+    output_schema = LeadQualification
+
     QUALIFICATION_PROMPT = """Qualify this lead and provide recommendations:
 
 Lead Information:
@@ -60,8 +86,9 @@ Output as JSON:
         super().__init__(
             name="LeadQualifier",
             description="Qualifies leads and provides recommendations",
-            llm=ClaudeLLM(temperature=0.7, max_tokens=2000)
+            llm=create_llm(temperature=0.7, max_tokens=2000)
         )
+        self.prescorer = LeadPreScorer()
 
     async def run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -74,6 +101,15 @@ Output as JSON:
             Dict with score, classification, reasoning, next_actions
         """
 
+        # Clearly hot or cold leads are classified without calling the LLM.
+        # Forced refreshes always reach the LLM, so they are not pre-scored
+        # (and not counted as avoided calls).
+        skip = input_data.get("skip_prescore") or input_data.get("force_refresh")
+        if settings.LEAD_PRESCORE_ENABLED and not skip:
+            prescore = self.prescorer.score(input_data)
+            if prescore.confident:
+                return prescore.to_result()
+
         # Format enrichment data summary
         enrichment = input_data.get("enrichment_data", {})
         enrichment_summary = "Not available"
@@ -96,16 +132,15 @@ Output as JSON:
             enrichment_summary=enrichment_summary
         )
 
-        response = await self.llm.generate(
+        result = await self.generate_structured(
             prompt=prompt,
-            system=self.SYSTEM_PROMPT
+            system=self.SYSTEM_PROMPT,
+            force_refresh=input_data.get("force_refresh", False)
         )
 
-        try:
-            result = json.loads(response)
-
+        if result is not None:
             # Validate score
-            score = result.get("score", 50)
+            score = result["score"]
             if not 0 <= score <= 100:
                 score = 50
 
@@ -119,25 +154,23 @@ Output as JSON:
 
             result["score"] = score
             result["classification"] = classification
-            result.setdefault("next_actions", ["Schedule call", "Send introduction email"])
 
             return result
 
-        except json.JSONDecodeError:
-            # Fallback response
-            return {
-                "score": 50,
-                "classification": "Warm",
-                "reasoning": "Unable to fully analyze lead. Requires manual review.",
-                "next_actions": [
-                    "Review lead manually",
-                    "Research company",
-                    "Schedule discovery call"
-                ],
-                "bant": {
-                    "budget": "Unknown",
-                    "authority": "To be determined",
-                    "need": "To be qualified",
-                    "timeline": "Unknown"
-                }
+        # Fallback response
+        return {
+            "score": 50,
+            "classification": "Warm",
+            "reasoning": "Unable to fully analyze lead. Requires manual review.",
+            "next_actions": [
+                "Review lead manually",
+                "Research company",
+                "Schedule discovery call"
+            ],
+            "bant": {
+                "budget": "Unknown",
+                "authority": "To be determined",
+                "need": "To be qualified",
+                "timeline": "Unknown"
             }
+        }
@@ -0,0 +1,103 @@
+"""
+OpenAI LLM - Secondary provider backend using the Chat Completions API
+"""
+
+import asyncio
+from typing import Optional, Dict, Any, AsyncIterator
+import openai
+
+from app.agents.base import StreamingLLM
+from app.core.config import settings
+
+# Shared async client and concurrency limiter for all OpenAI calls
+_async_client: Optional[openai.AsyncOpenAI] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_openai_client() -> openai.AsyncOpenAI:
+    """Get the process-wide async OpenAI client"""
+    global _async_client
+    if _async_client is None:
+        _async_client = openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            max_retries=0  # OpenAILLM retries itself so retries can be counted
+        )
+    return _async_client
+
+
+async def close_openai_client():
+    """Close the shared OpenAI client and its connection pool"""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+
+def get_openai_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore bounding concurrent OpenAI calls"""
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+    return _semaphore
+
+
+class OpenAILLM(StreamingLLM):
+    """OpenAI LLM wrapper using the Chat Completions API"""
+
+    provider = "openai"
+
+    # Streamed chat completions carry no usage block
+    REPORTS_USAGE = False
+
+    RETRYABLE_ERRORS = (
+        openai.APIConnectionError,
+        openai.InternalServerError
+    )
+    RATE_LIMIT_ERRORS = (openai.RateLimitError,)
+
+    def __init__(
+        self,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        timeout: Optional[float] = None
+    ):
+        super().__init__(
+            model=model or settings.OPENAI_MODEL,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout=timeout or settings.OPENAI_TIMEOUT_SECONDS,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+            rate_limit_retries=settings.OPENAI_RATE_LIMIT_MAX_RETRIES,
+            backoff_base=settings.OPENAI_BACKOFF_BASE_SECONDS,
+            client=get_openai_client(),
+            semaphore=get_openai_semaphore()
+        )
+
+    def _request_kwargs(self, prompt: str, system: Optional[str] = None) -> Dict[str, Any]:
+        """Build chat.completions.create arguments"""
+
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "messages": messages
+        }
+
+    async def _create_stream(self, kwargs: Dict[str, Any]):
+        return await self.client.chat.completions.create(stream=True, **kwargs)
+
+    async def _stream_text(self, response: Any, usage: Dict[str, Any]) -> AsyncIterator[str]:
+        """Text deltas of a chat completion stream"""
+        async for chunk in response:
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content
+            if text:
+                yield text
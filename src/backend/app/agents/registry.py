@@ -0,0 +1,66 @@
+"""
+Agent registry - Process-wide agent instances with pooled LLM clients
+"""
+
+from typing import Dict, Optional
+import logging
+
+from app.agents.base import BaseAgent, get_async_client, close_async_client
+from app.agents.openai_llm import get_openai_client, close_openai_client
+from app.core.config import settings
+from app.agents.email_assistant import EmailAssistantAgent
+from app.agents.deal_predictor import DealPredictorAgent
+from app.agents.lead_qualifier import LeadQualifierAgent
+
+logger = logging.getLogger(__name__)
+
+
+class AgentRegistry:
+    """Builds agents once at startup and shares them across requests"""
+
+    def __init__(self):
+        self.agents: Dict[str, BaseAgent] = {}
+
+    async def startup(self):
+        """Create the configured providers' shared LLM clients and all agents"""
+        for provider in {settings.LLM_PROVIDER, settings.LLM_FALLBACK_PROVIDER}:
+            # The fake backend needs no client
+            if provider == "openai":
+                get_openai_client()
+            elif provider and provider != "fake":
+                get_async_client()
+        for agent in (EmailAssistantAgent(), LeadQualifierAgent(), DealPredictorAgent()):
+            self.agents[agent.name] = agent
+        logger.info(f"Agent registry ready: {', '.join(self.agents)}")
+
+    async def close(self):
+        """Drop agents and close pooled LLM connections"""
+        self.agents.clear()
+        await close_async_client()
+        await close_openai_client()
+        logger.info("Agent registry closed")
+
+    def get(self, name: str) -> Optional[BaseAgent]:
+        """Get agent by name"""
+        return self.agents.get(name)
+
+    @property
+    def email_assistant(self) -> EmailAssistantAgent:
+        return self.agents["EmailAssistant"]
+
+    @property
+    def lead_qualifier(self) -> LeadQualifierAgent:
+        return self.agents["LeadQualifier"]
+
+    @property
+    def deal_predictor(self) -> DealPredictorAgent:
+        return self.agents["DealPredictor"]
+
+
+# Global registry instance
+agent_registry = AgentRegistry()
+
+
+async def get_agent_registry() -> AgentRegistry:
+    """Get agent registry instance"""
+    return agent_registry
@@ -0,0 +1,89 @@
+"""
+Structured output - Tolerant JSON extraction and validation for agent completions
+
+Models often wrap the requested JSON in markdown fences or a sentence of
+prose. extract_json() finds the first complete JSON value in the text
+instead of requiring the whole completion to be JSON; parse_output()
+then validates it against the agent's Pydantic schema.
+"""
+
+import json
+import re
+from typing import Any, Optional, Tuple, Type
+from pydantic import BaseModel, ValidationError
+
+FENCE_PATTERN = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)```", re.DOTALL)
+
+_decoder = json.JSONDecoder()
+
+
+class StructuredOutputError(ValueError):
+    """Completion holds no JSON value matching the schema"""
+
+
+def extract_json(text: str, expect: str = "{") -> Tuple[Any, bool]:
+    """
+    Find the first JSON value of the expected kind in text
+
+    Args:
+        text: Raw completion
+        expect: "{" for an object, "[" for an array
+
+    Returns:
+        (value, clean) where clean is True if the text was pure JSON
+
+    Raises:
+        StructuredOutputError: If no complete value is found
+    """
+
+    stripped = text.strip()
+    try:
+        return json.loads(stripped), True
+    except json.JSONDecodeError:
+        pass
+
+    # Prefer fenced blocks, then scan the whole text
+    candidates = [match.group(1) for match in FENCE_PATTERN.finditer(text)] + [text]
+
+    for candidate in candidates:
+        start = candidate.find(expect)
+        while start != -1:
+            try:
+                value, _ = _decoder.raw_decode(candidate, start)
+                return value, False
+            except json.JSONDecodeError:
+                start = candidate.find(expect, start + 1)
+
+    raise StructuredOutputError("No JSON value found in completion")
+
+
+def parse_output(text: str, schema: Type[BaseModel]) -> Tuple[BaseModel, bool]:
+    """
+    Extract and validate a completion against schema
+
+    Returns:
+        (model, clean) where clean is True if no extraction was needed
+
+    Raises:
+        StructuredOutputError: If extraction or validation fails
+    """
+
+    value, clean = extract_json(text)
+    try:
+        return schema.model_validate(value), clean
+    except ValidationError as e:
+        raise StructuredOutputError(str(e)) from e
+
+
+def repair_prompt(text: str, schema: Type[BaseModel], error: Optional[str]) -> str:
+    """Prompt asking the model to turn a malformed completion into valid JSON"""
+    return f"""Convert the following text into a single JSON object matching this JSON schema.
+Output only the JSON object, with no markdown and no commentary.
+
+JSON schema:
+{json.dumps(schema.model_json_schema())}
+
+Problem: {error or "not valid JSON"}
+
+Text:
+{text[:6000]}"""
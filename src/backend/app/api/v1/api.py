@@ -3,7 +3,7 @@ API v1 router aggregation
 """
 
 from fastapi import APIRouter
-from app.api.v1.endpoints import leads, deals, ai, auth, notifications, settings, google_calendar
+from app.api.v1.endpoints import leads, deals, activities, ai, jobs, auth, notifications, settings, google_calendar
 
 api_router = APIRouter()
 
@@ -13,9 +13,11 @@ api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 # Core resources (auth required)
 api_router.include_router(leads.router, prefix="/leads", tags=["leads"])
 api_router.include_router(deals.router, prefix="/deals", tags=["deals"])
+api_router.include_router(activities.router, prefix="/activities", tags=["activities"])
 
 # AI & Intelligence
 api_router.include_router(ai.router, prefix="/ai", tags=["ai"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 
 # User features
 api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
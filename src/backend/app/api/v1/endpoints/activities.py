@@ -0,0 +1,114 @@
+"""
+Activity API endpoints
+"""
+
+from typing import Optional, List
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel, Field
+
+from app.database import get_database
+from app.dependencies import get_current_active_user
+from app.models.user import User
+from app.models.activity import Activity, ActivityCreate
+from app.services.activity_service import ActivityService, ENTITY_COLLECTIONS
+
+router = APIRouter()
+
+
+class BulkActivityRequest(BaseModel):
+    activities: List[ActivityCreate] = Field(..., min_length=1, max_length=1000)
+
+
+async def _check_entities(service: ActivityService, activities: List[ActivityCreate], user: User):
+    """Every referenced entity must exist and belong to the user"""
+
+    by_type = {}
+    for activity in activities:
+        if activity.entity_type not in ENTITY_COLLECTIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown entity type: {activity.entity_type}"
+            )
+        by_type.setdefault(activity.entity_type, set()).add(activity.entity_id)
+
+    for entity_type, entity_ids in by_type.items():
+        owned = await service.owned_entities(entity_type, list(entity_ids), str(user.id))
+        if owned != entity_ids:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{entity_type.capitalize()} not found")
+
+
+async def _check_entity(service: ActivityService, entity_type: str, entity_id: str, user: User):
+    if entity_type not in ENTITY_COLLECTIONS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown entity type: {entity_type}")
+    if not ObjectId.is_valid(entity_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid entity id")
+    if not await service.owned_entities(entity_type, [ObjectId(entity_id)], str(user.id)):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{entity_type.capitalize()} not found")
+
+
+@router.post("/", response_model=Activity, status_code=status.HTTP_201_CREATED)
+async def log_activity(
+    activity_data: ActivityCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Log an activity on a lead, deal, contact or company"""
+    service = ActivityService(db)
+    await _check_entities(service, [activity_data], current_user)
+    return await service.log_activity(activity_data, str(current_user.id))
+
+
+@router.post("/bulk", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def bulk_log_activities(
+    request: BulkActivityRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Ingest up to 1000 activities in one request"""
+    service = ActivityService(db)
+    await _check_entities(service, request.activities, current_user)
+    inserted = await service.bulk_log_activities(request.activities, str(current_user.id))
+    return {"inserted": inserted}
+
+
+@router.get("/{entity_type}/{entity_id}", response_model=dict)
+async def get_timeline(
+    entity_type: str,
+    entity_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Activity timeline of an entity, newest first, paginated by cursor"""
+    service = ActivityService(db)
+    await _check_entity(service, entity_type, entity_id, current_user)
+
+    try:
+        activities, next_cursor = await service.get_timeline(entity_type, entity_id, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    counters = await service.get_counters(entity_type, entity_id)
+
+    return {
+        "items": activities,
+        "total": counters["total"],
+        "next_cursor": next_cursor,
+        "limit": limit
+    }
+
+
+@router.get("/{entity_type}/{entity_id}/counters", response_model=dict)
+async def get_activity_counters(
+    entity_type: str,
+    entity_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Activity totals by type and last activity time for an entity"""
+    service = ActivityService(db)
+    await _check_entity(service, entity_type, entity_id, current_user)
+    return await service.get_counters(entity_type, entity_id)
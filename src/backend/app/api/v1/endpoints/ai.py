@@ -2,17 +2,31 @@
 AI endpoints - AI agent operations
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import json
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List, Awaitable
+from bson import ObjectId
 
+from app.core.config import settings
+from app.core.metrics import current_priority, AI_REQUESTS_CANCELLED
 from app.database import get_database
 from app.dependencies import get_current_active_user
 from app.models.user import User
-from app.agents import EmailAssistantAgent, DealPredictorAgent, LeadQualifierAgent
+from app.models.lead import Lead
+from app.agents import AgentRegistry, get_agent_registry
+from app.agents.base import get_scheduler
 from app.services.lead_service import LeadService
 from app.services.deal_service import DealService
+from app.services.ai_service import AIService
+from app.services.usage_service import UsageService
+from app.services.win_model_service import WinModelService
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -25,18 +39,70 @@ class EmailGenerationRequest(BaseModel):
 
 class LeadQualificationRequest(BaseModel):
     lead_id: str
+    force_refresh: bool = False
+
+
+class BatchLeadQualificationRequest(BaseModel):
+    lead_ids: List[str] = Field(..., min_length=1)
+    force_refresh: bool = False
 
 
 class DealPredictionRequest(BaseModel):
     deal_id: str
+    force_refresh: bool = False
+
+
+async def _wait_for_disconnect(request: Request):
+    while not await request.is_disconnected():
+        await asyncio.sleep(settings.AI_DISCONNECT_POLL_SECONDS)
+
+
+async def _run_cancellable(request: Request, route: str, timeout: float, work: Awaitable[Any]) -> Any:
+    """
+    Await work unless the client disconnects or the route deadline passes
+
+    Either way the work is cancelled, which releases its LLM slot and
+    skips the result write-back.
+    """
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+
+    try:
+        done, _ = await asyncio.wait({task, watcher}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        task.cancel()
+        AI_REQUESTS_CANCELLED.labels(route, "disconnect").inc()
+        raise
+    finally:
+        watcher.cancel()
+
+    if task in done:
+        return task.result()
+
+    task.cancel()
+
+    if watcher in done:
+        AI_REQUESTS_CANCELLED.labels(route, "disconnect").inc()
+        logger.info(f"{route}: client disconnected, AI request cancelled")
+        raise HTTPException(status_code=499, detail="Client closed request")
+
+    AI_REQUESTS_CANCELLED.labels(route, "deadline").inc()
+    raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="AI request timed out")
 
 
 # Email Generation
+def _sse_event(event: str, data: Any) -> str:
+    """Format a Server-Sent Event frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @router.post("/email/generate")
 async def generate_email(
     request: EmailGenerationRequest,
+    http_request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    agents: AgentRegistry = Depends(get_agent_registry)
 ):
     """
     Generate email variations for a lead using AI
@@ -54,31 +120,82 @@ async def generate_email(
     if str(lead.owner_id) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    # Prepare agent input
-    agent_input = {
-        "lead_name": lead.name,
-        "company": lead.company or "your company",
-        "job_title": lead.job_title or "",
-        "context": request.context
-    }
-
     # Generate emails
-    agent = EmailAssistantAgent()
-    result = await agent.run(agent_input)
+    return await _run_cancellable(
+        http_request,
+        "email_generate",
+        settings.AI_EMAIL_TIMEOUT_SECONDS,
+        AIService(db, agents).generate_email(lead, request.context)
+    )
 
-    return {
-        "lead_id": request.lead_id,
-        "variations": result.get("variations", []),
-        "agent": "EmailAssistant"
-    }
+
+@router.post("/email/generate/stream")
+async def generate_email_stream(
+    request: EmailGenerationRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    agents: AgentRegistry = Depends(get_agent_registry)
+):
+    """
+    Generate email variations for a lead, streamed as Server-Sent Events
+
+    Events: "token" for each completion delta, "variation" for each
+    variation as soon as it is complete, then "done" (or "error").
+    """
+
+    lead_service = LeadService(db)
+    lead = await lead_service.get_lead(request.lead_id)
+
+    if not lead:
+        raise HTTPException(status_code=404, detail="Lead not found")
+
+    if str(lead.owner_id) != str(current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    agent_input = AIService.email_assistant_input(lead, request.context)
+
+    async def stream():
+        variations = 0
+        try:
+            # Starlette cancels this generator when the client disconnects
+            async with asyncio.timeout(settings.AI_EMAIL_TIMEOUT_SECONDS):
+                async for kind, payload in agents.email_assistant.stream(agent_input):
+                    if kind == "variation":
+                        variations += 1
+                    yield _sse_event(kind, payload)
+        except asyncio.CancelledError:
+            AI_REQUESTS_CANCELLED.labels("email_generate_stream", "disconnect").inc()
+            raise
+        except TimeoutError:
+            AI_REQUESTS_CANCELLED.labels("email_generate_stream", "deadline").inc()
+            yield _sse_event("error", {"detail": "Email generation timed out"})
+            return
+        except Exception as e:
+            logger.error(f"Email stream failed for lead {request.lead_id}: {e}")
+            yield _sse_event("error", {"detail": "Email generation failed"})
+            return
+
+        yield _sse_event("done", {
+            "lead_id": request.lead_id,
+            "variations": variations,
+            "agent": "EmailAssistant"
+        })
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 # Lead Qualification
 @router.post("/lead/qualify")
 async def qualify_lead(
     request: LeadQualificationRequest,
+    http_request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    agents: AgentRegistry = Depends(get_agent_registry)
 ):
     """
     Qualify a lead using AI
@@ -96,46 +213,142 @@ async def qualify_lead(
     if str(lead.owner_id) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    # Prepare agent input
-    agent_input = {
-        "name": lead.name,
-        "email": lead.email,
-        "company": lead.company,
-        "job_title": lead.job_title,
-        "source": lead.source,
-        "enrichment_data": lead.enrichment_data
-    }
-
-    # Qualify lead
-    agent = LeadQualifierAgent()
-    result = await agent.run(agent_input)
-
-    # Update lead with qualification
-    await lead_service.qualify_lead(
-        lead_id=request.lead_id,
-        score=result["score"],
-        classification=result["classification"],
-        reasoning=result["reasoning"],
-        next_actions=result.get("next_actions", [])
+    # Qualify lead and store the qualification
+    return await _run_cancellable(
+        http_request,
+        "lead_qualify",
+        settings.AI_LEAD_QUALIFY_TIMEOUT_SECONDS,
+        AIService(db, agents).qualify_lead(lead, request.force_refresh)
     )
 
-    return {
-        "lead_id": request.lead_id,
-        "score": result["score"],
-        "classification": result["classification"],
-        "reasoning": result["reasoning"],
-        "next_actions": result.get("next_actions", []),
-        "bant": result.get("bant", {}),
-        "agent": "LeadQualifier"
-    }
+
+@router.post("/lead/qualify/batch")
+async def qualify_leads_batch(
+    request: BatchLeadQualificationRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    agents: AgentRegistry = Depends(get_agent_registry)
+):
+    """
+    Qualify many leads using AI with bounded parallelism
+
+    Streams newline-delimited JSON: one line per lead as soon as it
+    finishes, then a summary line. LLM qualifications go through
+    AIService, so they coalesce with identical in-flight requests and
+    are stored as each one completes; pre-scored leads are written back
+    in a single bulk write.
+    """
+
+    lead_ids = list(dict.fromkeys(request.lead_ids))
+
+    if len(lead_ids) > settings.AI_BATCH_MAX_LEADS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.AI_BATCH_MAX_LEADS} leads per batch"
+        )
+
+    invalid_ids = [lead_id for lead_id in lead_ids if not ObjectId.is_valid(lead_id)]
+    valid_ids = [lead_id for lead_id in lead_ids if ObjectId.is_valid(lead_id)]
+
+    lead_service = LeadService(db)
+    leads = await lead_service.get_leads(valid_ids, str(current_user.id))
+    found_ids = {str(lead.id) for lead in leads}
+    missing_ids = [lead_id for lead_id in valid_ids if lead_id not in found_ids]
+
+    semaphore = asyncio.Semaphore(settings.AI_BATCH_CONCURRENCY)
+
+    # Pre-score the whole batch in one vectorized pass; only unclear leads reach the LLM
+    prescored: Dict[str, Dict[str, Any]] = {}
+
+    if settings.LEAD_PRESCORE_ENABLED and not request.force_refresh:
+        agent_inputs = [AIService.lead_qualifier_input(lead) for lead in leads]
+        prescores = agents.lead_qualifier.prescorer.score_batch(agent_inputs)
+        for lead, prescore in zip(leads, prescores):
+            if prescore.confident:
+                prescored[str(lead.id)] = prescore.to_result()
+
+    ai_service = AIService(db, agents)
+
+    async def qualify(lead: Lead) -> Dict[str, Any]:
+        if str(lead.id) in prescored:
+            return {"lead_id": str(lead.id), "result": prescored[str(lead.id)]}
+
+        # Batch calls yield provider capacity to interactive requests
+        current_priority.set("bulk")
+
+        async with semaphore:
+            try:
+                # Stored inside the coalesced call, so a disconnect never loses a paid-for result
+                result = await ai_service.qualify_lead(lead, request.force_refresh, skip_prescore=True)
+                return {"lead_id": str(lead.id), "result": result}
+            except Exception as e:
+                logger.error(f"Batch qualification failed for lead {lead.id}: {e}")
+                return {"lead_id": str(lead.id), "error": str(e)}
+
+    async def stream():
+        for lead_id in invalid_ids:
+            yield json.dumps({"lead_id": lead_id, "status": "error", "error": "Invalid lead id"}) + "\n"
+        for lead_id in missing_ids:
+            yield json.dumps({"lead_id": lead_id, "status": "error", "error": "Lead not found"}) + "\n"
+
+        qualified = 0
+        tasks = [asyncio.create_task(qualify(lead)) for lead in leads]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                outcome = await next_done
+                if "error" in outcome:
+                    yield json.dumps({**outcome, "status": "error"}) + "\n"
+                    continue
+
+                qualified += 1
+                result = outcome["result"]
+                yield json.dumps({
+                    "lead_id": outcome["lead_id"],
+                    "status": "ok",
+                    "score": result["score"],
+                    "classification": result["classification"],
+                    "reasoning": result["reasoning"],
+                    "next_actions": result.get("next_actions", []),
+                    "bant": result.get("bant", {}),
+                    "prescored": result.get("prescored", False)
+                }) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Pre-scored results in one bulk write, shielded so a disconnect still stores them
+            updated = await asyncio.shield(lead_service.bulk_qualify_leads([
+                {
+                    "lead_id": lead_id,
+                    "score": result["score"],
+                    "classification": result["classification"],
+                    "reasoning": result["reasoning"],
+                    "next_actions": result.get("next_actions", [])
+                }
+                for lead_id, result in prescored.items()
+            ]))
+
+        yield json.dumps({
+            "status": "complete",
+            "requested": len(lead_ids),
+            "qualified": qualified,
+            "failed": len(lead_ids) - qualified,
+            "updated": updated + qualified - len(prescored),
+            "llm_calls_avoided": len(prescored),
+            "agent": "LeadQualifier"
+        }) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 
 # Deal Prediction
 @router.post("/deal/predict")
 async def predict_deal(
     request: DealPredictionRequest,
+    http_request: Request,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncIOMotorDatabase = Depends(get_database)
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    agents: AgentRegistry = Depends(get_agent_registry)
 ):
     """
     Predict deal outcome using AI
@@ -153,71 +366,77 @@ async def predict_deal(
     if str(deal.owner_id) != str(current_user.id):
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    # Get activity count (simplified - would query activities collection)
-    activity_count = 0  # TODO: Query activities
-
-    # Prepare agent input
-    agent_input = {
-        "title": deal.title,
-        "value": deal.value,
-        "currency": deal.currency,
-        "stage": deal.stage,
-        "created_at": deal.created_at,
-        "expected_close_date": str(deal.expected_close_date) if deal.expected_close_date else "Not set",
-        "activity_count": activity_count,
-        "last_activity_date": "Unknown",  # TODO: Get from activities
-        "engagement_score": 50,  # TODO: Calculate
-        "contact_count": len(deal.contact_ids),
-        "decision_makers": 0  # TODO: Calculate from contacts
-    }
+    # Predict deal outcome and store AI insights
+    return await _run_cancellable(
+        http_request,
+        "deal_predict",
+        settings.AI_DEAL_PREDICT_TIMEOUT_SECONDS,
+        AIService(db, agents).predict_deal(deal, request.force_refresh)
+    )
 
-    # Predict deal outcome
-    agent = DealPredictorAgent()
-    result = await agent.run(agent_input)
-
-    # Update deal with AI insights
-    ai_insights = {
-        "win_probability": result["win_probability"],
-        "health_score": result["health_score"],
-        "predicted_close_date": result.get("predicted_close_date"),
-        "risk_factors": result.get("risk_factors", []),
-        "recommended_actions": result.get("recommended_actions", []),
-        "last_analysis": str(deal.updated_at)
-    }
 
-    from datetime import datetime
-    await db.deals.update_one(
-        {"_id": deal.id},
-        {
-            "$set": {
-                "ai_insights": ai_insights,
-                "ai_score": result["health_score"],
-                "risk_factors": result.get("risk_factors", []),
-                "updated_at": datetime.utcnow()
-            }
-        }
-    )
+@router.get("/deal/pipeline/scores")
+async def score_pipeline(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Statistical win probability for every open deal
+
+    Scored in one vectorized pass by the trained model, without the LLM.
+    """
+
+    service = WinModelService(db)
+    model = await service.get_model()
+
+    if model is None:
+        raise HTTPException(status_code=404, detail="Win model not trained yet")
+
+    scores = await service.score_open_deals(str(current_user.id))
 
     return {
-        "deal_id": request.deal_id,
-        "win_probability": result["win_probability"],
-        "health_score": result["health_score"],
-        "predicted_close_date": result.get("predicted_close_date"),
-        "risk_factors": result.get("risk_factors", []),
-        "recommended_actions": result.get("recommended_actions", []),
-        "reasoning": result.get("reasoning", ""),
-        "agent": "DealPredictor"
+        "items": scores,
+        "total": len(scores),
+        "model": {"trained_at": model.trained_at, "metrics": model.metrics}
     }
 
 
+@router.get("/usage")
+async def get_ai_usage(
+    days: int = Query(30, ge=1, le=365),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Daily LLM token, latency and cost rollups for the current user"""
+
+    service = UsageService(db)
+    usage = await service.get_daily_usage(str(current_user.id), days)
+
+    return {"items": usage, "days": days}
+
+
 @router.get("/health")
-async def ai_health():
+async def ai_health(agents: AgentRegistry = Depends(get_agent_registry)):
     """Check AI services health"""
     return {
-        "status": "healthy",
+        "status": "healthy" if agents.agents else "unavailable",
         "agents": {
-            "EmailAssistant": "available",
-            "LeadQualifier": "available",
-            "DealPredictor": "available"
+            name: "available" if agents.get(name) else "unavailable"
+            for name in ("EmailAssistant", "LeadQualifier", "DealPredictor")
+        },
+        "cache": {
+            name: agent.cache_stats
+            for name, agent in agents.agents.items()
+        },
+        "structured_output": {
+            name: agent.output_stats
+            for name, agent in agents.agents.items()
+        },
+        "lead_prescore": agents.lead_qualifier.prescorer.report() if agents.agents else {},
+        "scheduler": {"queue_depth": get_scheduler().queue_depth()},
+        "routing": {
+            name: agent.llm.stats
+            for name, agent in agents.agents.items()
+            if hasattr(agent.llm, "stats")
         }
     }
@@ -2,18 +2,27 @@
 Deal API endpoints
 """
 
-from typing import Optional
+from typing import Optional, List
+from bson import ObjectId
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel, Field
 
 from app.database import get_database
 from app.dependencies import get_current_active_user
+from app.core.projection import FIELDS_DESCRIPTION, parse_fields, partial_document
+from app.core.responses import MongoJSONResponse
 from app.models.user import User
 from app.models.deal import Deal, DealCreate, DealUpdate, DealResponse
 from app.services.deal_service import DealService
 
 router = APIRouter()
 
+
+class DealContactsRequest(BaseModel):
+    contact_ids: List[str] = Field(..., min_length=1)
+
+
 @router.post("/", response_model=DealResponse, status_code=status.HTTP_201_CREATED)
 async def create_deal(
     deal_data: DealCreate,
@@ -30,42 +39,64 @@ async def list_deals(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     stage: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides skip"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_current_active_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """List deals with pagination"""
     service = DealService(db)
-    deals, total = await service.list_deals(
-        owner_id=str(current_user.id),
-        skip=skip,
-        limit=limit,
-        stage=stage
-    )
-
-    return {
+    try:
+        deals, total, next_cursor = await service.list_deals(
+            owner_id=str(current_user.id),
+            skip=skip,
+            limit=limit,
+            stage=stage,
+            cursor=cursor,
+            fields=parse_fields(fields, Deal),
+            trusted=True
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return MongoJSONResponse({
         "items": deals,
         "total": total,
         "skip": skip,
-        "limit": limit
-    }
+        "limit": limit,
+        "next_cursor": next_cursor
+    })
 
 @router.get("/{deal_id}", response_model=DealResponse)
 async def get_deal(
     deal_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_current_active_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Get deal by ID"""
     service = DealService(db)
-    deal = await service.get_deal(deal_id)
 
-    if not deal:
+    try:
+        selected = parse_fields(fields, Deal)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if selected is None:
+        doc = await service.get_deal_document(deal_id)
+    else:
+        doc = await service.get_deal_fields(deal_id, selected)
+
+    if not doc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deal not found")
 
-    if str(deal.owner_id) != str(current_user.id):
+    if str(doc["owner_id"]) != str(current_user.id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
 
-    return deal
+    # Served straight from the stored document, without revalidation
+    if selected is None:
+        return MongoJSONResponse(DealResponse.document_to_response(doc))
+    return MongoJSONResponse(partial_document(doc, () if "owner_id" in selected else ("owner_id",)))
 
 @router.patch("/{deal_id}", response_model=DealResponse)
 async def update_deal(
@@ -124,3 +155,49 @@ async def move_deal_stage(
 
     deal = await service.move_deal_stage(deal_id, new_stage)
     return deal
+
+@router.post("/{deal_id}/contacts", response_model=DealResponse)
+async def attach_deal_contacts(
+    deal_id: str,
+    request: DealContactsRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Attach contacts to a deal"""
+    if not all(ObjectId.is_valid(contact_id) for contact_id in request.contact_ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid contact id")
+
+    service = DealService(db)
+    existing = await service.get_deal(deal_id)
+
+    if not existing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deal not found")
+
+    if str(existing.owner_id) != str(current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    deal = await service.attach_contacts(deal_id, request.contact_ids, str(current_user.id))
+    return deal
+
+@router.delete("/{deal_id}/contacts/{contact_id}", response_model=DealResponse)
+async def detach_deal_contact(
+    deal_id: str,
+    contact_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Detach a contact from a deal"""
+    if not ObjectId.is_valid(contact_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid contact id")
+
+    service = DealService(db)
+    existing = await service.get_deal(deal_id)
+
+    if not existing:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deal not found")
+
+    if str(existing.owner_id) != str(current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+
+    deal = await service.detach_contacts(deal_id, [contact_id])
+    return deal
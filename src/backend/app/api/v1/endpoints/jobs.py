@@ -0,0 +1,86 @@
+"""
+Jobs endpoints - Background AI and enrichment jobs
+"""
+
+from typing import Dict, Any, Literal
+from fastapi import APIRouter, Depends, HTTPException, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel, Field
+from bson import ObjectId
+
+from app.database import get_database
+from app.dependencies import get_current_active_user
+from app.models.user import User
+from app.services.job_service import JobService, JOB_TYPES
+from app.services.lead_service import LeadService
+from app.services.deal_service import DealService
+
+router = APIRouter()
+
+
+class JobCreateRequest(BaseModel):
+    type: Literal["lead_qualify", "deal_predict", "email_generate", "lead_enrich"]
+    entity_id: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    priority: Literal["interactive", "bulk"] = "interactive"
+
+
+@router.post("/", status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    request: JobCreateRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Enqueue a background job
+
+    Returns the job with its id; poll GET /jobs/{id} for the result.
+    """
+
+    if not ObjectId.is_valid(request.entity_id):
+        raise HTTPException(status_code=400, detail="Invalid entity id")
+
+    # Check the target exists and belongs to the user
+    entity_type = JOB_TYPES[request.type][0]
+    if entity_type == "lead":
+        entity = await LeadService(db).get_lead(request.entity_id)
+    else:
+        entity = await DealService(db).get_deal(request.entity_id)
+
+    if not entity:
+        raise HTTPException(status_code=404, detail=f"{entity_type.capitalize()} not found")
+
+    if str(entity.owner_id) != str(current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    service = JobService(db)
+    return await service.create_job(
+        user_id=str(current_user.id),
+        type=request.type,
+        entity_id=request.entity_id,
+        params=request.params,
+        priority=request.priority
+    )
+
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Get job status and result"""
+
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    service = JobService(db)
+    job = await service.get_job(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if job["user_id"] != str(current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    return job
@@ -8,6 +8,8 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.database import get_database
 from app.dependencies import get_current_active_user
+from app.core.projection import FIELDS_DESCRIPTION, parse_fields, partial_document
+from app.core.responses import MongoJSONResponse
 from app.models.user import User
 from app.models.lead import Lead, LeadCreate, LeadUpdate, LeadResponse
 from app.services.lead_service import LeadService
@@ -31,50 +33,78 @@ async def list_leads(
     limit: int = Query(20, ge=1, le=100),
     status: Optional[str] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides skip"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_current_active_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """List leads with pagination and filters"""
     service = LeadService(db)
-    leads, total = await service.list_leads(
-        owner_id=str(current_user.id),
-        skip=skip,
-        limit=limit,
-        status=status,
-        search=search
-    )
-
-    return {
+    try:
+        leads, total, next_cursor = await service.list_leads(
+            owner_id=str(current_user.id),
+            skip=skip,
+            limit=limit,
+            status=status,
+            search=search,
+            cursor=cursor,
+            fields=parse_fields(fields, Lead),
+            trusted=True
+        )
+    except ValueError as e:
+        # The status filter shadows fastapi.status here
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return MongoJSONResponse({
         "items": leads,
         "total": total,
         "skip": skip,
-        "limit": limit
-    }
+        "limit": limit,
+        "next_cursor": next_cursor
+    })
+
+@router.get("/search", response_model=dict)
+async def search_leads(
+    q: str = Query(..., min_length=1, max_length=200, description="Words or word prefixes of name, email or company"),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """Ranked lead typeahead"""
+    service = LeadService(db)
+    leads = await service.search_leads(str(current_user.id), q, limit)
+    return MongoJSONResponse({"items": leads, "query": q})
 
 @router.get("/{lead_id}", response_model=LeadResponse)
 async def get_lead(
     lead_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_current_active_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """Get lead by ID"""
     service = LeadService(db)
-    lead = await service.get_lead(lead_id)
 
-    if not lead:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Lead not found"
-        )
+    try:
+        selected = parse_fields(fields, Lead)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    # Check ownership
-    if str(lead.owner_id) != str(current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to access this lead"
-        )
+    if selected is None:
+        doc = await service.get_lead_document(lead_id)
+    else:
+        doc = await service.get_lead_fields(lead_id, selected)
 
-    return lead
+    if not doc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lead not found")
+
+    if str(doc["owner_id"]) != str(current_user.id):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to access this lead")
+
+    # Served straight from the stored document, without revalidation
+    if selected is None:
+        return MongoJSONResponse(LeadResponse.document_to_response(doc))
+    return MongoJSONResponse(partial_document(doc, () if "owner_id" in selected else ("owner_id",)))
 
 @router.patch("/{lead_id}", response_model=LeadResponse)
 async def update_lead(
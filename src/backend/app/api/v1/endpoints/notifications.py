@@ -2,11 +2,14 @@
 Notifications API endpoints
 """
 
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.database import get_database
 from app.dependencies import get_current_active_user
+from app.core.projection import FIELDS_DESCRIPTION, parse_fields
+from app.core.responses import MongoJSONResponse
 from app.models.user import User
 from app.models.notification import Notification
 from app.services.notification_service import NotificationService
@@ -19,29 +22,35 @@ async def list_notifications(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     unread_only: bool = False,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides skip"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     current_user: User = Depends(get_current_active_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """List user notifications"""
 
     service = NotificationService(db)
-    notifications, total = await service.list_notifications(
-        user_id=str(current_user.id),
-        unread_only=unread_only,
-        skip=skip,
-        limit=limit
-    )
-
-    return {
+    try:
+        notifications, total, next_cursor = await service.list_notifications(
+            user_id=str(current_user.id),
+            unread_only=unread_only,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            fields=parse_fields(fields, Notification),
+            trusted=True
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return MongoJSONResponse({
         "items": notifications,
         "total": total,
-        "unread_count": await db.notifications.count_documents({
-            "user_id": current_user.id,
-            "read": False
-        }),
+        "unread_count": await service.count_unread(str(current_user.id)),
         "skip": skip,
-        "limit": limit
-    }
+        "limit": limit,
+        "next_cursor": next_cursor
+    })
 
 
 @router.patch("/{notification_id}/read", response_model=Notification)
@@ -0,0 +1,51 @@
+"""
+Celery application - Background jobs for AI and enrichment work
+
+Run workers per queue so bulk work never starves interactive jobs:
+    celery -A app.celery_app worker -Q interactive --loglevel=info
+    celery -A app.celery_app worker -Q bulk --loglevel=info
+"""
+
+from celery import Celery
+from celery.schedules import crontab
+from kombu import Queue
+
+from app.core.config import settings
+
+celery_app = Celery(
+    "conductor_crm",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.tasks.ai_tasks", "app.tasks.maintenance_tasks"]
+)
+
+celery_app.conf.update(
+    task_queues=(
+        Queue(settings.CELERY_INTERACTIVE_QUEUE),
+        Queue(settings.CELERY_BULK_QUEUE),
+    ),
+    task_default_queue=settings.CELERY_INTERACTIVE_QUEUE,
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    result_expires=settings.CELERY_RESULT_EXPIRES,
+    task_track_started=True,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    timezone="UTC",
+    beat_schedule={
+        "repredict-open-deals": {
+            "task": "ai.repredict_open_deals",
+            "schedule": crontab(hour=settings.AI_REPREDICT_HOUR, minute=0),
+            "options": {"queue": settings.CELERY_BULK_QUEUE},
+        },
+        "reconcile-list-counters": {
+            "task": "maintenance.reconcile_counters",
+            "schedule": float(settings.COUNTER_RECONCILE_INTERVAL_SECONDS),
+            "options": {"queue": settings.CELERY_BULK_QUEUE},
+        },
+    },
+)
+
+# Allow `celery -A app.celery_app` to find the app
+app = celery_app
@@ -0,0 +1,115 @@
+"""
+Conductor CRM - Maintenance commands
+
+Usage:
+    python -m app.cli train-win-model [--holdout 0.2] [--l2 1.0]
+    python -m app.cli apply-indexes
+    python -m app.cli check-indexes
+    python -m app.cli reconcile-counters
+    python -m app.cli reindex-lead-search
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+from app.database import connect_to_mongo, close_mongo_connection, get_database
+from app.indexes import apply_indexes, check_query_plans
+from app.services.counter_service import CounterService
+from app.services.lead_service import LeadService
+from app.services.win_model_service import WinModelService
+
+logger = logging.getLogger(__name__)
+
+
+async def train_win_model(args: argparse.Namespace) -> int:
+    """Retrain the deal win-probability model on closed deals"""
+    try:
+        metrics = await WinModelService(await get_database()).train(holdout=args.holdout, l2=args.l2)
+    except ValueError as e:
+        print(f"Training skipped: {e}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(metrics, indent=2))
+    return 0
+
+
+async def apply_indexes_command(args: argparse.Namespace) -> int:
+    """Create every index in the registry (idempotent)"""
+    applied = await apply_indexes(await get_database())
+    print(json.dumps(applied, indent=2))
+    return 0
+
+
+async def check_indexes(args: argparse.Namespace) -> int:
+    """Explain every service query; fail on COLLSCAN or in-memory SORT"""
+    db = await get_database()
+    if args.apply:
+        await apply_indexes(db)
+
+    failures = await check_query_plans(db)
+    for failure in failures:
+        print(
+            f"{failure['collection']} {failure['filter']} sort={failure['sort']}: {', '.join(failure['stages'])}",
+            file=sys.stderr
+        )
+
+    if failures:
+        return 1
+    print("All query plans use indexes")
+    return 0
+
+
+async def reconcile_counters(args: argparse.Namespace) -> int:
+    """Recount per-owner lead, deal and notification list counters"""
+    rewritten = await CounterService(await get_database()).reconcile()
+    print(json.dumps(rewritten, indent=2))
+    return 0
+
+
+async def reindex_lead_search(args: argparse.Namespace) -> int:
+    """Recompute lead search tokens (backfill after upgrading)"""
+    updated = await LeadService(await get_database()).reindex_search_tokens()
+    print(f"Updated search tokens on {updated} leads")
+    return 0
+
+
+COMMANDS = {
+    "train-win-model": train_win_model,
+    "apply-indexes": apply_indexes_command,
+    "check-indexes": check_indexes,
+    "reconcile-counters": reconcile_counters,
+    "reindex-lead-search": reindex_lead_search,
+}
+
+
+async def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Conductor CRM maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train = subparsers.add_parser("train-win-model", help=train_win_model.__doc__)
+    train.add_argument("--holdout", type=float, default=0.2, help="Share of deals held out for metrics")
+    train.add_argument("--l2", type=float, default=1.0, help="L2 regularization strength")
+
+    subparsers.add_parser("apply-indexes", help=apply_indexes_command.__doc__)
+
+    check = subparsers.add_parser("check-indexes", help=check_indexes.__doc__)
+    check.add_argument("--apply", action="store_true", help="Apply the registry before explaining")
+
+    subparsers.add_parser("reconcile-counters", help=reconcile_counters.__doc__)
+    subparsers.add_parser("reindex-lead-search", help=reindex_lead_search.__doc__)
+
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    await connect_to_mongo()
+    try:
+        return await COMMANDS[args.command](args)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
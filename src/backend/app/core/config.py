@@ -64,14 +64,95 @@ class Settings(BaseSettings):
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/1"
+    CELERY_INTERACTIVE_QUEUE: str = "interactive"
+    CELERY_BULK_QUEUE: str = "bulk"
+    CELERY_RESULT_EXPIRES: int = 86400
 
     # AI/ML APIs
+    LLM_PROVIDER: str = "claude"  # claude, openai, fake
     CLAUDE_API_KEY: str = Field(default="")
     CLAUDE_MODEL: str = "claude-3-5-sonnet-20241022"
     CLAUDE_MAX_TOKENS: int = 4096
+    CLAUDE_MAX_CONCURRENCY: int = 8
+    CLAUDE_TIMEOUT_SECONDS: float = 60.0
+    CLAUDE_MAX_RETRIES: int = 2
+    CLAUDE_REQUESTS_PER_MINUTE: int = 50
+    CLAUDE_TOKENS_PER_MINUTE: int = 80000
+    CLAUDE_RATE_LIMIT_MAX_RETRIES: int = 6
+    CLAUDE_BACKOFF_BASE_SECONDS: float = 0.5
+    CLAUDE_INPUT_COST_PER_MTOK: float = 3.0
+    CLAUDE_OUTPUT_COST_PER_MTOK: float = 15.0
+
+    # AI result cache (seconds, 0 disables)
+    AI_CACHE_TTL_SECONDS: int = 86400
+
+    # Coalescing of concurrent identical AI requests
+    AI_SINGLEFLIGHT_LOCK_TTL_SECONDS: int = 90
+    AI_SINGLEFLIGHT_RESULT_TTL_SECONDS: int = 15
+
+    # Rule-based lead pre-scoring (skips the LLM outside these bounds)
+    LEAD_PRESCORE_ENABLED: bool = True
+    LEAD_PRESCORE_HOT_THRESHOLD: int = 85
+    LEAD_PRESCORE_COLD_THRESHOLD: int = 15
+
+    # Per-route AI request deadlines; abandoned or late requests are cancelled
+    AI_EMAIL_TIMEOUT_SECONDS: float = 60.0
+    AI_LEAD_QUALIFY_TIMEOUT_SECONDS: float = 30.0
+    AI_DEAL_PREDICT_TIMEOUT_SECONDS: float = 30.0
+    AI_DISCONNECT_POLL_SECONDS: float = 0.5
+
+    # Statistical win-probability model (trained with `python -m app.cli train-win-model`)
+    WIN_MODEL_MIN_SAMPLES: int = 50
+    WIN_MODEL_RELOAD_SECONDS: int = 300
+
+    # Deal engagement score: activity points decay with this half-life and
+    # saturate towards 100 (63 at DEAL_ENGAGEMENT_SATURATION points)
+    DEAL_ENGAGEMENT_HALF_LIFE_DAYS: float = 14.0
+    DEAL_ENGAGEMENT_SATURATION: float = 30.0
+
+    # Client-supplied activity created_at may lead the server clock by at most this much
+    ACTIVITY_MAX_CLOCK_SKEW_SECONDS: int = 300
+
+    # Nightly re-prediction of open deals whose inputs changed (Celery beat, UTC hour)
+    AI_REPREDICT_HOUR: int = 2
+    AI_REPREDICT_CONCURRENCY: int = 4
+    AI_REPREDICT_BATCH_SIZE: int = 100
+
+    # Per-owner list counters (lead status, deal stage, notification read state)
+    # are recounted from the source collections on this interval
+    COUNTER_RECONCILE_INTERVAL_SECONDS: int = 3600
+
+    # Lead typeahead: newest matching leads read from the search index before ranking
+    LEAD_SEARCH_CANDIDATES: int = 200
+
+    # Bulk AI operations
+    AI_BATCH_MAX_LEADS: int = 200
+    AI_BATCH_CONCURRENCY: int = 5
 
     OPENAI_API_KEY: str = Field(default="")
     OPENAI_MODEL: str = "gpt-4o-mini"
+    OPENAI_MAX_CONCURRENCY: int = 8
+    OPENAI_TIMEOUT_SECONDS: float = 60.0
+    OPENAI_MAX_RETRIES: int = 2
+    OPENAI_RATE_LIMIT_MAX_RETRIES: int = 6
+    OPENAI_BACKOFF_BASE_SECONDS: float = 0.5
+    OPENAI_REQUESTS_PER_MINUTE: int = 500
+    OPENAI_TOKENS_PER_MINUTE: int = 200000
+    OPENAI_INPUT_COST_PER_MTOK: float = 0.15
+    OPENAI_OUTPUT_COST_PER_MTOK: float = 0.60
+
+    # Secondary provider for hedged/failover calls (empty disables)
+    LLM_FALLBACK_PROVIDER: str = ""  # openai, claude, fake
+    # Start the secondary request if the primary has not answered by then
+    LLM_HEDGE_AFTER_SECONDS: float = 8.0
+
+    # Fake LLM (LLM_PROVIDER=fake) for load tests and benchmarks
+    FAKE_LLM_LATENCY_DISTRIBUTION: str = "lognormal"  # fixed, uniform, normal, lognormal
+    FAKE_LLM_LATENCY_MS: float = 800.0
+    FAKE_LLM_LATENCY_JITTER_MS: float = 300.0
+    FAKE_LLM_TOKENS_PER_SECOND: float = 80.0
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_LLM_SEED: int = 42
 
     # External Integrations
     CLEARBIT_API_KEY: str = Field(default="")
@@ -0,0 +1,99 @@
+"""
+Prometheus metrics and request-scoped labels
+"""
+
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import Counter, Gauge, Histogram
+
+# User on whose behalf the current request or job runs (for usage rollups)
+current_user_id: ContextVar[Optional[str]] = ContextVar("current_user_id", default=None)
+
+# Scheduling priority of LLM calls made by the current request or job
+current_priority: ContextVar[str] = ContextVar("current_priority", default="interactive")
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+
+LLM_CALLS = Counter(
+    "llm_calls_total",
+    "LLM calls by agent, provider and outcome",
+    ["agent", "provider", "outcome"]
+)
+LLM_INPUT_TOKENS = Counter(
+    "llm_input_tokens_total",
+    "Prompt tokens sent to the LLM",
+    ["agent", "provider"]
+)
+LLM_OUTPUT_TOKENS = Counter(
+    "llm_output_tokens_total",
+    "Completion tokens received from the LLM",
+    ["agent", "provider"]
+)
+LLM_COST = Counter(
+    "llm_cost_usd_total",
+    "Estimated LLM spend in USD",
+    ["agent", "provider"]
+)
+LLM_RETRIES = Counter(
+    "llm_retries_total",
+    "LLM request retries after transient errors",
+    ["agent", "provider"]
+)
+LLM_JSON_PARSE_FAILURES = Counter(
+    "llm_json_parse_failures_total",
+    "Completions that could not be parsed as JSON",
+    ["agent"]
+)
+LLM_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "LLM call wall time",
+    ["agent", "provider"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_TIME_TO_FIRST_TOKEN = Histogram(
+    "llm_time_to_first_token_seconds",
+    "Time until the first completion token arrived",
+    ["agent", "provider"],
+    buckets=LATENCY_BUCKETS
+)
+LEAD_PRESCORE_DECISIONS = Counter(
+    "lead_prescore_decisions_total",
+    "Rule-based lead pre-score outcomes (hot/cold skip the LLM)",
+    ["decision"]
+)
+AI_COALESCED_REQUESTS = Counter(
+    "ai_coalesced_requests_total",
+    "AI requests served by an identical in-flight call",
+    ["scope"]
+)
+LLM_SCHEDULER_QUEUE_DEPTH = Gauge(
+    "llm_scheduler_queue_depth",
+    "LLM calls waiting for rate-limit capacity",
+    ["provider", "priority"]
+)
+LLM_SCHEDULER_WAIT = Histogram(
+    "llm_scheduler_wait_seconds",
+    "Time LLM calls spent waiting for rate-limit capacity",
+    ["provider", "priority"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10, 30, 60, 120, 300)
+)
+LLM_THROTTLED = Counter(
+    "llm_throttled_total",
+    "Provider rate-limit responses that paused the scheduler",
+    ["provider"]
+)
+LLM_ROUTED = Counter(
+    "llm_routed_calls_total",
+    "Hedged LLM calls by serving provider and route (primary, hedge, failover)",
+    ["agent", "provider", "route"]
+)
+LLM_STRUCTURED_OUTPUT = Counter(
+    "llm_structured_output_total",
+    "Agent completion parsing outcomes (clean, extracted, repaired, failed)",
+    ["agent", "outcome"]
+)
+AI_REQUESTS_CANCELLED = Counter(
+    "ai_requests_cancelled_total",
+    "AI requests abandoned before completion",
+    ["route", "reason"]
+)
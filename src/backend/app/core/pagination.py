@@ -0,0 +1,79 @@
+"""
+Keyset pagination - Opaque cursors over (created_at, _id)
+
+A cursor encodes the sort key of the last item on a page. The next page
+continues strictly after it, so each page is a bounded index range scan
+instead of a skip over every earlier document.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from bson import ObjectId
+
+
+def encode_cursor(created_at: datetime, id: ObjectId) -> str:
+    """Opaque cursor for the item that ends a page"""
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """
+    Decode a cursor from encode_cursor()
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), ObjectId(id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_filter(cursor: Optional[str], field: str = "created_at") -> Dict[str, Any]:
+    """Query clause selecting items after the cursor in (field desc, _id desc) order"""
+    if not cursor:
+        return {}
+    created_at, id = decode_cursor(cursor)
+    # The $lte bound keeps this a single index range; the $or only filters the boundary.
+    # It sits under $and so it cannot clobber a caller's own $or.
+    return {
+        field: {"$lte": created_at},
+        "$and": [{"$or": [{field: {"$lt": created_at}}, {"_id": {"$lt": id}}]}]
+    }
+
+
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+
+
+def page_cursor(docs: List[Dict[str, Any]], limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Trim a limit + 1 fetch to one page
+
+    Returns:
+        (docs, next_cursor) where next_cursor is None on the last page
+    """
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, encode_cursor(docs[-1]["created_at"], docs[-1]["_id"])
+
+
+async def fetch_page(
+    collection,
+    query: Dict[str, Any],
+    limit: int,
+    projection: Optional[Dict[str, Any]] = None,
+    skip: int = 0
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one keyset-sorted page of a query
+
+    Returns:
+        (docs, next_cursor) as from page_cursor()
+    """
+    cursor = collection.find(query, projection).sort(KEYSET_SORT).skip(skip).limit(limit + 1)
+    return page_cursor(await cursor.to_list(limit + 1), limit)
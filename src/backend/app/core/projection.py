@@ -0,0 +1,46 @@
+"""
+Field projection - `fields=` selection for list and get endpoints
+
+Requested fields are pushed down to MongoDB as a projection and the
+returned documents are served as plain dicts through MongoJSONResponse,
+so omitted fields are never read, validated or serialized.
+"""
+
+from typing import Any, Dict, List, Optional, Type
+from pydantic import BaseModel
+
+# Always returned: identity and the keyset pagination key
+ALWAYS_INCLUDED = ("_id", "created_at")
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return (_id and created_at are always included)"
+
+
+def parse_fields(fields: Optional[str], model: Type[BaseModel]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated field list against a model
+
+    Returns:
+        Field names, or None when no selection was requested
+
+    Raises:
+        ValueError: If a field does not exist on the model
+    """
+    if not fields:
+        return None
+
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in model.model_fields and name not in ("_id", "id")]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    return [name for name in names if name not in ("_id", "id")]
+
+
+def projection(fields: List[str], *extra: str) -> Dict[str, int]:
+    """MongoDB projection for the selected fields plus ALWAYS_INCLUDED and extra"""
+    return {name: 1 for name in (*ALWAYS_INCLUDED, *fields, *extra)}
+
+
+def partial_document(doc: Dict[str, Any], drop: tuple = ()) -> Dict[str, Any]:
+    """Projected document without the internal-only keys in drop"""
+    return {key: value for key, value in doc.items() if key not in drop}
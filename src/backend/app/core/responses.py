@@ -0,0 +1,36 @@
+"""
+JSON responses - orjson serialization for MongoDB documents
+
+MongoJSONResponse renders ObjectId, datetime and Pydantic models directly
+with orjson. Endpoints that return it with documents from
+BaseDBModel.document_to_response() skip FastAPI's jsonable_encoder pass
+and response_model revalidation entirely.
+"""
+
+from typing import Any
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(by_alias=True)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes (naive datetimes keep their isoformat())"""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class MongoJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, aware of ObjectId and Pydantic models"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
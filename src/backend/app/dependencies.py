@@ -8,6 +8,7 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 
 from app.core.security import decode_token
+from app.core.metrics import current_user_id
 from app.database import get_database
 from app.models.user import User
 
@@ -43,6 +44,9 @@ async def get_current_user(
             detail="User not found"
         )
 
+    # Attribute LLM usage in this request to the caller
+    current_user_id.set(user_id)
+
     return User(**user)
 
 async def get_current_active_user(
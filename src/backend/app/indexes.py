@@ -0,0 +1,157 @@
+"""
+MongoDB index registry - Declared indexes and the query shapes they serve
+
+INDEXES is the single source of truth for every collection's indexes.
+apply_indexes() creates them idempotently (startup and
+`python -m app.cli apply-indexes`). QUERY_SHAPES lists the filter/sort
+of each service query; check_query_plans() explains every shape and
+reports any that would plan a collection scan or an in-memory sort
+(`python -m app.cli check-indexes`).
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+import logging
+
+logger = logging.getLogger(__name__)
+
+NEWEST_FIRST = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "google_tokens": [
+        IndexModel([("user_id", ASCENDING)], name="user_unique", unique=True),
+    ],
+    "user_preferences": [
+        IndexModel([("user_id", ASCENDING), ("type", ASCENDING)], name="user_type_unique", unique=True),
+    ],
+    "api_keys": [
+        IndexModel([("user_id", ASCENDING), ("active", ASCENDING)], name="user_active"),
+    ],
+    "leads": [
+        IndexModel([("owner_id", ASCENDING)] + NEWEST_FIRST, name="owner_newest"),
+        IndexModel([("owner_id", ASCENDING), ("status", ASCENDING)] + NEWEST_FIRST, name="owner_status_newest"),
+        # Multikey prefix tokens (app.services.lead_search)
+        IndexModel([("owner_id", ASCENDING), ("search_tokens", ASCENDING)] + NEWEST_FIRST, name="owner_search_newest"),
+    ],
+    "deals": [
+        IndexModel([("owner_id", ASCENDING)] + NEWEST_FIRST, name="owner_newest"),
+        IndexModel([("owner_id", ASCENDING), ("stage", ASCENDING)] + NEWEST_FIRST, name="owner_stage_newest"),
+        # Model training and nightly re-prediction select by stage across owners
+        IndexModel([("stage", ASCENDING)], name="stage"),
+    ],
+    "notifications": [
+        IndexModel([("user_id", ASCENDING)] + NEWEST_FIRST, name="user_newest"),
+        IndexModel([("user_id", ASCENDING), ("read", ASCENDING)] + NEWEST_FIRST, name="user_read_newest"),
+    ],
+    "activities": [
+        IndexModel(
+            [("entity_type", ASCENDING), ("entity_id", ASCENDING)] + NEWEST_FIRST,
+            name="entity_timeline"
+        ),
+    ],
+    "list_counters": [
+        IndexModel([("kind", ASCENDING)], name="kind"),
+    ],
+    "ai_usage_daily": [
+        IndexModel(
+            [("user_id", ASCENDING), ("date", DESCENDING), ("agent", ASCENDING)],
+            name="user_date_agent_unique",
+            unique=True
+        ),
+    ],
+}
+
+# Placeholder values; plans depend on the query shape, not the values
+_ID = ObjectId("000000000000000000000000")
+_AT = datetime(2025, 1, 1)
+_AFTER_CURSOR = {"created_at": {"$lte": _AT}, "$and": [{"$or": [{"created_at": {"$lt": _AT}}, {"_id": {"$lt": _ID}}]}]}
+
+# (collection, filter, sort) of every non-_id service query
+QUERY_SHAPES: List[Tuple[str, Dict[str, Any], Optional[List[Tuple[str, int]]]]] = [
+    ("users", {"email": "user@example.com"}, None),
+    ("google_tokens", {"user_id": _ID}, None),
+    ("user_preferences", {"user_id": _ID, "type": "notifications"}, None),
+    ("api_keys", {"user_id": _ID, "active": True}, None),
+    ("leads", {"owner_id": _ID}, NEWEST_FIRST),
+    ("leads", {"owner_id": _ID, "status": "new"}, NEWEST_FIRST),
+    ("leads", {"owner_id": _ID, **_AFTER_CURSOR}, NEWEST_FIRST),
+    ("leads", {"_id": {"$in": [_ID]}, "owner_id": _ID}, None),
+    ("leads", {"owner_id": _ID, "search_tokens": "acm"}, NEWEST_FIRST),
+    ("leads", {"owner_id": _ID, "search_tokens": {"$all": ["john", "acm"]}}, NEWEST_FIRST),
+    ("deals", {"owner_id": _ID}, NEWEST_FIRST),
+    ("deals", {"owner_id": _ID, "stage": "proposal"}, NEWEST_FIRST),
+    ("deals", {"owner_id": _ID, **_AFTER_CURSOR}, NEWEST_FIRST),
+    ("deals", {"owner_id": _ID, "stage": {"$in": ["prospecting", "proposal"]}}, None),
+    ("deals", {"stage": {"$in": ["won", "lost"]}, "stage_history.0": {"$exists": True}}, None),
+    ("notifications", {"user_id": _ID}, NEWEST_FIRST),
+    ("notifications", {"user_id": _ID, "read": False}, NEWEST_FIRST),
+    ("notifications", {"user_id": _ID, **_AFTER_CURSOR}, NEWEST_FIRST),
+    ("activities", {"entity_type": "deal", "entity_id": _ID}, NEWEST_FIRST),
+    ("activities", {"entity_type": "deal", "entity_id": _ID, **_AFTER_CURSOR}, NEWEST_FIRST),
+    ("list_counters", {"kind": "leads"}, None),
+    ("ai_usage_daily", {"user_id": _ID, "date": {"$gte": "2025-01-01"}}, [("date", DESCENDING), ("agent", ASCENDING)]),
+]
+
+BAD_STAGES = {"COLLSCAN", "SORT"}
+
+
+async def apply_indexes(db: AsyncIOMotorDatabase) -> Dict[str, List[str]]:
+    """
+    Create every registered index; existing identical indexes are no-ops
+
+    A collection whose index conflicts with an existing one (same name or
+    keys, different options) is logged and skipped so startup continues.
+
+    Returns:
+        Index names created or confirmed, per collection
+    """
+    applied = {}
+    for collection, indexes in INDEXES.items():
+        try:
+            applied[collection] = await db[collection].create_indexes(indexes)
+        except OperationFailure as e:
+            logger.error(f"Could not apply indexes on {collection}: {e}")
+    return applied
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    """All stage names in an explain() plan tree"""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+async def check_query_plans(db: AsyncIOMotorDatabase) -> List[Dict[str, Any]]:
+    """
+    Explain every registered query shape
+
+    Returns:
+        One entry per shape whose winning plan has a COLLSCAN or SORT stage
+    """
+    failures = []
+    for collection, query, sort in QUERY_SHAPES:
+        cursor = db[collection].find(query).limit(20)
+        if sort:
+            cursor = cursor.sort(sort)
+
+        explain = await cursor.explain()
+        stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+        bad = sorted(BAD_STAGES.intersection(stages))
+        if bad:
+            failures.append({"collection": collection, "filter": query, "sort": sort, "stages": bad})
+
+    return failures
@@ -4,14 +4,19 @@ Conductor CRM - Main FastAPI Application
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 
 from app.core.config import settings
-from app.database import connect_to_mongo, close_mongo_connection
+from app.core.responses import MongoJSONResponse
+from app.database import connect_to_mongo, close_mongo_connection, get_database
 from app.services.cache_service import cache_service
+from app.agents.registry import agent_registry
+from app.services.usage_service import flush_usage
+from app.indexes import apply_indexes
 from app.core.errors import (
     ConductorException,
     conductor_exception_handler,
@@ -35,6 +40,7 @@ app = FastAPI(
     docs_url="/docs" if not settings.is_production else None,
     redoc_url="/redoc" if not settings.is_production else None,
     openapi_url="/openapi.json" if not settings.is_production else None,
+    default_response_class=MongoJSONResponse,
 )
 
 # CORS middleware
@@ -52,15 +58,19 @@ async def startup_event():
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     await connect_to_mongo()
+    await apply_indexes(await get_database())
     await cache_service.connect()
+    await agent_registry.startup()
     logger.info("Application startup complete")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Execute on application shutdown"""
     logger.info("Shutting down application...")
+    await flush_usage()
     await close_mongo_connection()
     await cache_service.close()
+    await agent_registry.close()
     logger.info("Application shutdown complete")
 
 # Register exception handlers
@@ -96,6 +106,11 @@ async def simple_health():
     """Simple health check"""
     return {"status": "ok"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 # Include API routers
 from app.api.v1.api import api_router
 app.include_router(api_router, prefix="/api/v1")
@@ -2,9 +2,10 @@
 Activity model - Timeline/history of interactions
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
-from pydantic import Field
+from pydantic import Field, field_validator
+from app.core.config import settings
 from .base import BaseDBModel, PyObjectId
 
 
@@ -51,3 +52,28 @@ class Activity(BaseDBModel):
                 "call_outcome": "positive"
             }
         }
+
+
+class ActivityCreate(BaseDBModel):
+    type: str
+    description: str
+    entity_type: str
+    entity_id: PyObjectId
+    email_subject: Optional[str] = None
+    email_body: Optional[str] = None
+    email_sent_to: Optional[str] = None
+    call_duration: Optional[int] = None
+    call_outcome: Optional[str] = None
+    meeting_date: Optional[datetime] = None
+    meeting_attendees: list[str] = Field(default_factory=list)
+    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
+
+    @field_validator("created_at")
+    @classmethod
+    def not_in_future(cls, value: datetime) -> datetime:
+        """Imported history may be backdated, never dated ahead of the server clock"""
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        if value > datetime.utcnow() + timedelta(seconds=settings.ACTIVITY_MAX_CLOCK_SKEW_SECONDS):
+            raise ValueError("created_at cannot be in the future")
+        return value
@@ -3,40 +3,54 @@ Base models for MongoDB documents
 """
 
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Annotated, Any, Callable, Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field, GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
 from bson import ObjectId
 
 
-class PyObjectId(ObjectId):
-    """Custom ObjectId type for Pydantic"""
+def _object_id_from_str(value: str) -> ObjectId:
+    if not ObjectId.is_valid(value):
+        raise ValueError("Invalid ObjectId")
+    return ObjectId(value)
 
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+
+class _ObjectIdAnnotation:
+    """Pydantic core schema for bson ObjectId: accepts ObjectId or str, dumps str in JSON mode"""
 
     @classmethod
-    def validate(cls, v, _):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
-        return ObjectId(v)
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+        from_str = core_schema.chain_schema([
+            core_schema.str_schema(),
+            core_schema.no_info_plain_validator_function(_object_id_from_str),
+        ])
+        return core_schema.json_or_python_schema(
+            json_schema=from_str,
+            python_schema=core_schema.union_schema([core_schema.is_instance_schema(ObjectId), from_str]),
+            serialization=core_schema.plain_serializer_function_ser_schema(str, when_used="json"),
+        )
 
     @classmethod
-    def __get_pydantic_json_schema__(cls, field_schema):
-        field_schema.update(type="string")
+    def __get_pydantic_json_schema__(
+        cls, _core_schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> JsonSchemaValue:
+        return {"type": "string", "pattern": "^[0-9a-fA-F]{24}$", "example": "507f1f77bcf86cd799439011"}
+
+
+# ObjectId in Python (what Motor reads and writes), 24-char hex string in JSON
+PyObjectId = Annotated[ObjectId, _ObjectIdAnnotation]
 
 
 class BaseDBModel(BaseModel):
     """Base model for all MongoDB documents"""
 
-    id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
+    id: Optional[PyObjectId] = Field(default_factory=ObjectId, alias="_id")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Config:
         populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str, datetime: lambda v: v.isoformat()}
         json_schema_extra = {
             "example": {
                 "_id": "507f1f77bcf86cd799439011",
@@ -44,3 +58,29 @@ class BaseDBModel(BaseModel):
                 "updated_at": "2025-11-05T12:00:00Z",
             }
         }
+
+    @classmethod
+    def _response_fields(cls) -> List[Tuple[str, Callable[[], Any]]]:
+        """(output key, default) per field, computed once per model class"""
+        fields = cls.__dict__.get("_trusted_fields")
+        if fields is None:
+            fields = []
+            for name, field in cls.model_fields.items():
+                if field.default_factory is not None:
+                    default = field.default_factory
+                else:
+                    default = (lambda value: lambda: value)(None if field.is_required() else field.default)
+                fields.append((field.alias or name, default))
+            cls._trusted_fields = fields
+        return fields
+
+    @classmethod
+    def document_to_response(cls, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Response dict for a document read from MongoDB, without validation
+
+        Documents were validated when the services wrote them, so reads
+        only fill defaults and drop unknown keys. The result has the shape
+        of model_dump(by_alias=True) and is serialized by MongoJSONResponse.
+        """
+        return {key: doc[key] if key in doc else default() for key, default in cls._response_fields()}
@@ -36,6 +36,9 @@ class Deal(BaseDBModel):
     ai_insights: Optional[Dict[str, Any]] = Field(None, description="AI predictions")
     risk_factors: Optional[List[str]] = Field(default_factory=list)
 
+    # Stage/probability changes, used as win-model features
+    stage_history: List[Dict[str, Any]] = Field(default_factory=list)
+
     # Metadata
     tags: List[str] = Field(default_factory=list)
     custom_fields: Dict[str, Any] = Field(default_factory=dict)
@@ -0,0 +1,173 @@
+"""
+Activity service - Business logic for activities
+
+Timelines are read newest first through the entity_timeline index
+(see app.indexes) with keyset cursors, so the latest page of an entity
+with tens of thousands of activities is a short index range scan.
+Per-entity totals live in activity_counters and are maintained with
+$inc on every write instead of counting on read.
+"""
+
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Set, Tuple
+from datetime import datetime
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.core.pagination import keyset_filter, fetch_page
+from app.models.activity import Activity, ActivityCreate
+from app.services.deal_feature_service import DealFeatureService, activity_key
+
+# Entity types an activity can be attached to, and the collection holding them
+ENTITY_COLLECTIONS = {
+    "lead": "leads",
+    "deal": "deals",
+    "contact": "contacts",
+    "company": "companies",
+}
+
+
+def _counter_id(entity_type: str, entity_id: ObjectId) -> str:
+    return f"{entity_type}:{entity_id}"
+
+
+class ActivityService:
+    """Service for activity operations"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.activities
+        self.counters = db.activity_counters
+        self.deal_features = DealFeatureService(db)
+
+    async def owned_entities(self, entity_type: str, entity_ids: List[ObjectId], owner_id: str) -> Set[ObjectId]:
+        """Subset of entity_ids of one type owned by owner_id"""
+        collection = self.db[ENTITY_COLLECTIONS[entity_type]]
+        cursor = collection.find(
+            {"_id": {"$in": list(entity_ids)}, "owner_id": ObjectId(owner_id)},
+            {"_id": 1}
+        )
+        return {doc["_id"] async for doc in cursor}
+
+    async def log_activity(self, activity_data: ActivityCreate, user_id: str) -> Activity:
+        """Record an activity and fold it into the deal's predictor features"""
+        activity_dict = activity_data.model_dump(exclude={"id"})
+        activity_dict["user_id"] = ObjectId(user_id)
+        activity_dict["created_at"] = datetime.utcnow()
+        activity_dict["updated_at"] = datetime.utcnow()
+
+        result = await self.collection.insert_one(activity_dict)
+        activity_dict["_id"] = result.inserted_id
+
+        await self._update_counters([activity_dict])
+
+        if activity_dict["entity_type"] == "deal":
+            await self.deal_features.record_activity(
+                str(activity_dict["entity_id"]),
+                activity_dict["type"],
+                activity_dict["created_at"]
+            )
+
+        return Activity(**activity_dict)
+
+    async def bulk_log_activities(self, activities: List[ActivityCreate], user_id: str) -> int:
+        """
+        Ingest many activities with one insert and one counter write
+
+        Activities keep an explicitly supplied created_at so imported
+        history lands at the right place in the timeline (ActivityCreate
+        rejects timestamps ahead of the server clock).
+
+        Returns:
+            Number of activities inserted
+        """
+        if not activities:
+            return 0
+
+        now = datetime.utcnow()
+        docs = []
+        for activity in activities:
+            doc = activity.model_dump(exclude={"id"})
+            doc["user_id"] = ObjectId(user_id)
+            if "created_at" not in activity.model_fields_set:
+                doc["created_at"] = now
+            doc["updated_at"] = now
+            docs.append(doc)
+
+        result = await self.collection.insert_many(docs, ordered=False)
+        for doc, inserted_id in zip(docs, result.inserted_ids):
+            doc["_id"] = inserted_id
+
+        await self._update_counters(docs)
+
+        by_deal: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for doc in docs:
+            if doc["entity_type"] == "deal":
+                by_deal[str(doc["entity_id"])].append(doc)
+        for deal_id, deal_activities in by_deal.items():
+            await self.deal_features.record_activities(deal_id, deal_activities)
+
+        return len(result.inserted_ids)
+
+    async def _update_counters(self, docs: List[Dict[str, Any]]):
+        """Fold activities into per-entity counters, one update per entity"""
+
+        grouped: Dict[Tuple[str, ObjectId], List[Dict[str, Any]]] = defaultdict(list)
+        for doc in docs:
+            grouped[(doc["entity_type"], doc["entity_id"])].append(doc)
+
+        operations = []
+        for (entity_type, entity_id), entity_docs in grouped.items():
+            increments = {"total": len(entity_docs)}
+            for doc in entity_docs:
+                key = f"by_type.{activity_key(doc['type'])}"
+                increments[key] = increments.get(key, 0) + 1
+
+            operations.append(UpdateOne(
+                {"_id": _counter_id(entity_type, entity_id)},
+                {
+                    "$inc": increments,
+                    "$max": {"last_activity_at": max(doc["created_at"] for doc in entity_docs)},
+                    "$setOnInsert": {"entity_type": entity_type, "entity_id": entity_id}
+                },
+                upsert=True
+            ))
+
+        if operations:
+            await self.counters.bulk_write(operations, ordered=False)
+
+    async def get_counters(self, entity_type: str, entity_id: str) -> Dict[str, Any]:
+        """Activity totals for one entity (zeros if nothing was logged)"""
+        doc = await self.counters.find_one({"_id": _counter_id(entity_type, ObjectId(entity_id))}) or {}
+        return {
+            "total": doc.get("total", 0),
+            "by_type": doc.get("by_type", {}),
+            "last_activity_at": doc.get("last_activity_at")
+        }
+
+    async def get_timeline(
+        self,
+        entity_type: str,
+        entity_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> tuple[List[Activity], Optional[str]]:
+        """
+        One page of an entity's activities, newest first
+
+        Raises:
+            ValueError: If the cursor is malformed
+
+        Returns:
+            (activities, next_cursor) where next_cursor is None on the last page
+        """
+        query = {
+            "entity_type": entity_type,
+            "entity_id": ObjectId(entity_id),
+            **keyset_filter(cursor)
+        }
+
+        docs, next_cursor = await fetch_page(self.collection, query, limit)
+
+        return [Activity(**doc) for doc in docs], next_cursor
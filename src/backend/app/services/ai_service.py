@@ -0,0 +1,276 @@
+"""
+AI service - Runs agents against CRM entities and persists their results
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.agents.registry import AgentRegistry
+from app.agents.win_model import OPEN_STAGES
+from app.core.config import settings
+from app.models.lead import Lead
+from app.models.deal import Deal
+from app.services.lead_service import LeadService
+from app.services.deal_service import DealService
+from app.services.singleflight import single_flight, input_fingerprint
+from app.services.win_model_service import WinModelService
+from app.services.deal_feature_service import DealFeatureService
+
+logger = logging.getLogger(__name__)
+
+
+class AIService:
+    """Service for AI agent operations on leads and deals"""
+
+    def __init__(self, db: AsyncIOMotorDatabase, agents: AgentRegistry):
+        self.db = db
+        self.agents = agents
+        self.lead_service = LeadService(db)
+        self.deal_service = DealService(db)
+        self.win_model_service = WinModelService(db)
+        self.deal_feature_service = DealFeatureService(db)
+
+    @staticmethod
+    def email_assistant_input(lead: Lead, context: Optional[str]) -> Dict[str, Any]:
+        """Build EmailAssistantAgent input from a lead"""
+        return {
+            "lead_name": lead.name,
+            "company": lead.company or "your company",
+            "job_title": lead.job_title or "",
+            "context": context
+        }
+
+    @staticmethod
+    def lead_qualifier_input(lead: Lead, force_refresh: bool = False) -> Dict[str, Any]:
+        """Build LeadQualifierAgent input from a lead"""
+        return {
+            "name": lead.name,
+            "email": lead.email,
+            "company": lead.company,
+            "job_title": lead.job_title,
+            "source": lead.source,
+            "enrichment_data": lead.enrichment_data,
+            "force_refresh": force_refresh
+        }
+
+    @staticmethod
+    def deal_predictor_input(
+        deal: Deal,
+        features: Dict[str, Any],
+        force_refresh: bool = False,
+        baseline_win_probability: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Build DealPredictorAgent input from a deal and its deal_features"""
+        return {
+            "title": deal.title,
+            "value": deal.value,
+            "currency": deal.currency,
+            "stage": deal.stage,
+            "created_at": deal.created_at,
+            "expected_close_date": str(deal.expected_close_date) if deal.expected_close_date else "Not set",
+            "activity_count": features["activity_count"],
+            "activity_counts": features["activity_counts"],
+            "last_activity_date": features["last_activity_date"],
+            "engagement_score": features["engagement_score"],
+            "contact_count": len(deal.contact_ids),
+            "decision_makers": features["decision_makers"],
+            "baseline_win_probability": baseline_win_probability,
+            "force_refresh": force_refresh
+        }
+
+    @staticmethod
+    def prediction_fingerprint(agent_input: Dict[str, Any]) -> str:
+        """
+        Hash of the deal facts a prediction was made from
+
+        The model baseline and engagement score are left out: they drift
+        daily (deal age, engagement decay) and on every retrain, which
+        would invalidate every deal at once. New activity still changes
+        the activity counts and last activity date.
+        """
+        drifting = ("baseline_win_probability", "engagement_score")
+        return input_fingerprint({k: v for k, v in agent_input.items() if k not in drifting})
+
+    @staticmethod
+    def flight_key(agent: str, entity_id: str, agent_input: Dict[str, Any]) -> str:
+        """
+        Coalescing key: (agent, entity id, input fingerprint, forced)
+
+        Forced refreshes only coalesce with each other, never onto a
+        normal call whose result may come from cache.
+        """
+        forced = ":refresh" if agent_input.get("force_refresh") else ""
+        return f"{agent}:{entity_id}:{input_fingerprint(agent_input)}{forced}"
+
+    async def generate_email(self, lead: Lead, context: Optional[str]) -> Dict[str, Any]:
+        """Generate email variations for a lead"""
+        agent_input = self.email_assistant_input(lead, context)
+        return await single_flight.run(
+            self.flight_key("EmailAssistant", str(lead.id), agent_input),
+            lambda: self._generate_email(lead, agent_input)
+        )
+
+    async def _generate_email(self, lead: Lead, agent_input: Dict[str, Any]) -> Dict[str, Any]:
+        result = await self.agents.email_assistant.run(agent_input)
+
+        return {
+            "lead_id": str(lead.id),
+            "variations": result.get("variations", []),
+            "agent": "EmailAssistant"
+        }
+
+    async def qualify_lead(self, lead: Lead, force_refresh: bool = False, skip_prescore: bool = False) -> Dict[str, Any]:
+        """
+        Qualify a lead and store the qualification
+
+        skip_prescore is set by callers that already pre-scored the lead
+        as unclear; it does not change the coalescing key.
+        """
+        agent_input = self.lead_qualifier_input(lead, force_refresh)
+        return await single_flight.run(
+            self.flight_key("LeadQualifier", str(lead.id), agent_input),
+            lambda: self._qualify_lead(lead, {**agent_input, "skip_prescore": skip_prescore})
+        )
+
+    async def _qualify_lead(self, lead: Lead, agent_input: Dict[str, Any]) -> Dict[str, Any]:
+        result = await self.agents.lead_qualifier.run(agent_input)
+
+        await self.lead_service.qualify_lead(
+            lead_id=str(lead.id),
+            score=result["score"],
+            classification=result["classification"],
+            reasoning=result["reasoning"],
+            next_actions=result.get("next_actions", [])
+        )
+
+        return {
+            "lead_id": str(lead.id),
+            "score": result["score"],
+            "classification": result["classification"],
+            "reasoning": result["reasoning"],
+            "next_actions": result.get("next_actions", []),
+            "bant": result.get("bant", {}),
+            "prescored": result.get("prescored", False),
+            "agent": "LeadQualifier"
+        }
+
+    async def predict_deal(self, deal: Deal, force_refresh: bool = False) -> Dict[str, Any]:
+        """Predict a deal outcome and store the AI insights"""
+        features = await self.deal_feature_service.get_features(str(deal.id))
+        baseline = await self.win_model_service.baseline(deal.model_dump())
+        agent_input = self.deal_predictor_input(deal, features, force_refresh, baseline)
+        return await single_flight.run(
+            self.flight_key("DealPredictor", str(deal.id), agent_input),
+            lambda: self._predict_deal(deal, agent_input)
+        )
+
+    def _deal_insights(self, deal: Deal, agent_input: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """save_ai_insights arguments for a DealPredictor result"""
+        return {
+            "deal_id": str(deal.id),
+            "ai_insights": {
+                "win_probability": result["win_probability"],
+                "health_score": result["health_score"],
+                "predicted_close_date": result.get("predicted_close_date"),
+                "risk_factors": result.get("risk_factors", []),
+                "recommended_actions": result.get("recommended_actions", []),
+                "baseline_win_probability": agent_input.get("baseline_win_probability"),
+                "input_fingerprint": self.prediction_fingerprint(agent_input),
+                "last_analysis": str(deal.updated_at)
+            },
+            "ai_score": result["health_score"],
+            "risk_factors": result.get("risk_factors", [])
+        }
+
+    async def _predict_deal(self, deal: Deal, agent_input: Dict[str, Any]) -> Dict[str, Any]:
+        result = await self.agents.deal_predictor.run(agent_input)
+
+        await self.deal_service.save_ai_insights(**self._deal_insights(deal, agent_input, result))
+
+        return {
+            "deal_id": str(deal.id),
+            "win_probability": result["win_probability"],
+            "health_score": result["health_score"],
+            "predicted_close_date": result.get("predicted_close_date"),
+            "risk_factors": result.get("risk_factors", []),
+            "recommended_actions": result.get("recommended_actions", []),
+            "reasoning": result.get("reasoning", ""),
+            "baseline_win_probability": agent_input.get("baseline_win_probability"),
+            "agent": "DealPredictor"
+        }
+
+    async def repredict_open_deals(
+        self,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Re-run DealPredictor on open deals whose inputs changed
+
+        Each open deal's input fingerprint is compared with the one stored
+        in ai_insights by its last analysis; only changed or never-analysed
+        deals reach the LLM. Results are written with one bulk_write per
+        batch.
+
+        Returns:
+            Counts of scanned, unchanged, predicted, failed and updated deals
+        """
+        concurrency = concurrency or settings.AI_REPREDICT_CONCURRENCY
+        batch_size = batch_size or settings.AI_REPREDICT_BATCH_SIZE
+        stats = {"scanned": 0, "unchanged": 0, "predicted": 0, "failed": 0, "updated": 0}
+
+        # Fingerprinting is cheap; collect the changed deals before spending on the LLM
+        changed: List[Tuple[Deal, Dict[str, Any]]] = []
+        cursor = self.deal_service.collection.find({"stage": {"$in": list(OPEN_STAGES)}})
+
+        async def collect(deals: List[Deal]):
+            features = await self.deal_feature_service.get_features_many([str(deal.id) for deal in deals])
+            for deal in deals:
+                agent_input = self.deal_predictor_input(deal, features[str(deal.id)])
+                stored = (deal.ai_insights or {}).get("input_fingerprint")
+
+                if stored == self.prediction_fingerprint(agent_input):
+                    stats["unchanged"] += 1
+                else:
+                    changed.append((deal, agent_input))
+
+        page: List[Deal] = []
+        async for doc in cursor:
+            stats["scanned"] += 1
+            page.append(Deal(**doc))
+            if len(page) >= batch_size:
+                await collect(page)
+                page = []
+        await collect(page)
+
+        model = await self.win_model_service.get_model()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def predict(deal: Deal, agent_input: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    result = await self.agents.deal_predictor.run(agent_input)
+                    return self._deal_insights(deal, agent_input, result)
+                except Exception as e:
+                    logger.error(f"Re-prediction failed for deal {deal.id}: {e}")
+                    return None
+
+        for start in range(0, len(changed), batch_size):
+            batch = changed[start:start + batch_size]
+
+            if model is not None:
+                baselines = model.predict([deal.model_dump() for deal, _ in batch])
+                for (_, agent_input), baseline in zip(batch, baselines.tolist()):
+                    agent_input["baseline_win_probability"] = int(round(baseline * 100))
+
+            results = await asyncio.gather(*(predict(deal, agent_input) for deal, agent_input in batch))
+            predictions = [result for result in results if result is not None]
+
+            stats["predicted"] += len(predictions)
+            stats["failed"] += len(batch) - len(predictions)
+            stats["updated"] += await self.deal_service.bulk_save_ai_insights(predictions)
+
+        logger.info(f"Open deal re-prediction: {stats}")
+        return stats
@@ -4,6 +4,7 @@ Cache service - Redis caching for performance optimization
 
 import redis.asyncio as aioredis
 import json
+import secrets
 from typing import Any, Optional, Callable
 from functools import wraps
 import hashlib
@@ -91,6 +92,48 @@ class CacheService:
             logger.error(f"Cache clear error: {e}")
             return 0
 
+    async def exists(self, key: str) -> bool:
+        """Check whether key exists"""
+        if not self.redis:
+            return False
+
+        try:
+            return bool(await self.redis.exists(key))
+        except Exception as e:
+            logger.error(f"Cache exists error: {e}")
+            return False
+
+    async def acquire_lock(self, key: str, ttl: int) -> Optional[str]:
+        """Acquire a lock (SET NX with TTL); returns the owner token or None"""
+        if not self.redis:
+            return None
+
+        token = secrets.token_hex(16)
+        try:
+            if await self.redis.set(key, token, nx=True, ex=ttl):
+                return token
+            return None
+        except Exception as e:
+            logger.error(f"Cache lock error: {e}")
+            return None
+
+    async def release_lock(self, key: str, token: str) -> bool:
+        """Release a lock only if this token still owns it"""
+        if not self.redis:
+            return False
+
+        script = """
+        if redis.call('get', KEYS[1]) == ARGV[1] then
+            return redis.call('del', KEYS[1])
+        end
+        return 0
+        """
+        try:
+            return bool(await self.redis.eval(script, 1, key, token))
+        except Exception as e:
+            logger.error(f"Cache unlock error: {e}")
+            return False
+
     def cache_key(self, prefix: str, *args, **kwargs) -> str:
         """Generate cache key from arguments"""
         key_data = f"{prefix}:{args}:{sorted(kwargs.items())}"
@@ -0,0 +1,212 @@
+"""
+Counter service - Per-owner list totals maintained on write
+
+One list_counters document per (collection, owner) holds the owner's
+total and a breakdown by the list filter field (lead status, deal stage,
+notification read state). Service write paths apply $inc deltas, so list
+endpoints read totals with one _id lookup instead of count_documents.
+reconcile() recounts from the source collections to repair any drift.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne, UpdateOne
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Counted collection -> (owner field, breakdown field)
+COUNTED_FIELDS = {
+    "leads": ("owner_id", "status"),
+    "deals": ("owner_id", "stage"),
+    "notifications": ("user_id", "read"),
+}
+
+# (owner_id, value before, value after); _MISSING before = created, _MISSING after = deleted
+CounterChange = Tuple[Any, Any, Any]
+
+_MISSING = object()
+
+
+def _value_key(value: Any) -> str:
+    """Breakdown value usable as a field name"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value).replace(".", "_").replace("$", "_")
+
+
+def _counter_id(kind: str, owner_id: Any) -> str:
+    return f"{kind}:{owner_id}"
+
+
+class CounterService:
+    """Service for the list_counters collection"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.list_counters
+
+    def _increments(self, changes: List[CounterChange]) -> Dict[Any, Dict[str, int]]:
+        """Net $inc per owner for a batch of changes"""
+        increments: Dict[Any, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+        for owner_id, before, after in changes:
+            if before is _MISSING and after is _MISSING:
+                continue
+            if before is not _MISSING and after is not _MISSING and before == after:
+                continue
+
+            owner = increments[owner_id]
+            if before is _MISSING:
+                owner["total"] += 1
+            else:
+                owner[f"by.{_value_key(before)}"] -= 1
+            if after is _MISSING:
+                owner["total"] -= 1
+            else:
+                owner[f"by.{_value_key(after)}"] += 1
+
+        return increments
+
+    async def record_many(self, kind: str, changes: List[CounterChange]):
+        """Apply a batch of changes with one bulk write"""
+        operations = [
+            UpdateOne({"_id": _counter_id(kind, owner_id)}, self._inc_update(kind, owner_id, fields), upsert=True)
+            for owner_id, fields in self._increments(changes).items()
+            if any(fields.values())
+        ]
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+    @staticmethod
+    def _inc_update(kind: str, owner_id: Any, fields: Dict[str, int]) -> Dict[str, Any]:
+        return {
+            "$inc": {field: delta for field, delta in fields.items() if delta},
+            "$set": {"updated_at": datetime.utcnow()},
+            "$setOnInsert": {"kind": kind, "owner_id": owner_id}
+        }
+
+    async def created(self, kind: str, doc: Dict[str, Any]):
+        """Count a newly inserted document"""
+        owner_field, value_field = COUNTED_FIELDS[kind]
+        await self.record_many(kind, [(doc[owner_field], _MISSING, doc.get(value_field))])
+
+    async def deleted(self, kind: str, doc: Dict[str, Any]):
+        """Uncount a deleted document"""
+        owner_field, value_field = COUNTED_FIELDS[kind]
+        await self.record_many(kind, [(doc[owner_field], doc.get(value_field), _MISSING)])
+
+    async def changed(self, kind: str, owner_id: Any, before: Any, after: Any, count: int = 1):
+        """Move count documents of one owner between breakdown values"""
+        if before == after or not count:
+            return
+        await self.collection.update_one(
+            {"_id": _counter_id(kind, owner_id)},
+            self._inc_update(kind, owner_id, {
+                f"by.{_value_key(before)}": -count,
+                f"by.{_value_key(after)}": count
+            }),
+            upsert=True
+        )
+
+    async def get(self, kind: str, owner_id: str) -> Dict[str, Any]:
+        """
+        Counters of one owner: {"total": int, "by": {value: int}}
+
+        Owners never reconciled are recounted first, so counters started
+        by $inc alone on pre-existing data are never served.
+        """
+        doc = await self.collection.find_one({"_id": _counter_id(kind, ObjectId(owner_id))})
+        if not doc or "reconciled_at" not in doc:
+            doc = await self.reconcile_owner(kind, owner_id)
+        return {"total": doc.get("total", 0), "by": doc.get("by", {})}
+
+    async def count(self, kind: str, owner_id: str, value: Any = _MISSING) -> int:
+        """Total of an owner, or the count for one breakdown value"""
+        counters = await self.get(kind, owner_id)
+        if value is _MISSING:
+            return counters["total"]
+        return counters["by"].get(_value_key(value), 0)
+
+    async def _recount(self, kind: str, match: Dict[str, Any]) -> Dict[Any, Dict[str, Any]]:
+        owner_field, value_field = COUNTED_FIELDS[kind]
+        pipeline = [
+            {"$match": match},
+            {"$group": {"_id": {"owner": f"${owner_field}", "value": f"${value_field}"}, "count": {"$sum": 1}}}
+        ]
+
+        counts: Dict[Any, Dict[str, Any]] = defaultdict(lambda: {"total": 0, "by": {}})
+        async for row in self.db[kind].aggregate(pipeline):
+            owner = counts[row["_id"]["owner"]]
+            owner["total"] += row["count"]
+            owner["by"][_value_key(row["_id"].get("value"))] = row["count"]
+        return counts
+
+    def _counter_doc(self, kind: str, owner_id: Any, counts: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        return {
+            "_id": _counter_id(kind, owner_id),
+            "kind": kind,
+            "owner_id": owner_id,
+            "total": counts["total"],
+            "by": counts["by"],
+            "reconciled_at": now,
+            "updated_at": now
+        }
+
+    async def reconcile_owner(self, kind: str, owner_id: str) -> Dict[str, Any]:
+        """Recount one owner's documents and store the result"""
+        owner_field, _ = COUNTED_FIELDS[kind]
+        owner = ObjectId(owner_id)
+
+        counts = await self._recount(kind, {owner_field: owner})
+        doc = self._counter_doc(kind, owner, counts.get(owner, {"total": 0, "by": {}}), datetime.utcnow())
+        await self.collection.replace_one({"_id": doc["_id"]}, doc, upsert=True)
+        return doc
+
+    async def reconcile(self, kinds: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Recount every owner of each kind and replace drifted counters
+
+        Writes racing the recount can leave a small error that the next
+        run corrects.
+
+        Returns:
+            Number of counter documents rewritten per kind
+        """
+        now = datetime.utcnow()
+        rewritten = {}
+
+        for kind in kinds or list(COUNTED_FIELDS):
+            counts = await self._recount(kind, {})
+            stored = {
+                doc["owner_id"]: doc
+                async for doc in self.collection.find(
+                    {"kind": kind},
+                    {"owner_id": 1, "total": 1, "by": 1, "reconciled_at": 1}
+                )
+            }
+
+            operations = []
+            # Owners left without documents recount to zero
+            for owner_id in set(counts) | set(stored):
+                owner_counts = counts.get(owner_id, {"total": 0, "by": {}})
+                current = stored.get(owner_id)
+                if (
+                    current
+                    and "reconciled_at" in current
+                    and current.get("total") == owner_counts["total"]
+                    and {k: v for k, v in current.get("by", {}).items() if v} == owner_counts["by"]
+                ):
+                    continue
+                doc = self._counter_doc(kind, owner_id, owner_counts, now)
+                operations.append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True))
+
+            if operations:
+                await self.collection.bulk_write(operations, ordered=False)
+                logger.info(f"Reconciled {len(operations)} {kind} counters")
+            rewritten[kind] = len(operations)
+
+        return rewritten
@@ -0,0 +1,182 @@
+"""
+Deal feature service - Incrementally maintained predictor features per deal
+
+One deal_features document per deal (keyed by the deal id) is updated
+as activities are logged and contacts are attached or detached, so
+predictions read activity counts, recency, engagement and decision
+makers in a single indexed lookup instead of scanning activities and
+contacts.
+"""
+
+import math
+import re
+from collections import defaultdict
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.agents.lead_prescorer import SENIORITY_PATTERNS
+from app.core.config import settings
+
+# Engagement points per activity type; unknown types count as 1
+ENGAGEMENT_WEIGHTS = {
+    "meeting": 10,
+    "call": 6,
+    "email": 4,
+    "task": 2,
+    "note": 1,
+}
+
+DECISION_MAKER_LEVELS = {"c_level", "vp", "director"}
+
+# Engagement points are stored valued at engagement_at (the latest activity
+# time folded in) and decayed from there, so no decay exponent is positive:
+# points(t) = engagement_points * 2^(-(t - engagement_at) / half-life).
+
+ACTIVITY_TYPE_PATTERN = re.compile(r"[^a-z0-9_]")
+
+
+def activity_key(activity_type: str) -> str:
+    """Activity type usable as a field name"""
+    return ACTIVITY_TYPE_PATTERN.sub("_", (activity_type or "other").lower()) or "other"
+
+
+def _half_life_seconds() -> float:
+    return settings.DEAL_ENGAGEMENT_HALF_LIFE_DAYS * 86400
+
+
+def _decay(elapsed_seconds: float) -> float:
+    """Share of engagement left after elapsed_seconds (underflows to 0, never overflows)"""
+    return 2 ** (-max(0.0, elapsed_seconds) / _half_life_seconds())
+
+
+def is_decision_maker(job_title: Optional[str]) -> bool:
+    """C-level, VP and director titles count as decision makers"""
+    if not job_title:
+        return False
+    title = job_title.lower()
+    for level, pattern in SENIORITY_PATTERNS:
+        if pattern.search(title):
+            return level in DECISION_MAKER_LEVELS
+    return False
+
+
+class DealFeatureService:
+    """Service for the deal_features collection"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.deal_features
+
+    async def record_activity(self, deal_id: str, activity_type: str, at: Optional[datetime] = None):
+        """Fold one logged activity into the deal's features"""
+        await self.record_activities(deal_id, [{"type": activity_type, "created_at": at or datetime.utcnow()}])
+
+    async def record_activities(self, deal_id: str, activities: List[Dict[str, Any]]):
+        """Fold many activities ({"type", "created_at"}) into one update"""
+        if not activities:
+            return
+
+        counts: Dict[str, int] = defaultdict(int)
+        stamped = []
+        for activity in activities:
+            counts[activity_key(activity["type"])] += 1
+            stamped.append((activity.get("created_at") or datetime.utcnow(), activity["type"]))
+
+        # The batch's points, valued at its latest activity
+        latest = max(at for at, _ in stamped)
+        points = sum(
+            ENGAGEMENT_WEIGHTS.get(activity_type, 1) * _decay((latest - at).total_seconds())
+            for at, activity_type in stamped
+        )
+
+        # Both sides are decayed to the later of the stored and the batch time;
+        # $max ignores a missing engagement_at (no activity recorded yet)
+        merged_at = {"$max": ["$engagement_at", latest]}
+        half_life_ms = _half_life_seconds() * 1000
+
+        def decayed(value: Any, valued_at: Any) -> Dict[str, Any]:
+            exponent = {"$divide": [{"$subtract": [valued_at, merged_at]}, half_life_ms]}
+            return {"$multiply": [value, {"$pow": [2, exponent]}]}
+
+        await self.collection.update_one(
+            {"_id": ObjectId(deal_id)},
+            [{
+                "$set": {
+                    "activity_count": {"$add": [{"$ifNull": ["$activity_count", 0]}, len(activities)]},
+                    **{
+                        f"activity_counts.{key}": {"$add": [{"$ifNull": [f"$activity_counts.{key}", 0]}, count]}
+                        for key, count in counts.items()
+                    },
+                    "engagement_points": {"$add": [
+                        # Null without stored points, which then count as zero
+                        {"$ifNull": [decayed("$engagement_points", "$engagement_at"), 0]},
+                        decayed(points, latest)
+                    ]},
+                    "engagement_at": merged_at,
+                    "last_activity_at": {"$max": ["$last_activity_at", latest]},
+                    "updated_at": datetime.utcnow()
+                }
+            }],
+            upsert=True
+        )
+
+    async def record_contacts(self, deal_id: str, contacts: List[Dict[str, Any]]):
+        """Track which newly attached contacts are decision makers"""
+
+        decision_makers = [c["_id"] for c in contacts if is_decision_maker(c.get("job_title"))]
+        if not decision_makers:
+            return
+
+        await self.collection.update_one(
+            {"_id": ObjectId(deal_id)},
+            {
+                "$addToSet": {"decision_maker_ids": {"$each": decision_makers}},
+                "$set": {"updated_at": datetime.utcnow()}
+            },
+            upsert=True
+        )
+
+    async def forget_contacts(self, deal_id: str, contact_ids: List[ObjectId]):
+        """Stop counting detached contacts as decision makers"""
+        await self.collection.update_one(
+            {"_id": ObjectId(deal_id)},
+            {
+                "$pull": {"decision_maker_ids": {"$in": contact_ids}},
+                "$set": {"updated_at": datetime.utcnow()}
+            }
+        )
+
+    @staticmethod
+    def engagement_score(doc: Dict[str, Any], now: Optional[datetime] = None) -> int:
+        """0-100 engagement from decayed activity points (saturating)"""
+        valued_at = doc.get("engagement_at")
+        if valued_at is None:
+            return 0
+        elapsed = ((now or datetime.utcnow()) - valued_at).total_seconds()
+        points = doc.get("engagement_points", 0.0) * _decay(elapsed)
+        return int(round(100 * (1 - math.exp(-points / settings.DEAL_ENGAGEMENT_SATURATION))))
+
+    def _to_features(self, doc: Optional[Dict[str, Any]], now: datetime) -> Dict[str, Any]:
+        doc = doc or {}
+        last_activity_at = doc.get("last_activity_at")
+        return {
+            "activity_count": doc.get("activity_count", 0),
+            "activity_counts": doc.get("activity_counts", {}),
+            "last_activity_date": last_activity_at.strftime("%Y-%m-%d") if last_activity_at else "Never",
+            "engagement_score": self.engagement_score(doc, now),
+            "decision_makers": len(doc.get("decision_maker_ids", []))
+        }
+
+    async def get_features(self, deal_id: str) -> Dict[str, Any]:
+        """Predictor features for one deal (zeros if nothing was recorded)"""
+        doc = await self.collection.find_one({"_id": ObjectId(deal_id)})
+        return self._to_features(doc, datetime.utcnow())
+
+    async def get_features_many(self, deal_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Predictor features for many deals in one query"""
+        now = datetime.utcnow()
+        cursor = self.collection.find({"_id": {"$in": [ObjectId(i) for i in deal_ids]}})
+        docs = {str(doc["_id"]): doc async for doc in cursor}
+        return {deal_id: self._to_features(docs.get(deal_id), now) for deal_id in deal_ids}
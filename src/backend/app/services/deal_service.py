@@ -2,12 +2,17 @@
 Deal service - Business logic for deals
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.core.pagination import keyset_filter, fetch_page
+from app.core.projection import projection
 from app.models.deal import Deal, DealCreate, DealUpdate
+from app.services.counter_service import CounterService
+from app.services.deal_feature_service import DealFeatureService
 
 
 class DealService:
@@ -16,6 +21,7 @@ class DealService:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.collection = db.deals
+        self.counters = CounterService(db)
 
     async def create_deal(self, deal_data: DealCreate, owner_id: str) -> Deal:
         """Create a new deal"""
@@ -23,35 +29,78 @@ class DealService:
         deal_dict["owner_id"] = ObjectId(owner_id)
         deal_dict["created_at"] = datetime.utcnow()
         deal_dict["updated_at"] = datetime.utcnow()
+        deal_dict["stage_history"] = [self._history_entry(deal_dict.get("stage"), deal_dict.get("probability"))]
 
         result = await self.collection.insert_one(deal_dict)
         deal_dict["_id"] = result.inserted_id
+        await self.counters.created("deals", deal_dict)
 
         return Deal(**deal_dict)
 
+    @staticmethod
+    def _history_entry(stage: Optional[str] = None, probability: Optional[int] = None) -> dict:
+        return {"stage": stage, "probability": probability, "at": datetime.utcnow()}
+
     async def get_deal(self, deal_id: str) -> Optional[Deal]:
         """Get deal by ID"""
         deal = await self.collection.find_one({"_id": ObjectId(deal_id)})
         return Deal(**deal) if deal else None
 
+    async def get_deal_document(self, deal_id: str) -> Optional[Dict[str, Any]]:
+        """Get a deal as a raw document"""
+        return await self.collection.find_one({"_id": ObjectId(deal_id)})
+
+    async def get_deal_fields(self, deal_id: str, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Get selected fields of a deal as a raw document (owner_id always included)"""
+        return await self.collection.find_one({"_id": ObjectId(deal_id)}, projection(fields, "owner_id"))
+
     async def list_deals(
         self,
         owner_id: str,
         skip: int = 0,
         limit: int = 20,
-        stage: Optional[str] = None
-    ) -> tuple[List[Deal], int]:
-        """List deals with filters"""
+        stage: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        trusted: bool = False
+    ) -> tuple[List[Union[Deal, Dict[str, Any]]], int, Optional[str]]:
+        """
+        List deals with filters
+
+        A cursor from a previous page takes precedence over skip.
+
+        With fields, only those fields are read and rows are returned as
+        plain dicts instead of models. With trusted, full rows are returned
+        as response dicts built without validation.
+
+        Raises:
+            ValueError: If the cursor is malformed
+
+        Returns:
+            (deals, total, next_cursor) where next_cursor is None on the last page
+        """
         query = {"owner_id": ObjectId(owner_id)}
 
         if stage:
             query["stage"] = stage
 
-        total = await self.collection.count_documents(query)
-        cursor = self.collection.find(query).sort("created_at", -1).skip(skip).limit(limit)
-        deals = [Deal(**doc) async for doc in cursor]
+        if stage:
+            total = await self.counters.count("deals", owner_id, stage)
+        else:
+            total = await self.counters.count("deals", owner_id)
+
+        if cursor:
+            query.update(keyset_filter(cursor))
+            skip = 0
 
-        return deals, total
+        find_projection = projection(fields) if fields else None
+        docs, next_cursor = await fetch_page(self.collection, query, limit, find_projection, skip)
+
+        if fields:
+            return docs, total, next_cursor
+        if trusted:
+            return [Deal.document_to_response(doc) for doc in docs], total, next_cursor
+        return [Deal(**doc) for doc in docs], total, next_cursor
 
     async def update_deal(self, deal_id: str, deal_update: DealUpdate) -> Optional[Deal]:
         """Update deal"""
@@ -61,19 +110,52 @@ class DealService:
             return await self.get_deal(deal_id)
 
         update_data["updated_at"] = datetime.utcnow()
+        update = {"$set": update_data}
 
-        result = await self.collection.find_one_and_update(
+        if "stage" in update_data or "probability" in update_data:
+            update["$push"] = {
+                "stage_history": self._history_entry(update_data.get("stage"), update_data.get("probability"))
+            }
+
+        if "stage" in update_data:
+            result = await self._update_stage_tracked(deal_id, update)
+        else:
+            result = await self.collection.find_one_and_update(
+                {"_id": ObjectId(deal_id)},
+                update,
+                return_document=True
+            )
+
+        return Deal(**result) if result else None
+
+    async def _update_stage_tracked(self, deal_id: str, update: dict) -> Optional[dict]:
+        """Update that sets stage, keeping the stage counters in step"""
+        before = await self.collection.find_one_and_update(
             {"_id": ObjectId(deal_id)},
-            {"$set": update_data},
-            return_document=True
+            update,
+            return_document=ReturnDocument.BEFORE
         )
+        if not before:
+            return None
 
-        return Deal(**result) if result else None
+        after = {**before, **update["$set"]}
+        for field, entry in update.get("$push", {}).items():
+            after[field] = before.get(field, []) + [entry]
+
+        await self.counters.changed("deals", before["owner_id"], before.get("stage"), after["stage"])
+        return after
 
     async def delete_deal(self, deal_id: str) -> bool:
         """Delete deal"""
-        result = await self.collection.delete_one({"_id": ObjectId(deal_id)})
-        return result.deleted_count > 0
+        deleted = await self.collection.find_one_and_delete(
+            {"_id": ObjectId(deal_id)},
+            projection={"owner_id": 1, "stage": 1}
+        )
+        if not deleted:
+            return False
+
+        await self.counters.deleted("deals", deleted)
+        return True
 
     async def move_deal_stage(self, deal_id: str, new_stage: str) -> Optional[Deal]:
         """Move deal to new stage"""
@@ -85,10 +167,100 @@ class DealService:
         if new_stage in ["won", "lost"]:
             update_data["actual_close_date"] = datetime.utcnow()
 
+        result = await self._update_stage_tracked(deal_id, {
+            "$set": update_data,
+            "$push": {"stage_history": self._history_entry(new_stage)}
+        })
+
+        return Deal(**result) if result else None
+
+    @staticmethod
+    def _ai_insights_update(ai_insights: dict, ai_score: int, risk_factors: List[str]) -> dict:
+        return {
+            "ai_insights": ai_insights,
+            "ai_score": ai_score,
+            "risk_factors": risk_factors,
+            "updated_at": datetime.utcnow()
+        }
+
+    async def attach_contacts(self, deal_id: str, contact_ids: List[str], owner_id: str) -> Optional[Deal]:
+        """Attach the owner's contacts to a deal and update its features"""
+        contacts = [
+            doc async for doc in self.db.contacts.find(
+                {
+                    "_id": {"$in": [ObjectId(c) for c in contact_ids]},
+                    "owner_id": ObjectId(owner_id)
+                },
+                {"job_title": 1}
+            )
+        ]
+
         result = await self.collection.find_one_and_update(
             {"_id": ObjectId(deal_id)},
-            {"$set": update_data},
+            {
+                "$addToSet": {"contact_ids": {"$each": [c["_id"] for c in contacts]}},
+                "$set": {"updated_at": datetime.utcnow()}
+            },
             return_document=True
         )
 
+        if result:
+            await DealFeatureService(self.db).record_contacts(deal_id, contacts)
+
         return Deal(**result) if result else None
+
+    async def detach_contacts(self, deal_id: str, contact_ids: List[str]) -> Optional[Deal]:
+        """Detach contacts from a deal and update its features"""
+        detached = [ObjectId(c) for c in contact_ids]
+
+        result = await self.collection.find_one_and_update(
+            {"_id": ObjectId(deal_id)},
+            {
+                "$pull": {"contact_ids": {"$in": detached}},
+                "$set": {"updated_at": datetime.utcnow()}
+            },
+            return_document=True
+        )
+
+        if result:
+            await DealFeatureService(self.db).forget_contacts(deal_id, detached)
+
+        return Deal(**result) if result else None
+
+    async def save_ai_insights(
+        self,
+        deal_id: str,
+        ai_insights: dict,
+        ai_score: int,
+        risk_factors: List[str]
+    ) -> bool:
+        """Store AI prediction results on a deal"""
+        result = await self.collection.update_one(
+            {"_id": ObjectId(deal_id)},
+            {"$set": self._ai_insights_update(ai_insights, ai_score, risk_factors)}
+        )
+        return result.matched_count > 0
+
+    async def bulk_save_ai_insights(self, predictions: List[dict]) -> int:
+        """
+        Write many prediction results in one round trip
+
+        Args:
+            predictions: Dicts with the save_ai_insights keyword arguments
+
+        Returns:
+            Number of deals modified
+        """
+        if not predictions:
+            return 0
+
+        operations = [
+            UpdateOne(
+                {"_id": ObjectId(p["deal_id"])},
+                {"$set": self._ai_insights_update(p["ai_insights"], p["ai_score"], p["risk_factors"])}
+            )
+            for p in predictions
+        ]
+
+        result = await self.collection.bulk_write(operations, ordered=False)
+        return result.modified_count
@@ -0,0 +1,129 @@
+"""
+Job service - Enqueue background jobs and report their status
+"""
+
+import asyncio
+from typing import Dict, Any, Optional
+from datetime import datetime
+from bson import ObjectId
+from celery.result import AsyncResult
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.celery_app import celery_app
+from app.core.config import settings
+from app.tasks.ai_tasks import (
+    qualify_lead_task,
+    predict_deal_task,
+    generate_email_task,
+    enrich_lead_task
+)
+
+# Job type -> (entity type, task, accepted params)
+JOB_TYPES = {
+    "lead_qualify": ("lead", qualify_lead_task, ("force_refresh",)),
+    "deal_predict": ("deal", predict_deal_task, ("force_refresh",)),
+    "email_generate": ("lead", generate_email_task, ("context",)),
+    "lead_enrich": ("lead", enrich_lead_task, ()),
+}
+
+# Celery state -> public job status
+JOB_STATUS = {
+    "PENDING": "queued",
+    "RECEIVED": "queued",
+    "STARTED": "running",
+    "RETRY": "retrying",
+    "SUCCESS": "succeeded",
+    "FAILURE": "failed",
+    "REVOKED": "cancelled",
+}
+
+PRIORITY_QUEUES = {
+    "interactive": settings.CELERY_INTERACTIVE_QUEUE,
+    "bulk": settings.CELERY_BULK_QUEUE,
+}
+
+
+class JobService:
+    """Service for background job operations"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.jobs
+
+    async def create_job(
+        self,
+        user_id: str,
+        type: str,
+        entity_id: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: str = "interactive"
+    ) -> Dict[str, Any]:
+        """Record a job and enqueue its task on the priority queue"""
+
+        entity_type, task, accepted = JOB_TYPES[type]
+        kwargs = {k: v for k, v in (params or {}).items() if k in accepted}
+        job_id = ObjectId()
+        queue = PRIORITY_QUEUES[priority]
+
+        job_doc = {
+            "_id": job_id,
+            "user_id": ObjectId(user_id),
+            "type": type,
+            "entity_type": entity_type,
+            "entity_id": ObjectId(entity_id),
+            "params": kwargs,
+            "priority": priority,
+            "queue": queue,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+
+        await self.collection.insert_one(job_doc)
+
+        # Broker publish is blocking I/O
+        try:
+            await asyncio.to_thread(
+                task.apply_async,
+                kwargs={f"{entity_type}_id": entity_id, "user_id": user_id, "priority": priority, **kwargs},
+                task_id=str(job_id),
+                queue=queue
+            )
+        except Exception:
+            # Unpublished jobs would report "queued" forever
+            await self.collection.delete_one({"_id": job_id})
+            raise
+
+        return self._serialize(job_doc, status="queued")
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get job with current status and result"""
+
+        job_doc = await self.collection.find_one({"_id": ObjectId(job_id)})
+        if not job_doc:
+            return None
+
+        result = AsyncResult(job_id, app=celery_app)
+        state = await asyncio.to_thread(lambda: result.state)
+        status = JOB_STATUS.get(state, state.lower())
+
+        job = self._serialize(job_doc, status=status)
+
+        if state == "SUCCESS":
+            job["result"] = await asyncio.to_thread(lambda: result.result)
+        elif state == "FAILURE":
+            job["error"] = str(await asyncio.to_thread(lambda: result.result))
+
+        return job
+
+    def _serialize(self, job_doc: Dict[str, Any], status: str) -> Dict[str, Any]:
+        return {
+            "id": str(job_doc["_id"]),
+            "user_id": str(job_doc["user_id"]),
+            "type": job_doc["type"],
+            "entity_type": job_doc["entity_type"],
+            "entity_id": str(job_doc["entity_id"]),
+            "params": job_doc.get("params", {}),
+            "priority": job_doc["priority"],
+            "status": status,
+            "created_at": job_doc["created_at"]
+        }
@@ -0,0 +1,104 @@
+"""
+Lead search - Prefix tokens and ranking for lead search and typeahead
+
+Each lead stores search_tokens: every prefix of every word of its name,
+email and company, lowercased and accent-folded. A query matches when
+all of its words are among a lead's tokens, which is an equality match on
+the multikey (owner_id, search_tokens, created_at, _id) index instead of
+a regex scan over all of the owner's leads. User input never reaches a
+regex: it is split into the same tokens.
+"""
+
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+SEARCH_FIELDS = ("name", "email", "company")
+
+# Longer words are indexed (and queried) by their first MAX_PREFIX characters
+MAX_PREFIX = 15
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Ranking weights per field for a whole-word and a prefix match
+FIELD_WEIGHTS = {
+    "name": (4.0, 3.0),
+    "company": (3.0, 2.0),
+    "email": (2.0, 1.0),
+}
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents ("João" -> "joao")"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def words(text: Optional[str]) -> List[str]:
+    """Normalized words of a field value"""
+    return WORD_PATTERN.findall(_fold(text)) if text else []
+
+
+def search_tokens(lead: Dict[str, Any]) -> List[str]:
+    """Token set stored on a lead document"""
+    tokens = set()
+    for field in SEARCH_FIELDS:
+        for word in words(lead.get(field)):
+            word = word[:MAX_PREFIX]
+            tokens.update(word[:length] for length in range(1, len(word) + 1))
+    return sorted(tokens)
+
+
+def query_terms(query: str) -> List[str]:
+    """Distinct query words, truncated like the stored tokens"""
+    return list(dict.fromkeys(word[:MAX_PREFIX] for word in words(query)))
+
+
+def token_filter(query: str) -> Optional[Dict[str, Any]]:
+    """
+    Filter clause matching leads that contain every query word as a prefix
+
+    Returns:
+        None if the query has no searchable characters
+    """
+    terms = query_terms(query)
+    if not terms:
+        return None
+    if len(terms) == 1:
+        return {"search_tokens": terms[0]}
+    return {"search_tokens": {"$all": terms}}
+
+
+def rank_score(lead: Dict[str, Any], query: str) -> float:
+    """
+    Relevance of a matching lead
+
+    Every query word scores its best field match (whole word beats
+    prefix, name beats company beats email); a name starting with the
+    whole query gets a bonus so typeahead completes names first.
+    """
+    terms = query_terms(query)
+    field_words = {field: [w[:MAX_PREFIX] for w in words(lead.get(field))] for field in SEARCH_FIELDS}
+
+    score = 0.0
+    for term in terms:
+        best = 0.0
+        for field, (whole, prefix) in FIELD_WEIGHTS.items():
+            for word in field_words[field]:
+                if word == term:
+                    best = max(best, whole)
+                elif word.startswith(term):
+                    best = max(best, prefix)
+        score += best
+
+    if _fold(lead.get("name") or "").startswith(_fold(query.strip())):
+        score += 2.0
+
+    return score
+
+
+def rank(leads: List[Dict[str, Any]], query: str, limit: int) -> List[Tuple[float, Dict[str, Any]]]:
+    """Top matching leads by relevance, then lead score, then recency"""
+    scored = [(rank_score(lead, query), lead) for lead in leads]
+    scored.sort(key=lambda item: (item[0], item[1].get("score") or 0, item[1]["created_at"]), reverse=True)
+    return scored[:limit]
@@ -2,12 +2,18 @@
 Lead service - Business logic for leads
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
 
+from app.core.config import settings
+from app.core.pagination import KEYSET_SORT, keyset_filter, fetch_page
+from app.core.projection import projection
 from app.models.lead import Lead, LeadCreate, LeadUpdate
+from app.services.counter_service import CounterService
+from app.services.lead_search import SEARCH_FIELDS, rank, search_tokens, token_filter
 
 
 class LeadService:
@@ -16,6 +22,7 @@ class LeadService:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.collection = db.leads
+        self.counters = CounterService(db)
 
     async def create_lead(self, lead_data: LeadCreate, owner_id: str) -> Lead:
         """Create a new lead"""
@@ -25,9 +32,11 @@ class LeadService:
         lead_dict["updated_at"] = datetime.utcnow()
         lead_dict["status"] = "new"
         lead_dict["score"] = 0
+        lead_dict["search_tokens"] = search_tokens(lead_dict)
 
         result = await self.collection.insert_one(lead_dict)
         lead_dict["_id"] = result.inserted_id
+        await self.counters.created("leads", lead_dict)
 
         return Lead(**lead_dict)
 
@@ -36,15 +45,49 @@ class LeadService:
         lead = await self.collection.find_one({"_id": ObjectId(lead_id)})
         return Lead(**lead) if lead else None
 
+    async def get_lead_document(self, lead_id: str) -> Optional[Dict[str, Any]]:
+        """Get a lead as a raw document"""
+        return await self.collection.find_one({"_id": ObjectId(lead_id)}, {"search_tokens": 0})
+
+    async def get_lead_fields(self, lead_id: str, fields: List[str]) -> Optional[Dict[str, Any]]:
+        """Get selected fields of a lead as a raw document (owner_id always included)"""
+        return await self.collection.find_one({"_id": ObjectId(lead_id)}, projection(fields, "owner_id"))
+
+    async def get_leads(self, lead_ids: List[str], owner_id: str) -> List[Lead]:
+        """Get owner's leads by IDs in a single query"""
+        cursor = self.collection.find({
+            "_id": {"$in": [ObjectId(lead_id) for lead_id in lead_ids]},
+            "owner_id": ObjectId(owner_id)
+        })
+        return [Lead(**doc) async for doc in cursor]
+
     async def list_leads(
         self,
         owner_id: str,
         skip: int = 0,
         limit: int = 20,
         status: Optional[str] = None,
-        search: Optional[str] = None
-    ) -> tuple[List[Lead], int]:
-        """List leads with filters and pagination"""
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        trusted: bool = False
+    ) -> tuple[List[Union[Lead, Dict[str, Any]]], int, Optional[str]]:
+        """
+        List leads with filters and pagination
+
+        A cursor from a previous page continues after that page in constant
+        time and takes precedence over skip.
+
+        With fields, only those fields are read and rows are returned as
+        plain dicts instead of models. With trusted, full rows are returned
+        as response dicts built without validation.
+
+        Raises:
+            ValueError: If the cursor is malformed
+
+        Returns:
+            (leads, total, next_cursor) where next_cursor is None on the last page
+        """
 
         query = {"owner_id": ObjectId(owner_id)}
 
@@ -52,18 +95,76 @@ class LeadService:
             query["status"] = status
 
         if search:
-            query["$or"] = [
-                {"name": {"$regex": search, "$options": "i"}},
-                {"email": {"$regex": search, "$options": "i"}},
-                {"company": {"$regex": search, "$options": "i"}}
-            ]
+            tokens = token_filter(search)
+            if tokens is None:
+                return [], 0, None
+            query.update(tokens)
+
+        # Search results cannot be pre-counted; everything else reads the counters
+        if search:
+            total = await self.collection.count_documents(query)
+        elif status:
+            total = await self.counters.count("leads", owner_id, status)
+        else:
+            total = await self.counters.count("leads", owner_id)
+
+        if cursor:
+            query.update(keyset_filter(cursor))
+            skip = 0
+
+        find_projection = projection(fields) if fields else {"search_tokens": 0}
+        docs, next_cursor = await fetch_page(self.collection, query, limit, find_projection, skip)
+
+        if fields:
+            return docs, total, next_cursor
+        if trusted:
+            return [Lead.document_to_response(doc) for doc in docs], total, next_cursor
+        return [Lead(**doc) for doc in docs], total, next_cursor
 
-        total = await self.collection.count_documents(query)
+    async def search_leads(self, owner_id: str, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Ranked typeahead search over name, email and company
 
-        cursor = self.collection.find(query).sort("created_at", -1).skip(skip).limit(limit)
-        leads = [Lead(**doc) async for doc in cursor]
+        Up to LEAD_SEARCH_CANDIDATES of the newest matching leads are read
+        from the search index and ranked by relevance.
 
-        return leads, total
+        Returns:
+            Light lead dicts with a relevance "rank" field, best first
+        """
+        tokens = token_filter(query)
+        if tokens is None:
+            return []
+
+        cursor = self.collection.find(
+            {"owner_id": ObjectId(owner_id), **tokens},
+            {"name": 1, "email": 1, "company": 1, "status": 1, "score": 1, "classification": 1, "created_at": 1}
+        ).sort(KEYSET_SORT).limit(settings.LEAD_SEARCH_CANDIDATES)
+        candidates = await cursor.to_list(settings.LEAD_SEARCH_CANDIDATES)
+
+        return [{**lead, "rank": round(score, 2)} for score, lead in rank(candidates, query, limit)]
+
+    async def reindex_search_tokens(self, batch_size: int = 1000) -> int:
+        """
+        Recompute search_tokens on every lead
+
+        Returns:
+            Number of leads whose tokens changed
+        """
+        updated = 0
+        operations = []
+        cursor = self.collection.find({}, {"search_tokens": 1, **{field: 1 for field in SEARCH_FIELDS}})
+
+        async for doc in cursor:
+            tokens = search_tokens(doc)
+            if doc.get("search_tokens") != tokens:
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"search_tokens": tokens}}))
+            if len(operations) >= batch_size:
+                updated += (await self.collection.bulk_write(operations, ordered=False)).modified_count
+                operations = []
+
+        if operations:
+            updated += (await self.collection.bulk_write(operations, ordered=False)).modified_count
+        return updated
 
     async def update_lead(self, lead_id: str, lead_update: LeadUpdate) -> Optional[Lead]:
         """Update lead"""
@@ -74,29 +175,59 @@ class LeadService:
 
         update_data["updated_at"] = datetime.utcnow()
 
-        result = await self.collection.find_one_and_update(
+        if any(field in update_data for field in SEARCH_FIELDS):
+            current = await self.collection.find_one(
+                {"_id": ObjectId(lead_id)},
+                {field: 1 for field in SEARCH_FIELDS}
+            )
+            if current:
+                update_data["search_tokens"] = search_tokens({**current, **update_data})
+
+        if "status" in update_data:
+            result = await self._set_status_tracked(lead_id, update_data)
+        else:
+            result = await self.collection.find_one_and_update(
+                {"_id": ObjectId(lead_id)},
+                {"$set": update_data},
+                return_document=True
+            )
+
+        return Lead(**result) if result else None
+
+    async def _set_status_tracked(self, lead_id: str, update_data: dict) -> Optional[dict]:
+        """$set that may change status, keeping the status counters in step"""
+        before = await self.collection.find_one_and_update(
             {"_id": ObjectId(lead_id)},
             {"$set": update_data},
-            return_document=True
+            return_document=ReturnDocument.BEFORE
         )
+        if not before:
+            return None
 
-        return Lead(**result) if result else None
+        await self.counters.changed("leads", before["owner_id"], before.get("status"), update_data["status"])
+        return {**before, **update_data}
 
     async def delete_lead(self, lead_id: str) -> bool:
         """Delete lead"""
-        result = await self.collection.delete_one({"_id": ObjectId(lead_id)})
-        return result.deleted_count > 0
+        deleted = await self.collection.find_one_and_delete(
+            {"_id": ObjectId(lead_id)},
+            projection={"owner_id": 1, "status": 1}
+        )
+        if not deleted:
+            return False
 
-    async def qualify_lead(
+        await self.counters.deleted("leads", deleted)
+        return True
+
+    def _qualification_update(
         self,
-        lead_id: str,
         score: int,
         classification: str,
         reasoning: str,
         next_actions: List[str]
-    ) -> Optional[Lead]:
-        """Update lead with qualification data"""
-        update_data = {
+    ) -> dict:
+        """Build the $set document for a qualification result"""
+        return {
             "score": score,
             "classification": classification,
             "qualification_reasoning": reasoning,
@@ -106,10 +237,55 @@ class LeadService:
             "updated_at": datetime.utcnow()
         }
 
-        result = await self.collection.find_one_and_update(
-            {"_id": ObjectId(lead_id)},
-            {"$set": update_data},
-            return_document=True
-        )
+    async def qualify_lead(
+        self,
+        lead_id: str,
+        score: int,
+        classification: str,
+        reasoning: str,
+        next_actions: List[str]
+    ) -> Optional[Lead]:
+        """Update lead with qualification data"""
+        update_data = self._qualification_update(score, classification, reasoning, next_actions)
+        result = await self._set_status_tracked(lead_id, update_data)
 
         return Lead(**result) if result else None
+
+    async def bulk_qualify_leads(self, qualifications: List[dict]) -> int:
+        """
+        Write many qualification results in one round trip
+
+        Args:
+            qualifications: Dicts with the qualify_lead keyword arguments
+
+        Returns:
+            Number of leads modified
+        """
+        if not qualifications:
+            return 0
+
+        # Leads about to change status, read first so the counters follow
+        moving = [
+            (doc["owner_id"], doc.get("status"), "qualified")
+            async for doc in self.collection.find(
+                {
+                    "_id": {"$in": [ObjectId(q["lead_id"]) for q in qualifications]},
+                    "status": {"$ne": "qualified"}
+                },
+                {"owner_id": 1, "status": 1}
+            )
+        ]
+
+        operations = [
+            UpdateOne(
+                {"_id": ObjectId(q["lead_id"])},
+                {"$set": self._qualification_update(
+                    q["score"], q["classification"], q["reasoning"], q["next_actions"]
+                )}
+            )
+            for q in qualifications
+        ]
+
+        result = await self.collection.bulk_write(operations, ordered=False)
+        await self.counters.record_many("leads", moving)
+        return result.modified_count
@@ -2,12 +2,16 @@
 Notification service - Create and manage notifications
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 from datetime import datetime
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 
+from app.core.pagination import keyset_filter, fetch_page
+from app.core.projection import projection
 from app.models.notification import Notification
+from app.services.counter_service import CounterService
 
 
 class NotificationService:
@@ -16,6 +20,7 @@ class NotificationService:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.collection = db.notifications
+        self.counters = CounterService(db)
 
     async def create_notification(
         self,
@@ -49,6 +54,7 @@ class NotificationService:
 
         result = await self.collection.insert_one(notif_dict)
         notif_dict["_id"] = result.inserted_id
+        await self.counters.created("notifications", notif_dict)
 
         return Notification(**notif_dict)
 
@@ -57,36 +63,72 @@ class NotificationService:
         user_id: str,
         unread_only: bool = False,
         skip: int = 0,
-        limit: int = 20
-    ) -> tuple[List[Notification], int]:
-        """List user notifications"""
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        trusted: bool = False
+    ) -> tuple[List[Union[Notification, Dict[str, Any]]], int, Optional[str]]:
+        """
+        List user notifications, newest first
+
+        A cursor from a previous page takes precedence over skip.
+
+        With fields, only those fields are read and rows are returned as
+        plain dicts instead of models. With trusted, full rows are returned
+        as response dicts built without validation.
+
+        Raises:
+            ValueError: If the cursor is malformed
+
+        Returns:
+            (notifications, total, next_cursor) where next_cursor is None on the last page
+        """
 
         query = {"user_id": ObjectId(user_id)}
         if unread_only:
             query["read"] = False
 
-        total = await self.collection.count_documents(query)
-        cursor = self.collection.find(query).sort("created_at", -1).skip(skip).limit(limit)
-        notifications = [Notification(**doc) async for doc in cursor]
+        if unread_only:
+            total = await self.counters.count("notifications", user_id, False)
+        else:
+            total = await self.counters.count("notifications", user_id)
+
+        if cursor:
+            query.update(keyset_filter(cursor))
+            skip = 0
+
+        find_projection = projection(fields) if fields else None
+        docs, next_cursor = await fetch_page(self.collection, query, limit, find_projection, skip)
 
-        return notifications, total
+        if fields:
+            return docs, total, next_cursor
+        if trusted:
+            return [Notification.document_to_response(doc) for doc in docs], total, next_cursor
+        return [Notification(**doc) for doc in docs], total, next_cursor
 
     async def mark_as_read(self, notification_id: str) -> Optional[Notification]:
         """Mark notification as read"""
 
-        result = await self.collection.find_one_and_update(
+        update_data = {
+            "read": True,
+            "read_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+
+        before = await self.collection.find_one_and_update(
             {"_id": ObjectId(notification_id)},
-            {
-                "$set": {
-                    "read": True,
-                    "read_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow()
-                }
-            },
-            return_document=True
+            {"$set": update_data},
+            return_document=ReturnDocument.BEFORE
         )
+        if not before:
+            return None
+
+        await self.counters.changed("notifications", before["user_id"], before.get("read"), True)
+        return Notification(**{**before, **update_data})
 
-        return Notification(**result) if result else None
+    async def count_unread(self, user_id: str) -> int:
+        """Unread notifications of a user, from the counters"""
+        return await self.counters.count("notifications", user_id, False)
 
     async def mark_all_as_read(self, user_id: str) -> int:
         """Mark all user notifications as read"""
@@ -102,9 +144,17 @@ class NotificationService:
             }
         )
 
+        await self.counters.changed("notifications", ObjectId(user_id), False, True, result.modified_count)
         return result.modified_count
 
     async def delete_notification(self, notification_id: str) -> bool:
         """Delete notification"""
-        result = await self.collection.delete_one({"_id": ObjectId(notification_id)})
-        return result.deleted_count > 0
+        deleted = await self.collection.find_one_and_delete(
+            {"_id": ObjectId(notification_id)},
+            projection={"user_id": 1, "read": 1}
+        )
+        if not deleted:
+            return False
+
+        await self.counters.deleted("notifications", deleted)
+        return True
@@ -0,0 +1,102 @@
+"""
+Single-flight - Coalesce concurrent identical AI requests
+
+Concurrent callers with the same key share one execution: within a
+worker through an in-process future map, across workers through a Redis
+lock whose holder publishes its result for the waiters.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from app.core.config import settings
+from app.core.metrics import AI_COALESCED_REQUESTS
+from app.services.cache_service import cache_service
+
+logger = logging.getLogger(__name__)
+
+
+def input_fingerprint(data: Dict[str, Any]) -> str:
+    """Stable hash of agent input, ignoring request-only flags"""
+    payload = {k: v for k, v in data.items() if k not in ("force_refresh", "skip_prescore")}
+    key_data = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(key_data.encode()).hexdigest()
+
+
+class SingleFlight:
+    """In-process future map backed by a Redis lock across workers"""
+
+    POLL_INTERVAL = 0.2
+
+    def __init__(self):
+        self.inflight: Dict[str, asyncio.Task] = {}
+        self.waiters: Dict[str, int] = {}
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        The work runs in its own task, so a caller that disconnects does
+        not cancel it for the others that are still waiting. When the
+        last waiter is cancelled the work is cancelled too.
+        """
+        task = self.inflight.get(key)
+
+        if task is not None:
+            AI_COALESCED_REQUESTS.labels("local").inc()
+        else:
+            task = asyncio.ensure_future(self._run_across_workers(key, fn))
+            self.inflight[key] = task
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+
+        self.waiters[key] = self.waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self.waiters[key] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self.waiters[key] -= 1
+            if not self.waiters[key]:
+                del self.waiters[key]
+
+    async def _run_across_workers(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        lock_key = f"singleflight:lock:{key}"
+        result_key = f"singleflight:result:{key}"
+        lock_ttl = settings.AI_SINGLEFLIGHT_LOCK_TTL_SECONDS
+
+        token = await cache_service.acquire_lock(lock_key, lock_ttl)
+
+        if token is None and cache_service.redis:
+            # Another worker is running it; wait for its published result
+            result = await self._wait_for_remote(lock_key, result_key, lock_ttl)
+            if result is not None:
+                AI_COALESCED_REQUESTS.labels("remote").inc()
+                return result
+            token = await cache_service.acquire_lock(lock_key, lock_ttl)
+
+        try:
+            await cache_service.delete(result_key)
+            result = await fn()
+            await cache_service.set(result_key, result, settings.AI_SINGLEFLIGHT_RESULT_TTL_SECONDS)
+            return result
+        finally:
+            if token:
+                await cache_service.release_lock(lock_key, token)
+
+    async def _wait_for_remote(self, lock_key: str, result_key: str, timeout: float) -> Any:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        while loop.time() < deadline and await cache_service.exists(lock_key):
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+        return await cache_service.get(result_key)
+
+
+# Global single-flight instance
+single_flight = SingleFlight()
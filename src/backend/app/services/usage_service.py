@@ -0,0 +1,153 @@
+"""
+Usage service - LLM token, latency and cost accounting
+
+Prometheus counters are exported by the API process's /metrics endpoint
+only. LLM calls made in Celery workers (bulk and nightly jobs) update
+worker-local counters that nothing scrapes; their usage is still in the
+ai_usage_daily rollups served by /ai/usage.
+"""
+
+import asyncio
+from typing import List, Optional, Set
+from datetime import datetime, timedelta
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+import logging
+
+from app.core.config import settings
+from app.core.metrics import (
+    current_user_id,
+    LLM_CALLS,
+    LLM_INPUT_TOKENS,
+    LLM_OUTPUT_TOKENS,
+    LLM_COST,
+    LLM_RETRIES,
+    LLM_JSON_PARSE_FAILURES,
+    LLM_DURATION,
+    LLM_TIME_TO_FIRST_TOKEN
+)
+from app.database import db
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_cost(provider: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimated USD cost of a call"""
+    if provider == "claude":
+        return (
+            input_tokens * settings.CLAUDE_INPUT_COST_PER_MTOK
+            + output_tokens * settings.CLAUDE_OUTPUT_COST_PER_MTOK
+        ) / 1_000_000
+    if provider == "openai":
+        return (
+            input_tokens * settings.OPENAI_INPUT_COST_PER_MTOK
+            + output_tokens * settings.OPENAI_OUTPUT_COST_PER_MTOK
+        ) / 1_000_000
+    return 0.0
+
+
+class UsageService:
+    """Service for daily per-user LLM usage rollups"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.ai_usage_daily
+
+    async def increment(self, user_id: str, agent: str, counters: dict):
+        """Add counters to today's rollup for (user, agent)"""
+        today = datetime.utcnow().strftime("%Y-%m-%d")
+
+        await self.collection.update_one(
+            {"user_id": ObjectId(user_id), "date": today, "agent": agent},
+            {
+                "$inc": counters,
+                "$set": {"updated_at": datetime.utcnow()},
+                "$setOnInsert": {"created_at": datetime.utcnow()}
+            },
+            upsert=True
+        )
+
+    async def get_daily_usage(self, user_id: str, days: int = 30) -> List[dict]:
+        """Get user rollups for the last N days"""
+        since = (datetime.utcnow() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+
+        cursor = self.collection.find(
+            {"user_id": ObjectId(user_id), "date": {"$gte": since}},
+            {"_id": 0, "user_id": 0}
+        ).sort([("date", -1), ("agent", 1)])
+
+        return [doc async for doc in cursor]
+
+
+# Rollup writes still in flight; held so they are not garbage collected
+_pending_writes: Set[asyncio.Task] = set()
+
+
+async def _write(user_id: str, agent: str, counters: dict):
+    try:
+        await UsageService(db.db).increment(user_id, agent, counters)
+    except Exception as e:
+        logger.error(f"Usage rollup error: {e}")
+
+
+def _persist(agent: str, counters: dict):
+    """
+    Add counters to the current user's rollup in the background
+
+    The upsert runs as its own task, so LLM callers (including cancelled
+    ones in finally blocks) never wait on MongoDB and never fail on it.
+    """
+    user_id = current_user_id.get()
+    if not user_id or db.db is None:
+        return
+
+    task = asyncio.get_running_loop().create_task(_write(user_id, agent, counters))
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+
+
+async def flush_usage():
+    """Wait for pending rollup writes (end of a Celery job, API shutdown)"""
+    if _pending_writes:
+        await asyncio.gather(*_pending_writes, return_exceptions=True)
+
+
+async def record_llm_call(
+    agent: str,
+    provider: str,
+    outcome: str,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    duration: float = 0.0,
+    time_to_first_token: Optional[float] = None,
+    retries: int = 0
+):
+    """Export metrics for one LLM call and add it to the daily rollup"""
+
+    cost = estimate_cost(provider, input_tokens, output_tokens)
+
+    LLM_CALLS.labels(agent, provider, outcome).inc()
+    LLM_INPUT_TOKENS.labels(agent, provider).inc(input_tokens)
+    LLM_OUTPUT_TOKENS.labels(agent, provider).inc(output_tokens)
+    LLM_COST.labels(agent, provider).inc(cost)
+    LLM_DURATION.labels(agent, provider).observe(duration)
+    if time_to_first_token is not None:
+        LLM_TIME_TO_FIRST_TOKEN.labels(agent, provider).observe(time_to_first_token)
+    if retries:
+        LLM_RETRIES.labels(agent, provider).inc(retries)
+
+    _persist(agent, {
+        "calls": 1,
+        "errors": 0 if outcome == "success" else 1,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost_usd": cost,
+        "duration_ms": int(duration * 1000),
+        "retries": retries
+    })
+
+
+async def record_json_parse_failure(agent: str):
+    """Count a completion the agent could not parse"""
+    LLM_JSON_PARSE_FAILURES.labels(agent).inc()
+    _persist(agent, {"json_parse_failures": 1})
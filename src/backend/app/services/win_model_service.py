@@ -0,0 +1,144 @@
+"""
+Win model service - Train, store and serve the deal win-probability model
+"""
+
+import time
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+import numpy as np
+import logging
+
+from app.agents.win_model import (
+    WinProbabilityModel,
+    feature_matrix,
+    has_open_history,
+    OPEN_STAGES,
+    CLOSED_STAGES
+)
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MODEL_ID = "win_probability"
+
+# Fields the model reads; training and scoring project only these
+FEATURE_PROJECTION = {
+    "stage": 1,
+    "value": 1,
+    "probability": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "actual_close_date": 1,
+    "contact_ids": 1,
+    "tags": 1,
+    "stage_history": 1,
+}
+
+# Process-wide copy of the stored model, refreshed every WIN_MODEL_RELOAD_SECONDS
+_cached_model: Optional[WinProbabilityModel] = None
+_cached_at = 0.0
+
+
+class WinModelService:
+    """Service for the statistical win-probability model"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.ml_models
+        self.deals = db.deals
+
+    async def train(self, holdout: float = 0.2, l2: float = 1.0, seed: int = 42) -> Dict[str, Any]:
+        """
+        Fit the model on won/lost deals with stage history and store it
+
+        Deals closed before stage_history was recorded carry no stage or
+        probability information (their features would be constant), while
+        open deals are always scored with both; they are left out so the
+        model learns those weights from comparable rows. A random holdout
+        share is scored before the final fit on all deals, so the stored
+        metrics are out-of-sample.
+        """
+        cursor = self.deals.find(
+            {"stage": {"$in": list(CLOSED_STAGES)}, "stage_history.0": {"$exists": True}},
+            FEATURE_PROJECTION
+        )
+        deals = [doc async for doc in cursor if has_open_history(doc)]
+
+        labels = np.array([1 if deal["stage"] == "won" else 0 for deal in deals])
+        if len(deals) < settings.WIN_MODEL_MIN_SAMPLES or len(set(labels.tolist())) < 2:
+            raise ValueError(
+                f"Need at least {settings.WIN_MODEL_MIN_SAMPLES} closed deals with stage history "
+                f"and both outcomes (found {len(deals)})"
+            )
+
+        features = feature_matrix(deals)
+        order = np.random.default_rng(seed).permutation(len(deals))
+        split = int(len(deals) * (1 - holdout))
+        train, test = order[:split], order[split:]
+
+        metrics = WinProbabilityModel().fit(features[train], labels[train], l2=l2).evaluate(
+            features[test], labels[test]
+        )
+
+        model = WinProbabilityModel().fit(features, labels, l2=l2)
+        model.metrics = {
+            **metrics,
+            "samples": len(deals),
+            "won": int(labels.sum()),
+            "holdout": len(test)
+        }
+
+        await self.collection.replace_one(
+            {"_id": MODEL_ID},
+            {"_id": MODEL_ID, **model.to_document(), "updated_at": datetime.utcnow()},
+            upsert=True
+        )
+        self._remember(model)
+        logger.info(f"Win model trained: {model.metrics}")
+
+        return model.metrics
+
+    def _remember(self, model: Optional[WinProbabilityModel]):
+        global _cached_model, _cached_at
+        _cached_model = model
+        _cached_at = time.monotonic()
+
+    async def get_model(self) -> Optional[WinProbabilityModel]:
+        """Stored model, cached in-process; None until the first training run"""
+        if _cached_at and time.monotonic() - _cached_at < settings.WIN_MODEL_RELOAD_SECONDS:
+            return _cached_model
+
+        doc = await self.collection.find_one({"_id": MODEL_ID})
+        model = WinProbabilityModel.from_document(doc) if doc else None
+        self._remember(model)
+        return model
+
+    async def baseline(self, deal: Dict[str, Any]) -> Optional[int]:
+        """Win probability (0-100) for one deal, None without a model"""
+        model = await self.get_model()
+        return model.predict_one(deal) if model else None
+
+    async def score_open_deals(self, owner_id: str) -> List[Dict[str, Any]]:
+        """Score every open deal of an owner in one vectorized pass"""
+        model = await self.get_model()
+        if model is None:
+            return []
+
+        cursor = self.deals.find(
+            {"owner_id": ObjectId(owner_id), "stage": {"$in": list(OPEN_STAGES)}},
+            {**FEATURE_PROJECTION, "title": 1}
+        )
+        deals = [doc async for doc in cursor]
+        probabilities = model.predict(deals)
+
+        return [
+            {
+                "deal_id": str(deal["_id"]),
+                "title": deal.get("title"),
+                "stage": deal["stage"],
+                "win_probability": int(round(probability * 100))
+            }
+            for deal, probability in zip(deals, probabilities.tolist())
+        ]
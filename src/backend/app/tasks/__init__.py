@@ -0,0 +1 @@
+"""Background tasks module"""
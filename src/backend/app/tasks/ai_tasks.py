@@ -0,0 +1,139 @@
+"""
+AI and enrichment tasks - Agent runs executed by Celery workers
+"""
+
+from datetime import datetime
+from typing import Dict, Any, Optional
+from bson import ObjectId
+import logging
+
+from app.celery_app import celery_app
+from app.core.metrics import current_user_id, current_priority
+from app.tasks.runtime import run_async
+from app.services.ai_service import AIService
+from app.services.enrichment_service import EnrichmentService
+from app.services.lead_service import LeadService
+from app.services.deal_service import DealService
+
+logger = logging.getLogger(__name__)
+
+
+class EntityNotFound(Exception):
+    """Job target no longer exists"""
+
+
+async def _load_lead(db, lead_id: str):
+    lead = await LeadService(db).get_lead(lead_id)
+    if not lead:
+        raise EntityNotFound(f"Lead with id '{lead_id}' not found")
+    return lead
+
+
+async def _load_deal(db, deal_id: str):
+    deal = await DealService(db).get_deal(deal_id)
+    if not deal:
+        raise EntityNotFound(f"Deal with id '{deal_id}' not found")
+    return deal
+
+
+@celery_app.task(name="ai.qualify_lead")
+def qualify_lead_task(
+    lead_id: str,
+    force_refresh: bool = False,
+    user_id: Optional[str] = None,
+    priority: str = "interactive"
+) -> Dict[str, Any]:
+    """Qualify a lead and store the qualification"""
+
+    current_user_id.set(user_id)
+    current_priority.set(priority)
+
+    async def job(db, agents):
+        lead = await _load_lead(db, lead_id)
+        return await AIService(db, agents).qualify_lead(lead, force_refresh)
+
+    return run_async(job)
+
+
+@celery_app.task(name="ai.predict_deal")
+def predict_deal_task(
+    deal_id: str,
+    force_refresh: bool = False,
+    user_id: Optional[str] = None,
+    priority: str = "interactive"
+) -> Dict[str, Any]:
+    """Predict a deal outcome and store the AI insights"""
+
+    current_user_id.set(user_id)
+    current_priority.set(priority)
+
+    async def job(db, agents):
+        deal = await _load_deal(db, deal_id)
+        return await AIService(db, agents).predict_deal(deal, force_refresh)
+
+    return run_async(job)
+
+
+@celery_app.task(name="ai.generate_email")
+def generate_email_task(
+    lead_id: str,
+    context: Optional[str] = "initial outreach",
+    user_id: Optional[str] = None,
+    priority: str = "interactive"
+) -> Dict[str, Any]:
+    """Generate email variations for a lead"""
+
+    current_user_id.set(user_id)
+    current_priority.set(priority)
+
+    async def job(db, agents):
+        lead = await _load_lead(db, lead_id)
+        return await AIService(db, agents).generate_email(lead, context)
+
+    return run_async(job)
+
+
+@celery_app.task(name="ai.repredict_open_deals")
+def repredict_open_deals_task(priority: str = "bulk") -> Dict[str, Any]:
+    """Re-predict open deals whose inputs changed since their last analysis"""
+
+    # System job: clear the user left in the worker context by the previous task
+    current_user_id.set(None)
+    current_priority.set(priority)
+
+    async def job(db, agents):
+        return await AIService(db, agents).repredict_open_deals()
+
+    return run_async(job)
+
+
+@celery_app.task(name="enrichment.enrich_lead")
+def enrich_lead_task(lead_id: str, user_id: Optional[str] = None, priority: str = "interactive") -> Dict[str, Any]:
+    """Enrich a lead with Clearbit data and store it"""
+
+    current_user_id.set(user_id)
+    current_priority.set(priority)
+
+    async def job(db, agents):
+        lead = await _load_lead(db, lead_id)
+        enrichment = await EnrichmentService().enrich_person(lead.email)
+
+        if enrichment:
+            await db.leads.update_one(
+                {"_id": ObjectId(lead_id)},
+                {
+                    "$set": {
+                        "enrichment_data": enrichment,
+                        "enriched_at": datetime.utcnow(),
+                        "updated_at": datetime.utcnow()
+                    }
+                }
+            )
+
+        return {
+            "lead_id": lead_id,
+            "enriched": enrichment is not None,
+            "enrichment_data": enrichment
+        }
+
+    return run_async(job)
@@ -0,0 +1,19 @@
+"""
+Maintenance tasks - Periodic data upkeep executed by Celery workers
+"""
+
+from typing import Dict
+
+from app.celery_app import celery_app
+from app.tasks.runtime import run_async
+from app.services.counter_service import CounterService
+
+
+@celery_app.task(name="maintenance.reconcile_counters")
+def reconcile_counters_task() -> Dict[str, int]:
+    """Recount per-owner list counters and repair drift"""
+
+    async def job(db, agents):
+        return await CounterService(db).reconcile()
+
+    return run_async(job)
@@ -0,0 +1,50 @@
+"""
+Async runtime for Celery tasks
+
+Each worker process keeps one event loop so the Mongo client, Redis
+cache and pooled LLM client are created once and reused across tasks.
+"""
+
+import asyncio
+from typing import Any, Optional
+
+from app.database import connect_to_mongo, get_database
+from app.services.cache_service import cache_service
+from app.agents.registry import agent_registry
+from app.services.usage_service import flush_usage
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_ready = False
+
+
+async def _bootstrap():
+    """Open connections on first use in this worker process"""
+    global _ready
+    if not _ready:
+        await connect_to_mongo()
+        await cache_service.connect()
+        await agent_registry.startup()
+        _ready = True
+
+
+async def _with_runtime(coro_factory):
+    await _bootstrap()
+    try:
+        return await coro_factory(await get_database(), agent_registry)
+    finally:
+        # The loop only runs during jobs; finish usage writes before yielding it
+        await flush_usage()
+
+
+def run_async(coro_factory) -> Any:
+    """
+    Run an async job on the worker's event loop
+
+    Args:
+        coro_factory: Callable taking (db, agents) and returning a coroutine
+    """
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(_with_runtime(coro_factory))
@@ -0,0 +1,101 @@
+"""
+Agent benchmark - Offline agent orchestration throughput with FakeLLM
+
+Runs an agent many times against the deterministic fake backend and
+reports latency percentiles and throughput. With the same FAKE_LLM_*
+settings and --calls/--concurrency the numbers are reproducible.
+
+Usage:
+    LLM_PROVIDER=fake python benchmarks/agent_benchmark.py \\
+        [--agent LeadQualifier] [--calls 200] [--concurrency 20] [--distinct 50] [--redis]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.agents.registry import AgentRegistry  # noqa: E402
+from app.services.cache_service import cache_service  # noqa: E402
+
+SAMPLE_INPUTS = {
+    "LeadQualifier": lambda i: {
+        "name": f"Lead {i}",
+        "email": f"lead{i}@example.com",
+        "company": f"Company {i}",
+        "job_title": "Director",
+        "source": "website",
+    },
+    "DealPredictor": lambda i: {
+        "title": f"Deal {i}",
+        "value": 1000.0 * (i + 1),
+        "stage": "proposal",
+        "contact_count": i % 5,
+    },
+    "EmailAssistant": lambda i: {
+        "lead_name": f"Lead {i}",
+        "company": f"Company {i}",
+        "job_title": "Director",
+        "context": "initial outreach",
+    },
+}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agent", default="LeadQualifier", choices=sorted(SAMPLE_INPUTS))
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--distinct", type=int, default=50, help="Distinct inputs (repeats exercise the cache)")
+    parser.add_argument("--redis", action="store_true", help="Connect the result cache to REDIS_URL")
+    args = parser.parse_args()
+
+    if args.redis:
+        await cache_service.connect()
+
+    registry = AgentRegistry()
+    await registry.startup()
+    agent = registry.get(args.agent)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def call(i: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await agent.run(SAMPLE_INPUTS[args.agent](i % args.distinct))
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(args.calls)))
+    elapsed = time.perf_counter() - started
+
+    await registry.close()
+    await cache_service.close()
+
+    print(f"agent={args.agent} calls={args.calls} concurrency={args.concurrency} errors={errors}")
+    print(f"throughput={args.calls / elapsed:.1f} calls/s elapsed={elapsed:.2f}s")
+    print(
+        f"p50={percentile(latencies, 50):.1f}ms p95={percentile(latencies, 95):.1f}ms "
+        f"p99={percentile(latencies, 99):.1f}ms"
+    )
+    print(f"cache={agent.cache_stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""
+Load test - GET /leads latency while AI calls are in flight
+
+Fires a steady stream of AI requests and, in parallel, hammers the
+lead list endpoint. Reports p50/p95/p99 for the list endpoint with and
+without AI traffic so event loop stalls show up as a p99 regression.
+
+AI requests send force_refresh (skipping the result cache and the lead
+pre-scorer) and cycle through the given leads, since concurrent requests
+for the same lead are coalesced into one LLM call. Pass at least as many
+leads as --ai-concurrency to keep that many LLM calls in flight.
+
+Usage:
+    python benchmarks/ai_load_test.py --token <JWT> --lead-id <id> [--lead-id <id> ...] \\
+        [--base-url http://localhost:8000] [--duration 30] \\
+        [--ai-concurrency 8] [--list-concurrency 16]
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+from typing import Iterator, List
+
+import httpx
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of samples (ms)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def list_worker(client: httpx.AsyncClient, stop_at: float, samples: List[float]):
+    """Call GET /leads in a loop and record latency"""
+    while time.perf_counter() < stop_at:
+        started = time.perf_counter()
+        response = await client.get("/api/v1/leads/", params={"limit": 20})
+        response.raise_for_status()
+        samples.append((time.perf_counter() - started) * 1000)
+
+
+async def ai_worker(client: httpx.AsyncClient, stop_at: float, lead_ids: Iterator[str], counter: List[int]):
+    """Call POST /ai/lead/qualify in a loop, bypassing the result cache"""
+    while time.perf_counter() < stop_at:
+        response = await client.post(
+            "/api/v1/ai/lead/qualify",
+            json={"lead_id": next(lead_ids), "force_refresh": True}
+        )
+        counter[0 if response.is_success else 1] += 1
+
+
+async def run_phase(args, with_ai: bool) -> dict:
+    """Run one measurement phase and return latency summary"""
+    headers = {"Authorization": f"Bearer {args.token}"}
+    limits = httpx.Limits(max_connections=args.list_concurrency + args.ai_concurrency)
+    samples: List[float] = []
+    ai_counter = [0, 0]
+
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        headers=headers,
+        limits=limits,
+        timeout=120.0
+    ) as client:
+        stop_at = time.perf_counter() + args.duration
+        tasks = [
+            list_worker(client, stop_at, samples)
+            for _ in range(args.list_concurrency)
+        ]
+        if with_ai:
+            # Shared cycle: concurrent workers ask for different leads
+            lead_ids = itertools.cycle(args.lead_id)
+            tasks += [
+                ai_worker(client, stop_at, lead_ids, ai_counter)
+                for _ in range(args.ai_concurrency)
+            ]
+        await asyncio.gather(*tasks)
+
+    return {
+        "requests": len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "mean": statistics.fmean(samples) if samples else 0.0,
+        "ai_ok": ai_counter[0],
+        "ai_failed": ai_counter[1],
+    }
+
+
+def print_summary(label: str, summary: dict):
+    print(
+        f"{label:<12} n={summary['requests']:<6} "
+        f"p50={summary['p50']:.1f}ms p95={summary['p95']:.1f}ms "
+        f"p99={summary['p99']:.1f}ms mean={summary['mean']:.1f}ms "
+        f"ai_ok={summary['ai_ok']} ai_failed={summary['ai_failed']}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True, help="JWT access token")
+    parser.add_argument(
+        "--lead-id", required=True, action="append",
+        help="Lead to qualify during the AI phase (repeat for several; cycled through)"
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per phase")
+    parser.add_argument("--ai-concurrency", type=int, default=8)
+    parser.add_argument("--list-concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    if len(set(args.lead_id)) < args.ai_concurrency:
+        print(
+            f"note: {len(set(args.lead_id))} distinct leads for {args.ai_concurrency} AI workers; "
+            "requests for the same lead coalesce, so fewer LLM calls run in parallel"
+        )
+
+    print_summary("baseline", await run_phase(args, with_ai=False))
+    print_summary("with AI", await run_phase(args, with_ai=True))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
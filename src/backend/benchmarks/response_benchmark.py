@@ -0,0 +1,176 @@
+"""
+Response benchmark - Serialization throughput of list/get routes before and after the trusted read path
+
+"before" replays what FastAPI did with the old handlers: build models from
+the documents, then run serialize_response() against the route's
+response_model (jsonable_encoder for dict routes, revalidation against
+LeadResponse/DealResponse for single gets) and render with json.dumps.
+"after" builds response dicts with document_to_response() and renders
+them with MongoJSONResponse (orjson). No database is involved; documents
+are synthetic but shaped like production rows.
+
+Usage:
+    python benchmarks/response_benchmark.py [--rows 100] [--seconds 2]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.core.responses import MongoJSONResponse  # noqa: E402
+from app.models.lead import Lead, LeadResponse  # noqa: E402
+from app.models.deal import Deal, DealResponse  # noqa: E402
+from app.models.notification import Notification  # noqa: E402
+
+OWNER = ObjectId()
+NOW = datetime.utcnow()
+
+
+def lead_doc(i: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "name": f"Lead {i}",
+        "email": f"lead{i}@example.com",
+        "phone": "+5511999999999",
+        "company": f"Company {i}",
+        "job_title": "Director of Engineering",
+        "status": "qualified",
+        "source": "website",
+        "score": i % 100,
+        "classification": "Warm",
+        "enrichment_data": {"company": {"domain": f"company{i}.com", "employees": 250, "tech": ["python", "aws"]}},
+        "qualification_reasoning": "Budget confirmed; evaluating vendors this quarter. " * 4,
+        "next_actions": ["Schedule demo", "Send pricing"],
+        "owner_id": OWNER,
+        "tags": ["inbound", "saas"],
+        "custom_fields": {"region": "south", "segment": "mid-market"},
+        "created_at": NOW - timedelta(minutes=i),
+        "updated_at": NOW,
+    }
+
+
+def deal_doc(i: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "title": f"Deal {i}",
+        "value": 1000.0 * (i + 1),
+        "currency": "BRL",
+        "stage": "proposal",
+        "probability": 60,
+        "contact_ids": [ObjectId(), ObjectId()],
+        "owner_id": OWNER,
+        "ai_score": 70,
+        "ai_insights": {"win_probability": 64, "risk_level": "medium", "recommendations": ["Follow up"]},
+        "risk_factors": ["Single threaded"],
+        "stage_history": [
+            {"stage": "prospecting", "probability": 20, "at": NOW - timedelta(days=20)},
+            {"stage": "proposal", "probability": 60, "at": NOW - timedelta(days=3)},
+        ],
+        "tags": ["enterprise"],
+        "created_at": NOW - timedelta(minutes=i),
+        "updated_at": NOW,
+    }
+
+
+def notification_doc(i: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "user_id": OWNER,
+        "type": "deal_update",
+        "title": f"Deal {i} moved to proposal",
+        "message": "The deal was moved to proposal by the owner.",
+        "priority": "medium",
+        "read": i % 3 == 0,
+        "entity_type": "deal",
+        "entity_id": ObjectId(),
+        "created_at": NOW - timedelta(minutes=i),
+        "updated_at": NOW,
+    }
+
+
+def envelope(items: list) -> dict:
+    return {"items": items, "total": len(items), "skip": 0, "limit": len(items), "next_cursor": None}
+
+
+DICT_FIELD = create_response_field("response", dict)
+
+
+async def before_list(model, docs):
+    content = envelope([model(**doc) for doc in docs])
+    body = await serialize_response(field=DICT_FIELD, response_content=content)
+    return JSONResponse(body).body
+
+
+async def after_list(model, docs):
+    return MongoJSONResponse(envelope([model.document_to_response(doc) for doc in docs])).body
+
+
+def before_get(model, response_model):
+    field = create_response_field("response", response_model)
+
+    async def run(docs):
+        body = await serialize_response(field=field, response_content=model(**docs[0]))
+        return JSONResponse(body).body
+
+    return run
+
+
+def after_get(response_model):
+    async def run(docs):
+        return MongoJSONResponse(response_model.document_to_response(docs[0])).body
+
+    return run
+
+
+async def measure(fn, docs, seconds: float) -> float:
+    """Calls per second of fn(docs) over roughly seconds"""
+    await fn(docs)  # Warm up schema caches
+    calls = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        await fn(docs)
+        calls += 1
+    return calls / (time.perf_counter() - started)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="Rows per list page")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Measuring time per route and variant")
+    args = parser.parse_args()
+
+    leads = [lead_doc(i) for i in range(args.rows)]
+    deals = [deal_doc(i) for i in range(args.rows)]
+    notifications = [notification_doc(i) for i in range(args.rows)]
+
+    routes = [
+        ("GET /leads", leads, lambda d: before_list(Lead, d), lambda d: after_list(Lead, d)),
+        ("GET /deals", deals, lambda d: before_list(Deal, d), lambda d: after_list(Deal, d)),
+        (
+            "GET /notifications", notifications,
+            lambda d: before_list(Notification, d), lambda d: after_list(Notification, d)
+        ),
+        ("GET /leads/{id}", leads, before_get(Lead, LeadResponse), after_get(LeadResponse)),
+        ("GET /deals/{id}", deals, before_get(Deal, DealResponse), after_get(DealResponse)),
+    ]
+
+    print(f"rows per list page={args.rows}")
+    print(f"{'route':<22}{'before req/s':>14}{'after req/s':>14}{'speedup':>10}")
+    for name, docs, before, after in routes:
+        before_rate = await measure(before, docs, args.seconds)
+        after_rate = await measure(after, docs, args.seconds)
+        print(f"{name:<22}{before_rate:>14.1f}{after_rate:>14.1f}{after_rate / before_rate:>9.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""
+Validation benchmark - Lead/Deal model validation and serialization throughput
+
+Validates N synthetic documents per model from each input shape the app
+sees: MongoDB documents (ObjectId values), API payloads (string ids) and
+raw JSON. It then serializes them back in JSON mode. Reports documents
+per second for each step.
+
+Usage:
+    python benchmarks/validation_benchmark.py [--count 100000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId  # noqa: E402
+
+from app.models.lead import Lead  # noqa: E402
+from app.models.deal import Deal  # noqa: E402
+
+OWNER = ObjectId()
+NOW = datetime.utcnow()
+
+
+def lead_doc(i: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "name": f"Lead {i}",
+        "email": f"lead{i}@example.com",
+        "company": f"Company {i}",
+        "job_title": "Director",
+        "status": "new",
+        "source": "website",
+        "score": i % 100,
+        "owner_id": OWNER,
+        "company_id": ObjectId(),
+        "tags": ["inbound"],
+        "created_at": NOW - timedelta(minutes=i),
+        "updated_at": NOW,
+    }
+
+
+def deal_doc(i: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "title": f"Deal {i}",
+        "value": 1000.0 * (i + 1),
+        "stage": "proposal",
+        "probability": 60,
+        "lead_id": ObjectId(),
+        "contact_ids": [ObjectId(), ObjectId(), ObjectId()],
+        "owner_id": OWNER,
+        "tags": ["enterprise"],
+        "created_at": NOW - timedelta(minutes=i),
+        "updated_at": NOW,
+    }
+
+
+def stringify(doc: dict) -> dict:
+    """API-payload form of a document: ids and datetimes as strings"""
+    def convert(value):
+        if isinstance(value, ObjectId):
+            return str(value)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        if isinstance(value, list):
+            return [convert(item) for item in value]
+        return value
+    return {key: convert(value) for key, value in doc.items()}
+
+
+def rate(count: int, fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000, help="Documents per model")
+    args = parser.parse_args()
+
+    print(f"documents per model={args.count}")
+    print(f"{'model':<8}{'from mongo':>14}{'from str ids':>14}{'from json':>14}{'dump json':>14}   (docs/s)")
+
+    for model, make in ((Lead, lead_doc), (Deal, deal_doc)):
+        docs = [make(i) for i in range(args.count)]
+        payloads = [stringify(doc) for doc in docs]
+        raw = [json.dumps(payload) for payload in payloads]
+
+        models = []
+        from_mongo = rate(args.count, lambda: models.extend(model.model_validate(doc) for doc in docs))
+        from_str = rate(args.count, lambda: [model.model_validate(payload) for payload in payloads])
+        from_json = rate(args.count, lambda: [model.model_validate_json(text) for text in raw])
+        dump = rate(args.count, lambda: [m.model_dump(mode="json", by_alias=True) for m in models])
+
+        print(f"{model.__name__:<8}{from_mongo:>14.0f}{from_str:>14.0f}{from_json:>14.0f}{dump:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
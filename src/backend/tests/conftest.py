@@ -0,0 +1,8 @@
+"""
+Shared test setup
+"""
+
+import os
+
+# Settings requires a secret; tests never sign real tokens
+os.environ.setdefault("SECRET_KEY", "test-secret-key-test-secret-key-0000")
@@ -0,0 +1,145 @@
+"""
+Tests for the win-probability model: feature encoding and the Newton fit
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.agents.win_model import (
+    FEATURE_NAMES,
+    WinProbabilityModel,
+    _sigmoid,
+    deal_features,
+    feature_matrix,
+    has_open_history,
+)
+
+NOW = datetime(2025, 6, 1)
+
+
+def column(name: str) -> int:
+    return FEATURE_NAMES.index(name)
+
+
+def closed_deal(stage: str = "won", history=None) -> dict:
+    return {
+        "stage": stage,
+        "value": 999.0,
+        "probability": 100 if stage == "won" else 0,
+        "created_at": NOW - timedelta(days=10),
+        "actual_close_date": NOW - timedelta(days=1),
+        "contact_ids": ["a", "b", "c"],
+        "tags": ["Enterprise"],
+        "stage_history": history if history is not None else [
+            {"stage": "prospecting", "probability": 20, "at": NOW - timedelta(days=10)},
+            {"stage": "negotiation", "probability": 80, "at": NOW - timedelta(days=5)},
+            {"stage": stage, "probability": 100 if stage == "won" else 0, "at": NOW - timedelta(days=1)},
+        ],
+    }
+
+
+class TestDealFeatures:
+    def test_row_matches_feature_names(self):
+        assert len(deal_features(closed_deal(), NOW)) == len(FEATURE_NAMES)
+
+    def test_closed_deal_is_described_by_its_last_open_state(self):
+        row = deal_features(closed_deal("won"), NOW)
+
+        assert row[column("stage_negotiation")] == 1.0
+        assert sum(row[column(f"stage_{s}")] for s in ("prospecting", "qualification", "proposal")) == 0.0
+        assert row[column("last_probability")] == pytest.approx(0.8)
+        assert row[column("max_probability")] == pytest.approx(0.8)
+        assert row[column("log_stage_changes")] == pytest.approx(np.log1p(2))
+        assert row[column("log_age_days")] == pytest.approx(np.log1p(9))
+
+    def test_outcome_does_not_leak_into_features(self):
+        assert deal_features(closed_deal("won"), NOW) == deal_features(closed_deal("lost"), NOW)
+
+    def test_open_deal_uses_current_stage_and_probability(self):
+        deal = {
+            "stage": "proposal",
+            "probability": 60,
+            "created_at": NOW - timedelta(days=3),
+            "stage_history": [{"stage": "prospecting", "probability": 20}],
+        }
+        row = deal_features(deal, NOW)
+
+        assert row[column("stage_proposal")] == 1.0
+        assert row[column("last_probability")] == pytest.approx(0.6)
+        assert row[column("max_probability")] == pytest.approx(0.6)
+        assert row[column("log_age_days")] == pytest.approx(np.log1p(3))
+
+    def test_tags_hash_case_insensitively(self):
+        upper = deal_features({**closed_deal(), "tags": ["Enterprise"]}, NOW)
+        lower = deal_features({**closed_deal(), "tags": ["enterprise"]}, NOW)
+
+        assert upper == lower
+        assert sum(upper[column("tag_bucket_0"):]) == 1.0
+
+    def test_history_presence(self):
+        assert has_open_history(closed_deal())
+        assert not has_open_history(closed_deal(history=[]))
+        assert not has_open_history(closed_deal(history=[{"stage": "won", "probability": 100}]))
+
+    def test_empty_matrix_has_feature_width(self):
+        assert feature_matrix([], NOW).shape == (0, len(FEATURE_NAMES))
+
+
+class TestNewtonFit:
+    @pytest.fixture
+    def data(self):
+        rng = np.random.default_rng(0)
+        features = rng.normal(size=(400, len(FEATURE_NAMES)))
+        true_weights = np.zeros(len(FEATURE_NAMES))
+        true_weights[column("last_probability")] = 2.5
+        true_weights[column("log_value")] = -1.5
+        labels = (rng.random(400) < _sigmoid(features @ true_weights + 0.3)).astype(int)
+        return features, labels
+
+    def test_fit_reaches_regularized_optimum(self, data):
+        features, labels = data
+        l2 = 1.0
+        model = WinProbabilityModel().fit(features, labels, l2=l2)
+
+        x = np.hstack([np.ones((len(features), 1)), (features - model.mean) / model.std])
+        w = np.concatenate([[model.bias], model.weights])
+        penalty = np.full(len(w), l2)
+        penalty[0] = 0.0
+        gradient = x.T @ (_sigmoid(x @ w) - labels) + penalty * w
+
+        assert np.abs(gradient).max() < 1e-4
+
+    def test_fit_recovers_informative_features(self, data):
+        features, labels = data
+        model = WinProbabilityModel().fit(features, labels)
+
+        strongest = np.argsort(-np.abs(model.weights))[:2]
+        assert set(strongest) == {column("last_probability"), column("log_value")}
+        assert model.weights[column("last_probability")] > 0
+        assert model.weights[column("log_value")] < 0
+        assert model.evaluate(features, labels)["auc"] > 0.8
+
+    def test_constant_column_is_ignored(self, data):
+        features, labels = data
+        features[:, column("stage_prospecting")] = 1.0
+        model = WinProbabilityModel().fit(features, labels)
+
+        assert model.std[column("stage_prospecting")] == 1.0
+        assert model.weights[column("stage_prospecting")] == pytest.approx(0.0)
+
+    def test_stronger_penalty_shrinks_weights(self, data):
+        features, labels = data
+        loose = WinProbabilityModel().fit(features, labels, l2=0.1)
+        tight = WinProbabilityModel().fit(features, labels, l2=100.0)
+
+        assert np.linalg.norm(tight.weights) < np.linalg.norm(loose.weights)
+
+    def test_document_round_trip(self, data):
+        features, labels = data
+        model = WinProbabilityModel().fit(features, labels)
+        restored = WinProbabilityModel.from_document(model.to_document())
+
+        np.testing.assert_allclose(restored.predict_features(features), model.predict_features(features))
+        assert WinProbabilityModel.from_document({**model.to_document(), "feature_names": ["x"]}) is None